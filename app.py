@@ -5,6 +5,7 @@ from urllib.parse import parse_qs
 from utils.ui import dash, dcc, html, Input, Output, State, page_registry, page_container, dbc
 from utils.config import SETTINGS
 from utils.dropbox_client import get_dropbox
+from utils import layout_cache, metrics, response_cache, warmup
 
 # Dropbox client (lazy-verified). Expose on the module for other modules if needed.
 dbx, HAS_DROPBOX = get_dropbox()
@@ -26,12 +27,34 @@ try:
 except Exception:
     pass
 
-# Simple health endpoint for container orchestrators
+# Liveness: the process is up and serving (does not wait for warm-up)
 @app.server.get("/healthz")
 def _healthz():
     return {"status": "ok"}
 
 
+# Readiness: 503 until this worker has warmed the default views (utils/warmup.py)
+@app.server.get("/readyz")
+def _readyz():
+    return warmup.status(), (200 if warmup.is_ready() else 503)
+
+
+# Compression and the callback response cache go first: their after_request hooks must run last
+response_cache.init_app(app)
+
+# Per-worker callback latency/payload metrics (Prometheus text format)
+metrics.init_app(app.server)
+
+
+@app.server.get("/metrics")
+def _metrics():
+    return app.server.response_class(metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
+# Page layouts are serialized once per process and replayed with an ETag; big option lists load lazily
+layout_cache.init_app(app)
+
+
 # -------- App Shell (Navbar + Page Container) --------
 
 def _sorted_pages():
@@ -124,6 +147,10 @@ def _toggle_navbar_visibility(embed: bool):
     return {'display': 'none'} if embed else {}
 
 
+# Load default datasets and build the default figures before /readyz turns green
+warmup.start(app)
+
+
 if __name__ == "__main__":
     # Local development entrypoint
     app.run_server(debug=True, port=SETTINGS.port)
@@ -0,0 +1,30 @@
+// Fill lazily populated dropdowns (utils/layout_cache.lazy_dropdown).
+// The page layout only carries each dropdown's selected value; the full list is
+// fetched once the dropdown mounts from an HTTP-cacheable GET endpoint.
+(function(){
+  const pending = {};
+
+  function prefix(){
+    try {
+      const cfg = JSON.parse(document.getElementById('_dash-config').textContent);
+      return cfg.requests_pathname_prefix || '/';
+    } catch(e) {
+      return '/';
+    }
+  }
+
+  function fetchOptions(id){
+    if(!id){ return window.dash_clientside.no_update; }
+    // One request per dropdown, even if the callback fires again before it resolves
+    if(!pending[id]){
+      pending[id] = fetch(prefix() + '_orfeus/options/' + encodeURIComponent(id), {credentials: 'same-origin'})
+        .then(r => { if(!r.ok){ throw new Error(r.status); } return r.json(); })
+        .finally(() => { delete pending[id]; });
+    }
+    return pending[id].catch(() => window.dash_clientside.no_update);
+  }
+
+  window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    orfeus: Object.assign({}, (window.dash_clientside || {}).orfeus, {fetchOptions: fetchOptions}),
+  });
+})();
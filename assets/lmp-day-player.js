@@ -0,0 +1,88 @@
+// Client-side hour switching for the LMP "Hourly Playback" map.
+// The server sends one store per day: bus geometry plus a 24 x n_bus float32
+// LMP matrix (base64). Changing the hour only slices the decoded matrix.
+(function(){
+  let decodedKey = null;
+  let decoded = null;
+
+  function decodeF32(b64){
+    const bin = atob(b64 || '');
+    const bytes = new Uint8Array(bin.length);
+    for(let i = 0; i < bin.length; i++){ bytes[i] = bin.charCodeAt(i); }
+    return new Float32Array(bytes.buffer);
+  }
+
+  function decodeDay(store){
+    // Decode once per day; slider moves reuse the typed arrays
+    const key = store.date + ':' + store.n_bus;
+    if(decodedKey !== key){
+      decoded = {
+        lat: Array.from(decodeF32(store.lat)),
+        lon: Array.from(decodeF32(store.lon)),
+        lmp: decodeF32(store.lmp),
+      };
+      decodedKey = key;
+    }
+    return decoded;
+  }
+
+  function hourSizes(values, absMax){
+    const scale = absMax > 0 ? absMax : 1;
+    return values.map(v => {
+      if(v === null) return 2;
+      // Negative prices are emphasized with the largest markers, as in the main map
+      return v < 0 ? 12 : 3 + 9 * Math.abs(v) / scale;
+    });
+  }
+
+  window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    lmp: {
+      renderHour: function(store, hour){
+        if(!store || !store.n_bus){
+          return [{data: [], layout: {title: {text: 'No data available'}}}, 'No LMP data available for playback.'];
+        }
+        const hr = Math.max(0, Math.min((store.hours || 24) - 1, Number(hour) || 0));
+        const day = decodeDay(store);
+        const n = store.n_bus;
+        const values = Array.from(day.lmp.subarray(hr * n, (hr + 1) * n), v => Number.isFinite(v) ? v : null);
+        const trace = {
+          type: 'scattermapbox',
+          mode: 'markers',
+          lat: day.lat,
+          lon: day.lon,
+          hovertext: store.name,
+          hovertemplate: '%{hovertext}<br>LMP=%{marker.color:.2f}<extra></extra>',
+          marker: {
+            color: values,
+            size: hourSizes(values, store.abs_max),
+            coloraxis: 'coloraxis',
+            opacity: 0.7,
+          },
+          name: 'Buses',
+        };
+        const layout = Object.assign({}, store.layout, {
+          title: {text: 'LMPs at Hr ' + hr + ', ' + store.date + ' under Texas 7k Grid'},
+          coloraxis: Object.assign({}, store.layout.coloraxis, {cmin: store.cmin, cmax: store.cmax}),
+          // Keep the user's pan/zoom while the hour changes
+          uirevision: store.date,
+        });
+        const finite = values.filter(v => v !== null);
+        let caption = 'LMP playback for hour ' + hr + ' on ' + store.date + '. Buses: ' + n + '.';
+        if(finite.length){
+          caption += ' LMP min ' + Math.min(...finite).toFixed(2) + ', max ' + Math.max(...finite).toFixed(2) + '.';
+        }
+        return [{data: [trace], layout: layout}, caption];
+      },
+
+      togglePlay: function(nClicks){
+        const playing = (nClicks || 0) % 2 === 1;
+        return [!playing, playing ? 'Pause' : 'Play', playing ? 'true' : 'false'];
+      },
+
+      advanceHour: function(nIntervals, hour){
+        const hr = Number(hour);
+        return Number.isFinite(hr) ? (hr + 1) % 24 : 0;
+      },
+    },
+  });
+})();
@@ -0,0 +1,484 @@
+"""Replay realistic Dash callback sessions against a running app and report latency.
+
+Each virtual user loops over sessions drawn from a weighted mix:
+
+* ``lmp``       — open /lmpplot on a day, scrub through hours, switch day
+* ``scenarios`` — switch asset type and asset id on /scenariovisualize
+* ``risk``      — toggle the 1 day / 1 week / history buttons and pick assets on /riskallocplot
+
+Requests are real ``POST /_dash-update-component`` bodies built from
+``/_dash-dependencies``, so hashed duplicate outputs resolve as in the browser.
+Reports throughput, p50/p95/p99 latency (overall and per session step) and
+per-worker RSS sampled from ``/proc`` while the test runs.
+
+Usage (spawns gunicorn on synthetic data; no external services):
+    python benchmarks/load_test.py --spawn --data-dir /tmp/orfeus-bench-data --workers 2 --threads 8 \\
+        --concurrency 16 --duration 30 --output load.json
+
+Against an already running instance (RSS needs its gunicorn master PID):
+    python benchmarks/load_test.py --url http://127.0.0.1:8055 --server-pid 12345
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import closing
+from pathlib import Path
+from urllib.parse import urlparse
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LMP_SUBDIR = Path('lmps_data_visualization') / 't7k_v0.4.0-a2_rsvf-20'
+
+
+# ---------- Target data (dates and asset ids to request) ----------
+
+def _csv_header(path: Path) -> list[str]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return f.readline().strip().split(',')
+    except Exception:
+        return []
+
+
+def _csv_first_column(path: Path) -> list[str]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            f.readline()
+            return [line.split(',', 1)[0] for line in f if line.strip()]
+    except Exception:
+        return []
+
+
+def load_targets(data_dir: Path | None) -> dict:
+    """Dates and asset ids to drive; read from the data directory when given.
+
+    Falls back to the names written by ``synthetic_data.py``.
+    """
+    targets = {
+        'lmp_days': ['2018-01-02', '2018-01-03'],
+        't7k_day': '2018-01-02',
+        'scenario_assets': {t: [f'{t.upper()}_{i}' for i in range(3)] + ['AVG'] for t in ('load', 'wind', 'solar')},
+        'risk_assets_rts': [f'RTS ASSET {i}' for i in range(3)],
+        'risk_assets_t7k': [f'T7K ASSET {i}' for i in range(3)],
+    }
+    if data_dir is None:
+        return targets
+    days = sorted(p.name[:10] for p in (data_dir / LMP_SUBDIR).glob('*.p.gz'))
+    if days:
+        targets['lmp_days'] = days
+        targets['t7k_day'] = days[0]
+    for asset_type in ('load', 'wind', 'solar'):
+        ids = _csv_first_column(data_dir / 'tuning_final_files' / 'texas7k' / f'escores_avg_on_tuning_{asset_type}_rhos.csv')
+        if ids:
+            targets['scenario_assets'][asset_type] = [i.replace(' ', '_') for i in ids] + ['AVG']
+    for version in ('rts', 't7k'):
+        cols = _csv_header(data_dir / 'reliability_cost_index_data' / version / f'daily_type-allocs_{version}_asset_allocs.csv')
+        cols = [c for c in cols if c and c != 'time']
+        if cols:
+            targets[f'risk_assets_{version}'] = cols[:50]
+    return targets
+
+
+# ---------- Dash request construction ----------
+
+class DashCallbacks:
+    """Builds ``/_dash-update-component`` bodies from the app's dependency list."""
+
+    def __init__(self, deps: list[dict]):
+        self.deps = deps
+
+    def find(self, output_prefix: str) -> dict:
+        for dep in self.deps:
+            out = dep['output']
+            if out.lstrip('.').startswith(output_prefix):
+                return dep
+        raise KeyError(f'No callback output starting with {output_prefix!r}')
+
+    def body(self, output_prefix: str, values: dict, changed: list[str]) -> dict:
+        dep = self.find(output_prefix)
+        output = dep['output']
+        outs = []
+        for part in output.strip('.').split('...'):
+            cid, prop = part.rsplit('.', 1)
+            outs.append({'id': cid, 'property': prop.split('@')[0]})
+
+        def _items(specs):
+            return [{'id': s['id'], 'property': s['property'],
+                     'value': values.get(f"{s['id']}.{s['property']}")} for s in specs]
+
+        return {
+            'output': output,
+            'outputs': outs if output.startswith('..') else outs[0],
+            'inputs': _items(dep['inputs']),
+            'state': _items(dep['state']),
+            'changedPropIds': changed,
+        }
+
+
+# ---------- Sessions ----------
+
+# Map centers for the zoom step: Dallas, Houston, Austin, San Antonio, El Paso
+_CITIES = [(32.78, -96.80), (29.76, -95.37), (30.27, -97.74), (29.42, -98.49), (31.76, -106.49)]
+
+
+def lmp_session(rng: random.Random, targets: dict, hours: int = 6):
+    """Open a day, scrub through consecutive hours, zoom into a city, then jump to another day."""
+    day = rng.choice(targets['lmp_days'])
+    values = {
+        'date_values_t7k_lmps.value': day, 'hr_values_t7k_lmps.value': 0, 'url-lmps.search': '',
+        'fig_lmp_geo.relayoutData': None,
+        'embed-store.data': False, 'fig_lmp_geo-state.data': None, 'fig_lmp_geo-table-summary.n_clicks': 0,
+    }
+    yield 'lmp:open_day', 'fig_lmp_geo.figure', values, ['date_values_t7k_lmps.value']
+    yield 'lmp:day_store', 'lmp-day-store.data', values, ['date_values_t7k_lmps.value']
+    start = rng.randrange(24)
+    for k in range(1, hours + 1):
+        values['hr_values_t7k_lmps.value'] = (start + k) % 24
+        yield 'lmp:scrub_hour', 'fig_lmp_geo.figure', values, ['hr_values_t7k_lmps.value']
+    lat, lon = rng.choice(_CITIES)
+    values['fig_lmp_geo.relayoutData'] = {'mapbox.center': {'lat': lat, 'lon': lon}, 'mapbox.zoom': 7.5}
+    yield 'lmp:zoom', 'fig_lmp_geo.figure', values, ['fig_lmp_geo.relayoutData']
+    values['date_values_t7k_lmps.value'] = rng.choice(targets['lmp_days'])
+    yield 'lmp:switch_day', 'fig_lmp_geo.figure', values, ['date_values_t7k_lmps.value']
+
+
+def scenarios_session(rng: random.Random, targets: dict, switches: int = 4):
+    """Switch asset type and asset id on the Texas-7k scenarios panel."""
+    values = {
+        'date_values_t7k.value': targets['t7k_day'], 'url-scenarios.search': '', 'embed-store.data': False,
+        't7k_scenario_plot_notuning-table-summary.n_clicks': 0,
+    }
+    for _ in range(switches):
+        asset_type = rng.choice(sorted(targets['scenario_assets']))
+        values['energy_types_t7k.value'] = asset_type
+        values['asset_ids_t7k.value'] = rng.choice(targets['scenario_assets'][asset_type])
+        yield 'scenarios:switch_asset', 't7k_scenario_plot_notuning.figure', values, ['asset_ids_t7k.value']
+
+
+def risk_session(rng: random.Random, targets: dict):
+    """Toggle period buttons on the type chart, then pick assets on the asset chart."""
+    version = rng.choice(['rts', 't7k'])
+    values = {'embed-store.data': False,
+              f'fig_mean_asset_type_risk_alloc_{version}-table-summary.n_clicks': 0,
+              f'fig_asset_risk_alloc_{version}-table-summary.n_clicks': 0}
+    for clicks, period in enumerate(('1week', 'hist', '1day'), start=1):
+        button = f'{version}-type-allocs-{period}.n_clicks'
+        values[button] = clicks
+        yield 'risk:type_period', f'fig_mean_asset_type_risk_alloc_{version}.figure', values, [button]
+    for clicks in range(1, 3):
+        values[f'asset_ids_risk_alloc_{version}.value'] = rng.choice(targets[f'risk_assets_{version}'])
+        yield 'risk:asset_select', f'fig_asset_risk_alloc_{version}.figure', values, [f'asset_ids_risk_alloc_{version}.value']
+        button = f'{version}-asset-allocs-{rng.choice(["1day", "1week", "hist"])}.n_clicks'
+        values[button] = clicks
+        yield 'risk:asset_period', f'fig_asset_risk_alloc_{version}.figure', values, [button]
+
+
+SESSIONS = {'lmp': lmp_session, 'scenarios': scenarios_session, 'risk': risk_session}
+
+
+# ---------- Worker RSS sampling ----------
+
+def _rss_kib(pid: int) -> int | None:
+    try:
+        with open(f'/proc/{pid}/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except Exception:
+        return None
+    return None
+
+
+def _children(pid: int) -> list[int]:
+    kids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', encoding='ascii') as f:
+                # pid (comm) state ppid ...; comm may contain spaces, so split after ')'
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except Exception:
+            continue
+        if ppid == pid:
+            kids.append(int(entry))
+    return kids
+
+
+class RssSampler(threading.Thread):
+    """Samples the RSS of a gunicorn master's worker processes until stopped."""
+
+    def __init__(self, master_pid: int, interval: float = 0.5):
+        super().__init__(daemon=True)
+        self.master_pid = master_pid
+        self.interval = interval
+        self.samples: dict[int, list[int]] = defaultdict(list)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            for pid in _children(self.master_pid) or [self.master_pid]:
+                rss = _rss_kib(pid)
+                if rss is not None:
+                    self.samples[pid].append(rss)
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> dict:
+        self._stop_event.set()
+        self.join(timeout=5)
+        return {str(pid): {'max_mib': max(v) / 1024, 'last_mib': v[-1] / 1024, 'samples': len(v)}
+                for pid, v in sorted(self.samples.items())}
+
+
+# ---------- Load generation ----------
+
+class VirtualUser(threading.Thread):
+    def __init__(self, idx: int, url: str, callbacks: DashCallbacks, targets: dict, mix: dict,
+                 deadline: float, think: float, seed: int, record):
+        super().__init__(daemon=True)
+        self.url = urlparse(url)
+        self.callbacks = callbacks
+        self.targets = targets
+        self.mix = mix
+        self.deadline = deadline
+        self.think = think
+        self.rng = random.Random(seed + idx)
+        self.record = record
+        self.conn = None
+
+    def _post(self, body: bytes) -> tuple[int, bytes]:
+        for attempt in (0, 1):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.url.hostname, self.url.port or 80, timeout=120)
+            try:
+                self.conn.request('POST', (self.url.path.rstrip('/') or '') + '/_dash-update-component', body=body,
+                                  headers={'Content-Type': 'application/json', 'Accept-Encoding': 'gzip, br'})
+                resp = self.conn.getresponse()
+                return resp.status, resp.read()
+            except (http.client.HTTPException, OSError):
+                # Stale keep-alive connection; reconnect once
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+        raise RuntimeError('unreachable')
+
+    def run(self):
+        names, weights = zip(*self.mix.items())
+        while time.monotonic() < self.deadline:
+            session = SESSIONS[self.rng.choices(names, weights)[0]]
+            for label, output, values, changed in session(self.rng, self.targets):
+                if time.monotonic() >= self.deadline:
+                    return
+                body = json.dumps(self.callbacks.body(output, values, changed)).encode('utf-8')
+                t0 = time.perf_counter()
+                try:
+                    status, payload = self._post(body)
+                except Exception:
+                    status, payload = 0, b''
+                elapsed = time.perf_counter() - t0
+                self.record(label, elapsed, status, len(payload))
+                if status == 200 and output == 'fig_lmp_geo.figure':
+                    # Carry the figure state forward like the browser does (enables hour patches)
+                    try:
+                        values['fig_lmp_geo-state.data'] = json.loads(payload)['response']['fig_lmp_geo-state']['data']
+                    except Exception:
+                        pass
+                if self.think:
+                    time.sleep(self.rng.uniform(0, 2 * self.think))
+
+
+def _percentile(sorted_vals: list[float], q: float) -> float:
+    if not sorted_vals:
+        return float('nan')
+    k = max(0, min(len(sorted_vals) - 1, int(round(q / 100.0 * len(sorted_vals) + 0.5)) - 1))
+    return sorted_vals[k]
+
+
+def _latency_stats(latencies: list[float]) -> dict:
+    vals = sorted(latencies)
+    return {
+        'count': len(vals),
+        'p50_ms': _percentile(vals, 50) * 1000,
+        'p95_ms': _percentile(vals, 95) * 1000,
+        'p99_ms': _percentile(vals, 99) * 1000,
+        'max_ms': (vals[-1] * 1000) if vals else float('nan'),
+    }
+
+
+def run_load(url: str, targets: dict, concurrency: int, duration: float, mix: dict, think: float,
+             seed: int, master_pid: int | None, warmup: float) -> dict:
+    with closing(_connect(url)) as conn:
+        conn.request('GET', '/_dash-dependencies')
+        callbacks = DashCallbacks(json.loads(conn.getresponse().read()))
+
+    lock = threading.Lock()
+    per_label: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    bytes_total = [0]
+    measuring = [warmup <= 0]
+
+    def record(label, elapsed, status, nbytes):
+        if not measuring[0]:
+            return
+        with lock:
+            if status == 200 or status == 204:
+                per_label[label].append(elapsed)
+                bytes_total[0] += nbytes
+            else:
+                errors[label] += 1
+
+    sampler = RssSampler(master_pid) if master_pid else None
+    start = time.monotonic()
+    deadline = start + warmup + duration
+    users = [VirtualUser(i, url, callbacks, targets, mix, deadline, think, seed, record) for i in range(concurrency)]
+    for u in users:
+        u.start()
+    if warmup > 0:
+        time.sleep(warmup)
+        measuring[0] = True
+    measured_start = time.monotonic()
+    if sampler:
+        sampler.start()
+    for u in users:
+        u.join()
+    wall = time.monotonic() - measured_start
+
+    all_lat = [x for v in per_label.values() for x in v]
+    return {
+        'config': {'url': url, 'concurrency': concurrency, 'duration_s': duration, 'warmup_s': warmup,
+                   'mix': mix, 'think_s': think, 'seed': seed},
+        'wall_s': wall,
+        'requests': len(all_lat),
+        'errors': sum(errors.values()),
+        'throughput_rps': len(all_lat) / wall if wall > 0 else 0.0,
+        'response_mib': bytes_total[0] / 2 ** 20,
+        'latency': _latency_stats(all_lat),
+        'by_step': {label: _latency_stats(v) for label, v in sorted(per_label.items())},
+        'errors_by_step': dict(errors),
+        'worker_rss': sampler.stop() if sampler else None,
+    }
+
+
+def _connect(url: str) -> http.client.HTTPConnection:
+    u = urlparse(url)
+    return http.client.HTTPConnection(u.hostname, u.port or 80, timeout=30)
+
+
+def _responds(url: str, path: str = '/healthz') -> bool:
+    try:
+        with closing(_connect(url)) as conn:
+            conn.request('GET', path)
+            return conn.getresponse().status == 200
+    except OSError:
+        return False
+
+
+def _wait_ready(url: str, proc: subprocess.Popen, timeout: float = 180.0):
+    t_end = time.monotonic() + timeout
+    while time.monotonic() < t_end:
+        if proc.poll() is not None:
+            raise SystemExit(f'Server exited early with code {proc.returncode}')
+        # Workers answer /readyz once they have warmed the default views
+        if _responds(url, '/readyz'):
+            return
+        time.sleep(0.5)
+    raise SystemExit(f'Server at {url} not ready after {timeout:.0f}s')
+
+
+def spawn_server(port: int, workers: int, threads: int, data_dir: Path | None) -> subprocess.Popen:
+    """Start gunicorn the way the Dockerfile does, offline, bound to localhost."""
+    env = dict(os.environ, DROPBOX_APP_KEY='', DROPBOX_APP_SECRET='', DROPBOX_REFRESH_TOKEN='')
+    if data_dir is not None:
+        env['ORFEUS_DATA_DIR'] = str(data_dir)
+    cmd = [sys.executable, '-m', 'gunicorn', '-w', str(workers), '-k', 'gthread', '--threads', str(threads),
+           '-b', f'127.0.0.1:{port}', 'wsgi:server']
+    return subprocess.Popen(cmd, cwd=str(REPO_ROOT), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SESSIONS:
+            raise SystemExit(f'Unknown session {name!r}; choose from {", ".join(SESSIONS)}')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def _print_report(report: dict):
+    lat = report['latency']
+    print(f"requests={report['requests']} errors={report['errors']} "
+          f"throughput={report['throughput_rps']:.1f} req/s  "
+          f"p50={lat['p50_ms']:.0f}ms p95={lat['p95_ms']:.0f}ms p99={lat['p99_ms']:.0f}ms", file=sys.stderr)
+    for label, s in report['by_step'].items():
+        print(f"  {label:24s} n={s['count']:<6d} p50={s['p50_ms']:8.0f}ms p95={s['p95_ms']:8.0f}ms "
+              f"p99={s['p99_ms']:8.0f}ms", file=sys.stderr)
+    for pid, rss in (report['worker_rss'] or {}).items():
+        print(f"  worker {pid}: rss max {rss['max_mib']:.0f} MiB, last {rss['last_mib']:.0f} MiB", file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description='Load-test Dash callbacks with realistic user sessions.')
+    ap.add_argument('--url', default=None, help='Target base URL (default: the spawned server)')
+    ap.add_argument('--spawn', action='store_true', help='Start gunicorn locally for the duration of the test')
+    ap.add_argument('--port', type=int, default=8077, help='Port for --spawn')
+    ap.add_argument('--workers', type=int, default=2, help='WEB_CONCURRENCY for --spawn')
+    ap.add_argument('--threads', type=int, default=8, help='THREADS for --spawn')
+    ap.add_argument('--server-pid', type=int, help='gunicorn master PID for RSS sampling (implied by --spawn)')
+    ap.add_argument('--data-dir', help='Data directory (ORFEUS_DATA_DIR for --spawn; source of dates/asset ids)')
+    ap.add_argument('--concurrency', type=int, default=8, help='Concurrent virtual users')
+    ap.add_argument('--duration', type=float, default=30.0, help='Measured seconds')
+    ap.add_argument('--warmup', type=float, default=5.0, help='Unmeasured seconds before measuring')
+    ap.add_argument('--mix', default='lmp=1,scenarios=1,risk=1', help='Session weights, e.g. lmp=2,risk=1')
+    ap.add_argument('--think', type=float, default=0.0, help='Mean think time between requests (s)')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--output', help='Write the JSON report here (default: stdout)')
+    args = ap.parse_args(argv)
+
+    data_dir = Path(args.data_dir) if args.data_dir else None
+    proc = None
+    url = args.url
+    master_pid = args.server_pid
+    if not url and not args.spawn:
+        ap.error('either --url or --spawn is required')
+    if args.spawn:
+        url = url or f'http://127.0.0.1:{args.port}'
+        if _responds(url):
+            raise SystemExit(f'{url} is already serving; stop it or pick another --port')
+        proc = spawn_server(args.port, args.workers, args.threads, data_dir)
+        master_pid = proc.pid
+    try:
+        if proc is not None:
+            _wait_ready(url, proc)
+        report = run_load(url, load_targets(data_dir), max(1, args.concurrency), args.duration,
+                          _parse_mix(args.mix), args.think, args.seed, master_pid, args.warmup)
+        if args.spawn:
+            report['config'].update(workers=args.workers, threads=args.threads)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n', encoding='utf-8')
+    else:
+        print(text)
+    _print_report(report)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+"""Time the data-loading and figure-building hot paths against synthetic data.
+
+Runs fully offline: Dropbox is disabled and the app is pointed at a generated
+Texas-7k-scale directory via ``ORFEUS_DATA_DIR``. Results are written as JSON
+so two runs can be compared with ``--compare``.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --data-dir /tmp/orfeus-bench-data --repeat 10 --output after.json --compare bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BENCH_DAY = '2018-01-02'
+OFFLINE_ENV = {
+    # Never reach out to Dropbox; force the local-file code paths
+    'DROPBOX_APP_KEY': '',
+    'DROPBOX_APP_SECRET': '',
+    'DROPBOX_REFRESH_TOKEN': '',
+    # Time the cold paths; warm-up would fill the caches in the background
+    'WARMUP': '0',
+    'STUB_MODE': '0',
+}
+
+
+def _summary(samples: list[float]) -> dict:
+    return {
+        'n': len(samples),
+        'min_s': min(samples),
+        'median_s': statistics.median(samples),
+        'mean_s': statistics.fmean(samples),
+        'stdev_s': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'max_s': max(samples),
+    }
+
+
+def _time(fn, repeat: int, setup=None) -> dict:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return _summary(samples)
+
+
+def _time_import(data_dir: Path, repeat: int) -> dict:
+    """Wall time of ``import app`` (all pages and inputs) in a fresh interpreter."""
+    env = dict(os.environ, ORFEUS_DATA_DIR=str(data_dir), PYTHONPATH=str(REPO_ROOT), **OFFLINE_ENV)
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'import app'], cwd=str(REPO_ROOT), env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - t0)
+    return _summary(samples)
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=str(REPO_ROOT),
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run(data_dir: Path, repeat: int, import_repeat: int) -> dict:
+    os.environ.update(OFFLINE_ENV)
+    os.environ['ORFEUS_DATA_DIR'] = str(data_dir)
+    sys.path.insert(0, str(REPO_ROOT))
+
+    results: dict[str, dict] = {'import_app': _time_import(data_dir, import_repeat)}
+
+    import pandas as pd
+    import plotly
+    import dash
+    import app  # noqa: F401  (registers pages so their modules can be imported)
+    from inputs.inputs import bus, branch, type_allocs_t7k, asset_allocs_t7k, energy_types_asset_ids_t7k_csv
+    from pages.data_visualization import lmps, scenarios, risk_allocation
+    from utils.accessibility import figure_to_table_html
+
+    lmp_file = BENCH_DAY + '.p.gz'
+    results['build_lmp_plot_file'] = _time(lambda: lmps.build_lmp_plot_file(lmp_file, bus, branch), repeat)
+    bus_detail, line_detail = lmps.build_lmp_plot_file(lmp_file, bus, branch)
+    if bus_detail.attrs.get('lmp_stub'):
+        raise SystemExit(f'LMP file for {BENCH_DAY} not found under {data_dir}; regenerate the data directory')
+
+    results['plot_particular_hour'] = _time(lambda: lmps.plot_particular_hour(12, bus_detail, line_detail), repeat)
+    fig_lmp, _ = lmps.plot_particular_hour(12, bus_detail, line_detail)
+
+    asset_id = next((a for a in energy_types_asset_ids_t7k_csv['load'] if a != 'AVG'), 'AVG')
+    results['build_timeseries_cold'] = _time(
+        lambda: scenarios.build_timeseries('t7k', BENCH_DAY, 'load', asset_id), repeat,
+        setup=scenarios._SCENARIO_CACHE.clear)
+    results['build_timeseries_warm'] = _time(
+        lambda: scenarios.build_timeseries('t7k', BENCH_DAY, 'load', asset_id), repeat)
+    fig_scen = scenarios.build_timeseries('t7k', BENCH_DAY, 'load', asset_id)
+
+    for period in ('1day', 'hist'):
+        results[f'plot_mean_asset_type_risk_alloc_type_{period}'] = _time(
+            lambda: risk_allocation.plot_mean_asset_type_risk_alloc(type_allocs_t7k, version='T7K', period=period),
+            repeat)
+    asset_col = next((c for c in asset_allocs_t7k.columns if c != 'time'), None)
+    if asset_col is not None:
+        results['plot_mean_asset_type_risk_alloc_asset_hist'] = _time(
+            lambda: risk_allocation.plot_mean_asset_type_risk_alloc(
+                risk_allocation._asset_frame(asset_allocs_t7k, asset_col), version='T7K', period='hist',
+                level='asset_id', asset_id=asset_col),
+            repeat)
+
+    results['figure_to_table_html_lmp'] = _time(lambda: figure_to_table_html(fig_lmp), repeat)
+    results['figure_to_table_html_scenarios'] = _time(lambda: figure_to_table_html(fig_scen), repeat)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'versions': {'pandas': pd.__version__, 'plotly': plotly.__version__, 'dash': dash.__version__},
+            'data_dir': str(data_dir),
+            'n_bus': int(len(bus)),
+            'n_branch': int(len(branch)),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> list[str]:
+    """One line per benchmark: baseline median, current median and the ratio."""
+    lines = [f"{'benchmark':48s} {'base (s)':>10s} {'now (s)':>10s} {'ratio':>7s}"]
+    base = baseline.get('results', {})
+    for name, cur in current['results'].items():
+        ref = base.get(name)
+        if not ref:
+            lines.append(f"{name:48s} {'-':>10s} {cur['median_s']:10.4f} {'-':>7s}")
+            continue
+        ratio = cur['median_s'] / ref['median_s'] if ref['median_s'] else float('inf')
+        lines.append(f"{name:48s} {ref['median_s']:10.4f} {cur['median_s']:10.4f} {ratio:7.2f}")
+    return lines
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description='Benchmark ORFEUS loading and figure building on synthetic data.')
+    ap.add_argument('--data-dir', help='Synthetic data directory (generated if missing or empty)')
+    ap.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark')
+    ap.add_argument('--import-repeat', type=int, default=3, help='Fresh-interpreter runs for the import benchmark')
+    ap.add_argument('--buses', type=int, default=7000)
+    ap.add_argument('--branches', type=int, default=9000)
+    ap.add_argument('--scenarios', type=int, default=1000)
+    ap.add_argument('--output', help='Write results JSON here (default: stdout)')
+    ap.add_argument('--compare', help='Baseline results JSON to compare against')
+    args = ap.parse_args(argv)
+
+    data_dir = Path(args.data_dir) if args.data_dir else Path(tempfile.gettempdir()) / 'orfeus-bench-data'
+    if not (data_dir / 'lmps_data_visualization').exists():
+        sys.path.insert(0, str(Path(__file__).resolve().parent))
+        from synthetic_data import generate
+        print(f'Generating synthetic data in {data_dir} ...', file=sys.stderr)
+        generate(data_dir, n_bus=args.buses, n_branch=args.branches, n_scenarios=args.scenarios)
+
+    report = run(data_dir, max(1, args.repeat), max(1, args.import_repeat))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n', encoding='utf-8')
+    else:
+        print(text)
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        print('\n'.join(compare(report, baseline)), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+"""Generate a synthetic, Texas-7k-scale data directory for benchmarks and load tests.
+
+The layout mirrors ``data/`` so the app can be pointed at it with
+``ORFEUS_DATA_DIR``:
+
+    Vatic_Grids/Texas-7k/TX_Data/SourceData/{bus,branch,gen}.csv
+    lmps_data_visualization/t7k_v0.4.0-a2_rsvf-20/<YYYY-MM-DD>.p.gz
+    scenarios_data/{t7k,rts}-scens-csv/<YYYYMMDD>/<asset_type>/<asset_id>.csv
+    reliability_cost_index_data/{rts,t7k}/daily_type-allocs_*_{type,asset}_allocs.csv
+    tuning_final_files/.../escores_avg_on_tuning_*_rhos.csv (asset id lists)
+
+Values are random but shaped like the real files; nothing here is meant to be
+physically meaningful.
+
+Usage:
+    python benchmarks/synthetic_data.py /tmp/orfeus-bench-data
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+T7K_LMP_DIR = Path('lmps_data_visualization') / 't7k_v0.4.0-a2_rsvf-20'
+GRID_DIR = Path('Vatic_Grids') / 'Texas-7k' / 'TX_Data' / 'SourceData'
+ASSET_TYPES = ('load', 'wind', 'solar')
+
+
+def _write_grid(out: Path, rng: np.random.Generator, n_bus: int, n_branch: int, n_gen: int):
+    grid = out / GRID_DIR
+    grid.mkdir(parents=True, exist_ok=True)
+    bus = pd.DataFrame({
+        'Bus ID': np.arange(1, n_bus + 1),
+        'Bus Name': [f'BUS {i}' for i in range(1, n_bus + 1)],
+        'lat': rng.uniform(26.0, 36.5, n_bus),
+        'lng': rng.uniform(-106.5, -93.5, n_bus),
+        'Zone': rng.choice(['Coast', 'East', 'Far West', 'North', 'North Central', 'South', 'South Central', 'West'], n_bus),
+        'Sub Name': [f'SUB {i // 3}' for i in range(n_bus)],
+        'Area': rng.choice(['ERCOT'], n_bus),
+    })
+    bus.to_csv(grid / 'bus.csv', index=False)
+    from_bus = rng.integers(1, n_bus + 1, n_branch)
+    to_bus = rng.integers(1, n_bus + 1, n_branch)
+    branch = pd.DataFrame({
+        'UID': [f'{a}_{b}_{i}' for i, (a, b) in enumerate(zip(from_bus, to_bus))],
+        'From Bus': from_bus,
+        'To Bus': to_bus,
+        'From Name': [f'BUS {a}' for a in from_bus],
+        'To Name': [f'BUS {b}' for b in to_bus],
+        'Cont Rating': rng.uniform(50.0, 1500.0, n_branch).round(1),
+    })
+    branch.to_csv(grid / 'branch.csv', index=False)
+    gens = pd.DataFrame({
+        'Bus ID': rng.integers(1, n_bus + 1, n_gen),
+        'GEN UID': [f'GEN {i}' for i in range(n_gen)],
+    })
+    gens.to_csv(grid / 'gen.csv', index=False)
+    return bus, branch
+
+
+def _write_lmp_days(out: Path, rng: np.random.Generator, bus: pd.DataFrame, branch: pd.DataFrame, days):
+    lmp_dir = out / T7K_LMP_DIR
+    lmp_dir.mkdir(parents=True, exist_ok=True)
+    n_bus, n_line = len(bus), len(branch)
+    hours = np.arange(24)
+    for day in days:
+        # Zonal price level plus per-bus noise, with occasional negative prices and mismatches
+        base = rng.normal(30.0, 10.0, (24, 1))
+        lmp = base + rng.normal(0.0, 15.0, (24, n_bus))
+        lmp[rng.random((24, n_bus)) < 0.01] *= -1
+        bus_detail = pd.DataFrame({
+            'Bus': np.tile(bus['Bus Name'].values, 24),
+            'Hour': np.repeat(hours, n_bus),
+            'LMP': lmp.ravel(),
+            'Demand': rng.uniform(0.0, 150.0, 24 * n_bus),
+            'Mismatch': np.where(rng.random(24 * n_bus) < 0.005, rng.uniform(1.0, 20.0, 24 * n_bus), 0.0),
+            'Date': day,
+        }).set_index(['Bus', 'Hour'])
+        rating = np.tile(branch['Cont Rating'].values, 24)
+        line_detail = pd.DataFrame({
+            'Line': np.tile(branch['UID'].values, 24),
+            'Hour': np.repeat(hours, n_line),
+            'Flow': rng.normal(0.0, 0.45, 24 * n_line) * rating,
+        }).set_index(['Line', 'Hour'])
+        with gzip.open(lmp_dir / f'{day}.p.gz', 'wb') as f:
+            pickle.dump({'bus_detail': bus_detail, 'line_detail': line_detail}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _scenario_frame(rng: np.random.Generator, day: str, n_scen: int) -> pd.DataFrame:
+    times = [str(t) for t in pd.date_range(day, periods=24, freq='h')]
+    profile = 100.0 + 40.0 * np.sin(np.linspace(0, 2 * np.pi, 24))
+    actual = profile + rng.normal(0.0, 5.0, 24)
+    forecast = profile + rng.normal(0.0, 5.0, 24)
+    scen = profile + rng.normal(0.0, 12.0, (n_scen, 24))
+    values = np.vstack([actual, forecast, scen])
+    df = pd.DataFrame(values, columns=times)
+    df.insert(0, 'Type', ['Actual', 'Forecast'] + ['Scenario'] * n_scen)
+    df.index = ['actual', 'forecast'] + list(range(n_scen))
+    return df
+
+
+def _write_scenarios(out: Path, rng: np.random.Generator, day: str, n_scen: int, asset_ids: dict):
+    ymd = day.replace('-', '')
+    for version in ('t7k', 'rts'):
+        for asset_type in ASSET_TYPES:
+            target = out / 'scenarios_data' / f'{version}-scens-csv' / ymd / asset_type
+            target.mkdir(parents=True, exist_ok=True)
+            for aid in list(asset_ids[asset_type]) + ['AVG']:
+                _scenario_frame(rng, day, n_scen).to_csv(target / f'{aid}.csv')
+
+
+def _write_asset_lists(out: Path, asset_ids: dict):
+    # inputs.py reads the asset id lists from the tuning result files
+    for sub in ('tuning_final_files', 'tuning_final_files/texas7k', 'tuning_final_files/texas7k/pca'):
+        d = out / sub
+        d.mkdir(parents=True, exist_ok=True)
+        for asset_type in ASSET_TYPES:
+            pd.DataFrame({asset_type: asset_ids[asset_type], 'rho': 0.5}).to_csv(
+                d / f'escores_avg_on_tuning_{asset_type}_rhos.csv', index=False)
+
+
+def _write_risk_allocs(out: Path, rng: np.random.Generator, n_assets: int):
+    specs = {
+        'rts': ('2020-01-01', ['WIND', 'PV', 'RTPV']),
+        't7k': ('2018-01-01', ['WIND', 'PV']),
+    }
+    for version, (start, types) in specs.items():
+        d = out / 'reliability_cost_index_data' / version
+        d.mkdir(parents=True, exist_ok=True)
+        time = pd.date_range(start, periods=8760, freq='h')
+        type_allocs = pd.DataFrame(rng.gamma(2.0, 50.0, (len(time), len(types))), columns=types)
+        type_allocs.insert(0, 'time', time)
+        type_allocs.to_csv(d / f'daily_type-allocs_{version}_type_allocs.csv', index=False)
+        assets = [f'{version.upper()} ASSET {i}' for i in range(n_assets)]
+        asset_allocs = pd.DataFrame(rng.gamma(2.0, 5.0, (len(time), n_assets)).astype('float32'), columns=assets)
+        asset_allocs.insert(0, 'time', time)
+        asset_allocs.to_csv(d / f'daily_type-allocs_{version}_asset_allocs.csv', index=False)
+
+
+def generate(out_dir, n_bus: int = 7000, n_branch: int = 9000, n_scenarios: int = 1000,
+             n_days: int = 2, n_assets: int = 300, n_scenario_assets: int = 3, seed: int = 0) -> Path:
+    """Write a synthetic data directory and return its path."""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    bus, branch = _write_grid(out, rng, n_bus, n_branch, n_gen=max(1, n_bus // 5))
+    days = [str(d)[:10] for d in pd.date_range('2018-01-02', periods=n_days)]
+    _write_lmp_days(out, rng, bus, branch, days)
+    asset_ids = {t: [f'{t.upper()}_{i}' for i in range(n_scenario_assets)] for t in ASSET_TYPES}
+    _write_asset_lists(out, asset_ids)
+    _write_scenarios(out, rng, days[0], n_scenarios, asset_ids)
+    _write_scenarios(out, rng, '2020-01-01', n_scenarios, asset_ids)
+    _write_risk_allocs(out, rng, n_assets)
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description='Generate a synthetic Texas-7k-scale ORFEUS data directory.')
+    ap.add_argument('out_dir', help='Directory to write (use as ORFEUS_DATA_DIR)')
+    ap.add_argument('--buses', type=int, default=7000)
+    ap.add_argument('--branches', type=int, default=9000)
+    ap.add_argument('--scenarios', type=int, default=1000, help='Scenarios per asset-day')
+    ap.add_argument('--days', type=int, default=2, help='LMP days starting 2018-01-02')
+    ap.add_argument('--assets', type=int, default=300, help='Asset columns in the risk allocation files')
+    ap.add_argument('--seed', type=int, default=0)
+    args = ap.parse_args(argv)
+    out = generate(args.out_dir, n_bus=args.buses, n_branch=args.branches, n_scenarios=args.scenarios,
+                   n_days=args.days, n_assets=args.assets, seed=args.seed)
+    print(out)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -7,12 +7,16 @@ import os
 
 import pandas as pd  # type: ignore
 
+from utils.column_store import LazyColumnFrame
 from utils.config import SETTINGS
 from utils.dropbox_client import get_dropbox
+from utils.paths import resolve_case_insensitive
+from utils.schema import BRANCH_DTYPES, BUS_DTYPES, GEN_DTYPES, compact, join_gen_uids
 
 
-# Expose root dir for other modules
+# Expose root and data dirs for other modules
 ROOT_DIR: str = str(SETTINGS.root_dir)
+DATA_DIR: str = str(SETTINGS.data_dir)
 
 # Dropbox client, so pages can import dbx/HAS_DROPBOX from here without importing Dash app
 dbx, HAS_DROPBOX = get_dropbox()
@@ -78,7 +82,7 @@ def process_date_column(df: pd.DataFrame, date_column: str = 'time') -> pd.DataF
 
 
 # Paths
-data_tuning_dir = SETTINGS.root_dir / 'data' / 'tuning_final_files'
+data_tuning_dir = SETTINGS.data_dir / 'tuning_final_files'
 data_t7k_pca_dir = data_tuning_dir / 'texas7k' / 'pca'
 data_t7k_dir = data_tuning_dir / 'texas7k'
 
@@ -171,7 +175,7 @@ def _safe_read_dropbox_csv(dbx_path: str, fallback_local: Optional[str], stub_co
 
 
 def _safe_read_local_csv(local_rel_path: str, stub_cols: List[str], start: str, end: str) -> pd.DataFrame:
-    path = SETTINGS.root_dir / local_rel_path
+    path = SETTINGS.data_dir / local_rel_path
     try:
         df = pd.read_csv(path)
 
@@ -205,8 +209,19 @@ def _safe_read_local_csv(local_rel_path: str, stub_cols: List[str], start: str,
         return _stub_hourly_df(start, end, stub_cols)
 
 
+def _lazy_local_csv(local_rel_path: str, stub_cols: List[str], start: str, end: str):
+    """Column-on-demand view of a wide allocation CSV; falls back to a full read (or stub)."""
+    try:
+        frame = LazyColumnFrame(SETTINGS.data_dir / local_rel_path, start=start, end=end)
+        if not frame.empty:
+            return frame
+    except Exception:
+        pass
+    return process_date_column(_safe_read_local_csv(local_rel_path, stub_cols, start, end))
+
+
 # Risk Allocation (local only)
-folder_path_local = 'data/reliability_cost_index_data'
+folder_path_local = 'reliability_cost_index_data'
 
 # Type-level RTS (expects columns like WIND, PV, RTPV)
 type_allocs_rts = _safe_read_local_csv(
@@ -214,8 +229,8 @@ type_allocs_rts = _safe_read_local_csv(
     stub_cols=['WIND', 'PV', 'RTPV'],
     start='2020-01-01 00:00', end='2020-12-31 23:00')
 
-# Asset-level RTS (unknown asset ids -> provide placeholders)
-asset_allocs_rts = _safe_read_local_csv(
+# Asset-level RTS (unknown asset ids -> provide placeholders); assets load one column at a time
+asset_allocs_rts = _lazy_local_csv(
     os.path.join(folder_path_local, 'rts', 'daily_type-allocs_rts_asset_allocs.csv'),
     stub_cols=['Asset-1', 'Asset-2'],
     start='2020-01-01 00:00', end='2020-12-31 23:00')
@@ -227,37 +242,17 @@ type_allocs_t7k = _safe_read_local_csv(
     start='2018-01-01 00:00', end='2018-12-31 23:00')
 
 # Asset-level T7K
-asset_allocs_t7k = _safe_read_local_csv(
+asset_allocs_t7k = _lazy_local_csv(
     os.path.join(folder_path_local, 't7k', 'daily_type-allocs_t7k_asset_allocs.csv'),
     stub_cols=['Asset-1', 'Asset-2'],
     start='2018-01-01 00:00', end='2018-12-31 23:00')
 
 type_allocs_rts = process_date_column(type_allocs_rts)
-asset_allocs_rts = process_date_column(asset_allocs_rts)
 type_allocs_t7k = process_date_column(type_allocs_t7k)
-asset_allocs_t7k = process_date_column(asset_allocs_t7k)
 
 # read grid data (safe fallbacks when files are unavailable in CI)
-def _resolve_case_insensitive(p: str | Path) -> Path | None:
-    """Return an existing path matching p, trying case-insensitive match in the parent dir if needed."""
-    path = Path(p)
-    if path.exists():
-        return path
-    parent = path.parent
-    try:
-        target = path.name.lower()
-        for name in os.listdir(parent):
-            if name.lower() == target:
-                candidate = parent / name
-                if candidate.exists():
-                    return candidate
-    except Exception:
-        pass
-    return None
-
-
 def _safe_read_grid_csv(path: str, columns: list[str]) -> pd.DataFrame:
-    try_path = _resolve_case_insensitive(path)
+    try_path = resolve_case_insensitive(path)
     if try_path is None:
         # return empty frame with the expected schema so downstream ops don't crash
         return pd.DataFrame({c: pd.Series(dtype='object') for c in columns})
@@ -270,19 +265,18 @@ bus_cols = ['Bus ID', 'lat', 'lng', 'Zone', 'Sub Name', 'Bus Name', 'Area', 'GEN
 branch_cols = ['UID', 'From Bus', 'To Bus', 'From Name', 'To Name', 'Cont Rating']
 gens_cols = ['Bus ID', 'GEN UID']
 
-bus = _safe_read_grid_csv(os.path.join(ROOT_DIR,
-                               'data', 'Vatic_Grids', 'Texas-7k', 'TX_Data', 'SourceData', 'bus.csv'), bus_cols)
-branch = _safe_read_grid_csv(os.path.join(ROOT_DIR,
-                                  'data', 'Vatic_Grids', 'Texas-7k', 'TX_Data', 'SourceData', 'branch.csv'), branch_cols)
-gens = _safe_read_grid_csv(os.path.join(ROOT_DIR,
-                                'data', 'Vatic_Grids', 'Texas-7k', 'TX_Data', 'SourceData', 'gen.csv'), gens_cols)
+bus = _safe_read_grid_csv(os.path.join(DATA_DIR,
+                               'Vatic_Grids', 'Texas-7k', 'TX_Data', 'SourceData', 'bus.csv'), bus_cols)
+branch = _safe_read_grid_csv(os.path.join(DATA_DIR,
+                                  'Vatic_Grids', 'Texas-7k', 'TX_Data', 'SourceData', 'branch.csv'), branch_cols)
+gens = _safe_read_grid_csv(os.path.join(DATA_DIR,
+                                'Vatic_Grids', 'Texas-7k', 'TX_Data', 'SourceData', 'gen.csv'), gens_cols)
 
 if 'Cont Rating' in branch.columns:
     branch['Cont Rating'] = branch['Cont Rating'].replace(0, 1e6)
-# Consider the case that one bus may have multiple generators, put the list of enerators inside array
+# One bus may have several generators: join their UIDs into one string per bus
 try:
-    gens_busid = gens[['Bus ID', 'GEN UID']].groupby(['Bus ID'])[
-        'GEN UID'].unique().reset_index()
+    gens_busid = join_gen_uids(gens)
     bus = pd.merge(bus, gens_busid, how='left', on='Bus ID')
     if 'GEN UID' in bus.columns:
         bus['GEN UID'] = bus['GEN UID'].fillna('Not Gen')
@@ -290,3 +284,8 @@ except Exception:
     # keep bus as-is if schema is missing
     pass
 
+# Compact dtypes (categorical names, int32 IDs, float32 coordinates) for every worker's resident copy
+bus = compact(bus, BUS_DTYPES)
+branch = compact(branch, BRANCH_DTYPES)
+gens = compact(gens, GEN_DTYPES)
+
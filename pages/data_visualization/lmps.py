@@ -1,20 +1,31 @@
 import os
-import io
-import bz2
-import gzip
+import base64
+import functools
+import hashlib
+import weakref
 from datetime import date, timedelta, datetime
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import pickle
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.colors import n_colors
 
 from utils.ui import html, dcc, Input, Output, State, ctx, dbc, dash
-from utils.accessibility import figure_to_table_html
+from utils.accessibility import records_to_table_html, lazy_table_details, details_requested, details_first_opened
+from utils.cache import LRUCache, SharedCache
+from utils.fetch import fetch
+from utils.layout_cache import lazy_dropdown
+from utils.metrics import stage
+from utils.singleflight import coalesce
+from utils import response_cache, warmup
+from utils import lmp_stats
+from utils.congestion_index import load_index
+from utils.search import PrefixIndex, dropdown_options, SEARCH_LIMIT
+from utils import spatial
 from utils.config import SETTINGS
+from utils.pickle_io import load_pickle_bytes, codec_for
+from utils.paths import resolve_case_insensitive
+from utils.schema import LMP_BUS_DTYPES, LMP_LINE_DTYPES, compact, widen_float32, widen_frame
 from inputs.inputs import date_values_t7k, bus, branch, dbx, HAS_DROPBOX
 from utils.md import load_markdown, extract_first_h1
 markdown_text_lmps_overview = load_markdown('markdown', 'lmps_overview.md')
@@ -26,46 +37,17 @@ dash.register_page(__name__, path='/lmpplot', name='LMPs', order=3, title=LMPS_T
 PLOT_TOKEN = SETTINGS.mapbox_token
 PLOT_STYLE = SETTINGS.mapbox_style or ('light' if PLOT_TOKEN else 'open-street-map')
 LMP_DEBUG = os.getenv('LMP_DEBUG', '0').strip() in ('1', 'true', 'True', 'yes', 'on')
+try:
+    LMP_DAY_CACHE_SIZE = int(os.getenv('LMP_DAY_CACHE_SIZE', '4'))
+except Exception:
+    LMP_DAY_CACHE_SIZE = 4
 
+# Fixed bus coordinates, bucketed once for viewport queries (see utils/spatial.py)
+try:
+    _BUS_GRID = spatial.GridIndex(bus['lat'], bus['lng'], keys=bus['Bus ID'])
+except Exception:
+    _BUS_GRID = None
 
-def _prepare_pandas_compat():
-    """Install aliases for old pandas module paths used in legacy pickles.
-
-    Some historical pickles reference 'pandas.core.indexes.numeric' which was
-    removed/reshuffled in pandas 2.x. We alias it to 'pandas.core.indexes.base'
-    so unpickling succeeds. Extend as needed for other legacy paths.
-    """
-    try:
-        import sys, types
-        import pandas as pd  # noqa: F401
-        try:
-            import pandas as pd  # type: ignore
-            import pandas.core.indexes.base as base  # type: ignore
-            # Create/refresh alias module
-            if 'pandas.core.indexes.numeric' not in sys.modules:
-                m = types.ModuleType('pandas.core.indexes.numeric')
-                sys.modules['pandas.core.indexes.numeric'] = m
-            else:
-                m = sys.modules['pandas.core.indexes.numeric']
-            # Copy base attributes
-            m.__dict__.update(base.__dict__)
-            # Provide legacy index class names expected by old pickles
-            for legacy in ('Int64Index', 'UInt64Index', 'Float64Index'):
-                try:
-                    setattr(base, legacy, pd.Index)
-                except Exception:
-                    pass
-                try:
-                    setattr(m, legacy, pd.Index)
-                except Exception:
-                    pass
-            if LMP_DEBUG:
-                print('[LMP] Installed pandas compat aliases for legacy index classes')
-        except Exception as e:
-            if LMP_DEBUG:
-                print(f'[LMP] pandas compat alias failed: {e}')
-    except Exception:
-        pass
 
 html_div_lmps_overview =  html.Section(children=[
                 html.Div([
@@ -89,7 +71,7 @@ html_div_lmps = html.Section(children=[
                         dbc.Col([
                             html.Label([
                                 'Select Day',
-                                dcc.Dropdown(
+                                lazy_dropdown(
                                     date_values_t7k[:-2],
                                     id='date_values_t7k_lmps',
                                     value=date_values_t7k[0],
@@ -112,18 +94,102 @@ html_div_lmps = html.Section(children=[
                         ], xs=12, md=6, lg=3),
                     ], className='controls-row'),
 
+                    # Congestion events: pick a line or bus, then an hour to jump the map to (utils/congestion_index.py)
+                    dbc.Row([
+                        dbc.Col([
+                            html.Label([
+                                'Find Events for a Line or Bus',
+                                dcc.Dropdown(
+                                    [],
+                                    id='lmp-event-element',
+                                    placeholder='Type a line UID or bus ID',
+                                )
+                            ]),
+                        ], xs=12, md=6, lg=4),
+                        dbc.Col([
+                            html.Label([
+                                'Jump to Event',
+                                dcc.Dropdown(
+                                    [],
+                                    id='lmp-event',
+                                    placeholder='Type a date, e.g. 2018-07',
+                                )
+                            ]),
+                        ], xs=12, md=6, lg=4),
+                    ], className='controls-row'),
+                    html.Div(id='lmp-event-summary', className='vis-caption', **{'aria-live': 'polite', 'role': 'status'}),
+
                     html.Br(),
 
                     dbc.Row([
                         dbc.Col([
                             html.Figure([
                                 dcc.Graph(id='fig_lmp_geo', className='graph-pad graph-map', config={"responsive": True}),
+                                dcc.Store(id='fig_lmp_geo-state'),
+                                # Element picked under 'Jump to Event': where to center and what to highlight
+                                dcc.Store(id='fig_lmp_geo-focus'),
                                 html.Figcaption(id='fig_lmp_geo-caption', className='vis-caption', tabIndex=0)
                             ], className='graph-figure', role='group', **{"aria-labelledby": 'fig_lmp_geo-caption'}),
-                            html.Details([
-                                html.Summary("Data table", **{"aria-controls": "fig_lmp_geo-table"}),
-                                html.Div(id='fig_lmp_geo-table', className='vis-table-wrapper')
-                            ], open=False)
+                            lazy_table_details('fig_lmp_geo-table')
+                        ])
+                    ], justify='start'),
+
+                    html.Div(className='section-divider'),
+
+                    # Hourly playback: the whole day is sent once, hours switch in the browser
+                    dbc.Row(
+                        dbc.Col(html.H2(children='Hourly Playback', className='index-title', id='lmps-day-title')),
+                        justify='start', align='start'),
+                    dbc.Row([
+                        dbc.Col([
+                            html.Label('Hour', id='lmp-day-hour-label', htmlFor='lmp-day-hour'),
+                            dcc.Slider(0, 23, 1, value=15, id='lmp-day-hour',
+                                       marks={h: str(h) for h in range(0, 24, 3)}),
+                            html.Div(id='live-lmp-day-hour', className='visually-hidden', **{'aria-live': 'polite', 'role': 'status'})
+                        ], xs=12, md=9),
+                        dbc.Col([
+                            html.Button('Play', id='lmp-day-play', n_clicks=0, className='btn-white',
+                                        **{'aria-pressed': 'false', 'aria-label': 'Play the day hour by hour'}),
+                        ], xs=12, md=3),
+                    ], className='controls-row'),
+                    dcc.Interval(id='lmp-day-interval', interval=1000, disabled=True),
+                    dcc.Store(id='lmp-day-store'),
+
+                    dbc.Row([
+                        dbc.Col([
+                            html.Figure([
+                                dcc.Graph(id='fig_lmp_day', className='graph-pad graph-map', config={"responsive": True}),
+                                html.Figcaption(id='fig_lmp_day-caption', className='vis-caption', tabIndex=0)
+                            ], className='graph-figure', role='group', **{"aria-labelledby": 'fig_lmp_day-caption'}),
+                        ])
+                    ], justify='start'),
+
+                    html.Div(className='section-divider'),
+
+                    # Multi-day statistics: precomputed by utils/lmp_stats.py, one file read per worker
+                    dbc.Row(
+                        dbc.Col(html.H2(children='Multi-day Statistics', className='index-title', id='lmps-stats-title')),
+                        justify='start', align='start'),
+                    dbc.Row([
+                        dbc.Col([
+                            html.Label([
+                                'Statistic',
+                                dcc.Dropdown(
+                                    [{'label': label, 'value': key} for key, (label, _) in lmp_stats.METRICS.items()],
+                                    id='lmp-stats-metric',
+                                    value='lmp_mean',
+                                    clearable=False,
+                                )
+                            ]),
+                        ], xs=12, md=6, lg=4),
+                    ], className='controls-row'),
+
+                    dbc.Row([
+                        dbc.Col([
+                            html.Figure([
+                                dcc.Graph(id='fig_lmp_stats', className='graph-pad graph-map', config={"responsive": True}),
+                                html.Figcaption(id='fig_lmp_stats-caption', className='vis-caption', tabIndex=0)
+                            ], className='graph-figure', role='group', **{"aria-labelledby": 'fig_lmp_stats-caption'}),
                         ])
                     ], justify='start')
 
@@ -158,26 +224,228 @@ def _announce_lmp_hour(val):  # noqa: D401
     return f"Hour selected {val}"  # Short phrase for SR
 
 
-def plot_particular_hour(hr, bus_detail, line_detail):
-    # Manually Set up Discrete Color Scale
-    # Filter to hour and work on copies to avoid SettingWithCopy warnings
-    bus_detail_hr = bus_detail.loc[bus_detail['Hour'] == hr].copy()
-    line_detail_hr = line_detail.loc[line_detail['Hour'] == hr].copy()
-
-    line_detail_hr['Flow'] = line_detail_hr['Flow'].apply(
-        lambda x: round(x, 2))
-    line_detail_hr['UID_Flow'] = line_detail_hr['UID'].astype(str) + ': ' + \
-                                 line_detail_hr['Flow'].astype(str)
-
-    # Ensure numeric and valid coordinates to avoid Mapbox extent warnings
-    bus_detail_hr['lat'] = pd.to_numeric(bus_detail_hr['lat'], errors='coerce')
-    bus_detail_hr['lng'] = pd.to_numeric(bus_detail_hr['lng'], errors='coerce')
-    bus_detail_hr = bus_detail_hr.dropna(subset=['lat', 'lng'])
-    bus_detail_hr = bus_detail_hr[(bus_detail_hr['lat'].between(-90, 90)) &
-                                   (bus_detail_hr['lng'].between(-180, 180))]
+# The hourly map keeps the same traces for every hour of a day: one marker per
+# bus in view (flagged buses enlarged), or at low zoom hexagons plus the day's
+# flagged buses as individual markers, and one trace per congested-line width
+# band. Hour changes then only change per-point values.
+CONGESTED_RATIO = 0.98
+# (lowest |flow| / rating, line width) per band, least congested first so the worst are on top
+LINE_BANDS = ((0.98, 14.8), (1.1, 16.0), (1.3, 18.0), (1.6, 21.0))
+# Marker diameter in px of the bus with the largest |LMP|; highlighted buses are at least HIGHLIGHT_PX
+BUS_PX = 3.0
+HIGHLIGHT_PX = 6.0
+BUS_TRACE = 'Buses (enlarged: congested line, mismatch or negative LMP)'
+HIGHLIGHT_TRACE = 'Buses with Congested Lines, Mismatch or Negative LMP'
+CLUSTER_TRACE = 'Bus Clusters (mean LMP; zoom in for buses)'
+LINE_TRACE = 'Congested Lines'
+# A jumped-to event is shown at this zoom, above spatial.CLUSTER_ZOOM so its buses are drawn individually
+FOCUS_ZOOM = max(8.0, spatial.CLUSTER_ZOOM + 1)
+FOCUS_COLOR = 'rgba(255, 191, 0, 0.6)'
+_LINE_COLS = ['Hour', 'UID', 'Flow', 'From Bus', 'To Bus', 'CongestionRatio',
+              'From Bus Lat', 'From Bus Lng', 'To Bus Lat', 'To Bus Lng']
+
+# Keyed on the cached day's frames (see _day_slots)
+_SLOT_CACHE = LRUCache(maxsize=LMP_DAY_CACHE_SIZE, name='lmp_day_slots')
+
+
+def _build_day_slots(bus_detail, line_detail) -> dict:
+    lat = pd.to_numeric(bus_detail['lat'], errors='coerce').to_numpy(dtype='float64')
+    lng = pd.to_numeric(bus_detail['lng'], errors='coerce').to_numpy(dtype='float64')
+    hour = pd.to_numeric(bus_detail['Hour'], errors='coerce').to_numpy(dtype='float64')
+    ok = (np.isfinite(lat) & np.isfinite(lng) & (np.abs(lat) <= 90) & (np.abs(lng) <= 180)
+          & np.isin(hour, np.arange(24)))
+    rows = bus_detail[ok]
+    bus_id, first, pos = np.unique(rows['Bus ID'].to_numpy(dtype='int64'), return_index=True, return_inverse=True)
+    hr = hour[ok].astype(np.int64)
+    n = len(bus_id)
+
+    def matrix(col):
+        m = np.full((24, n), np.nan)
+        if col in rows.columns:
+            m[hr, pos] = widen_float32(pd.to_numeric(rows[col], errors='coerce').to_numpy())
+        return m
+
+    lmp, demand, mismatch = matrix('LMP'), matrix('Demand'), matrix('Mismatch')
+    names = rows['Bus Name'].astype(str).to_numpy()[first] if 'Bus Name' in rows.columns else bus_id.astype(str)
+    gens = rows['GEN UID'].astype(str).to_numpy()[first] if 'GEN UID' in rows.columns else np.full(n, 'Not Gen')
+    hovertext = [f'{name} (Bus {i})' if gen == 'Not Gen' else f'{name} (Bus {i}, {gen})'
+                 for name, i, gen in zip(names, bus_id, gens)]
+
+    # Congested lines of the whole day, with valid end points, least congested first
+    lines = line_detail[[c for c in _LINE_COLS if c in line_detail.columns]]
+    lines = lines[pd.to_numeric(lines['CongestionRatio'], errors='coerce') >= CONGESTED_RATIO]
+    if set(_LINE_COLS) <= set(lines.columns):
+        lines = widen_frame(lines)
+        coords = lines[['From Bus Lat', 'From Bus Lng', 'To Bus Lat', 'To Bus Lng']].apply(pd.to_numeric, errors='coerce')
+        lines = lines[coords['From Bus Lat'].between(-90, 90) & coords['To Bus Lat'].between(-90, 90)
+                      & coords['From Bus Lng'].between(-180, 180) & coords['To Bus Lng'].between(-180, 180)]
+        lines = lines.sort_values('CongestionRatio', kind='stable')
+    else:
+        lines = pd.DataFrame(columns=_LINE_COLS)
+
+    # A bus is highlighted in the hours it has a negative price, a mismatch or a congested line
+    congested = np.zeros((24, n), dtype=bool)
+    line_hr = lines['Hour'].to_numpy(dtype='int64')
+    for end in ('From Bus', 'To Bus'):
+        ids = lines[end].to_numpy(dtype='int64')
+        p = np.searchsorted(bus_id, ids).clip(max=max(n - 1, 0))
+        known = (bus_id[p] == ids) if n else np.zeros(len(ids), dtype=bool)
+        congested[line_hr[known], p[known]] = True
+    negative = lmp < 0
+    mismatched = np.nan_to_num(mismatch) != 0
+    flag = negative | mismatched | congested
+    date_label = ''
+    if 'Date' in rows.columns and len(rows):
+        date_label = str(rows['Date'].iloc[0])
+    return {
+        # ~1 m precision; full float32 digits would double the geometry in the JSON
+        'date': date_label, 'bus_id': bus_id, 'lat': np.round(lat[ok][first], 5), 'lng': np.round(lng[ok][first], 5),
+        'hovertext': np.asarray(hovertext, dtype=object), 'lmp': lmp, 'demand': demand, 'mismatch': mismatch,
+        'negative': negative, 'mismatched': mismatched, 'congested': congested, 'flag': flag,
+        'lines': lines,
+    }
+
+
+def _day_slots(bus_detail, line_detail) -> dict:
+    """Fixed bus order for a day, with 24 x bus LMP, demand and highlight matrices.
+
+    Built once per cached day; the cache holds weak references so a day
+    evicted from the day cache is rebuilt rather than matched by a reused id.
+    """
+    key = (id(bus_detail), id(line_detail))
+    hit = _SLOT_CACHE.get(key)
+    if hit is not None and hit[0]() is bus_detail and hit[1]() is line_detail:
+        return hit[2]
+    slots = _build_day_slots(bus_detail, line_detail)
+    _SLOT_CACHE.set(key, (weakref.ref(bus_detail), weakref.ref(line_detail), slots))
+    return slots
+
+
+def _slots_in_view(slots, view) -> np.ndarray:
+    """Indices of the day's bus slots inside ``view`` (all of them without a view)."""
+    if view is None:
+        return np.arange(len(slots['bus_id']))
+    if _BUS_GRID is not None and len(_BUS_GRID):
+        ids = _BUS_GRID.query(view['lat_min'], view['lat_max'], view['lng_min'], view['lng_max'])
+        return np.flatnonzero(np.isin(slots['bus_id'], ids))
+    return np.flatnonzero(spatial.in_view(view, slots['lat'], slots['lng']))
+
+
+def _bus_sizes(lmp) -> np.ndarray:
+    """Marker diameters: area follows |LMP|, negative prices get the largest marker."""
+    size = np.abs(lmp)
+    finite = np.isfinite(size)
+    top = size[finite].max() if finite.any() else 0.0
+    size[lmp < 0] = top
+    out = np.zeros_like(size)
+    if top > 0:
+        out[finite] = BUS_PX * np.sqrt(size[finite] / top)
+    return np.round(out, 2)
+
+
+def _hex_clusters(slots, idx, zoom):
+    """Hexagons over the buses ``idx``: fixed positions and labels, and a function of the hour's values."""
+    cell = spatial.hexbin(slots['lat'][idx], slots['lng'][idx], spatial.hex_size_deg(zoom))
+    _, member = np.unique(cell, return_inverse=True)
+    k = int(member.max()) + 1 if len(member) else 0
+    count = np.bincount(member, minlength=k)
+    lat = np.bincount(member, weights=slots['lat'][idx], minlength=k) / np.maximum(count, 1)
+    lng = np.bincount(member, weights=slots['lng'][idx], minlength=k) / np.maximum(count, 1)
+    first = np.full(k, len(idx))
+    np.minimum.at(first, member, np.arange(len(idx)))
+    label = np.where(count == 1, slots['hovertext'][idx][first.clip(max=max(len(idx) - 1, 0))],
+                     np.char.add(count.astype(str), ' buses').astype(object))
+
+    def hour_values(hr):
+        lmp = slots['lmp'][hr, idx]
+        demand = np.nan_to_num(slots['demand'][hr, idx])
+        ok = np.isfinite(lmp)
+        n_ok = np.bincount(member[ok], minlength=k)
+        mean = np.bincount(member[ok], weights=lmp[ok], minlength=k) / np.where(n_ok, n_ok, np.nan)
+        lo = np.full(k, np.inf)
+        hi = np.full(k, -np.inf)
+        np.minimum.at(lo, member[ok], lmp[ok])
+        np.maximum.at(hi, member[ok], lmp[ok])
+        lo[n_ok == 0] = np.nan
+        hi[n_ok == 0] = np.nan
+        total = np.bincount(member, weights=demand, minlength=k)
+        return np.round(mean, 2), np.round(np.column_stack([lo, hi, total]), 2)
+
+    return {'lat': np.round(lat, 5), 'lng': np.round(lng, 5), 'label': label, 'buses': count,
+            'marker_size': np.round(5 + 10 * np.sqrt(count / max(count.max(initial=0), 1)), 2),
+            'hour_values': hour_values}
+
+
+def _status_text(slots, hr, idx) -> list[str]:
+    """Why each highlighted bus stands out this hour ('' when it does not)."""
+    neg, mis, cong = slots['negative'][hr, idx], slots['mismatched'][hr, idx], slots['congested'][hr, idx]
+    out = []
+    for a, b, c in zip(neg, mis, cong):
+        parts = [s for s, on in (('negative LMP', a), ('mismatch', b), ('congested line', c)) if on]
+        out.append(', '.join(parts))
+    return out
+
+
+def _line_band_traces(lines, slots, hr):
+    """One trace per ``LINE_BANDS`` width band: segments separated by None, hover data per vertex."""
+    bus_id, lmp = slots['bus_id'], slots['lmp'][hr]
+
+    def end_lmp(ids):
+        if not len(bus_id):
+            return np.full(len(ids), np.nan)
+        p = np.searchsorted(bus_id, ids).clip(max=len(bus_id) - 1)
+        return np.where(bus_id[p] == ids, lmp[p], np.nan)
+
+    ratio = lines['CongestionRatio'].to_numpy(dtype='float64')
+    from_lmp = end_lmp(lines['From Bus'].to_numpy(dtype='int64'))
+    to_lmp = end_lmp(lines['To Bus'].to_numpy(dtype='int64'))
+    bounds = [lo for lo, _ in LINE_BANDS[1:]]
+    band = np.searchsorted(bounds, ratio, side='right')
+    traces = []
+    for b, (_, width) in enumerate(LINE_BANDS):
+        sel = np.flatnonzero(band == b)
+        lat, lon, custom = [], [], []
+        for i in sel:
+            row = lines.iloc[i]
+            data = [str(row['UID']), round(float(row['Flow']), 2), int(row['From Bus']), int(row['To Bus']),
+                    round(float(ratio[i]), 2), round(float(from_lmp[i]), 2), round(float(to_lmp[i]), 2)]
+            lat += [float(row['From Bus Lat']), float(row['To Bus Lat']), None]
+            lon += [float(row['From Bus Lng']), float(row['To Bus Lng']), None]
+            custom += [data, data, [None] * len(data)]
+        traces.append(go.Scattermapbox(
+            mode='lines', lat=lat, lon=lon, customdata=custom,
+            hovertemplate=('%{customdata[0]}: %{customdata[1]:.2f}<br>From: %{customdata[2]}<br>To: %{customdata[3]}'
+                           '<br>CongesRatio=%{customdata[4]:.2f}<br>FromLMP=%{customdata[5]:.2f}'
+                           '<br>ToLMP=%{customdata[6]:.2f}<extra></extra>'),
+            line=dict(width=width, color='rgb(255, 0, 0)'), opacity=1,
+            name=LINE_TRACE, legendgroup=LINE_TRACE, showlegend=b == 0,
+        ))
+    return traces
+
+
+def plot_particular_hour(hr, bus_detail, line_detail, view=None):
+    """Map of an hour's LMPs and congested lines.
+
+    With a ``view`` (see ``utils.spatial.viewport``) only buses and congested
+    lines inside it are drawn, and below ``LMP_CLUSTER_ZOOM`` the base layer
+    is hexagons. Every hour of a day draws the same traces over the same bus
+    order, so switching hours only changes marker values, hover values and
+    the congested segments (see ``_lmp_hour_patch``). Buses with a congested
+    line, mismatch or negative price this hour are enlarged, or drawn over
+    the hexagons on the highlight trace.
+    """
+    slots = _day_slots(bus_detail, line_detail)
+    try:
+        hr = int(hr)
+    except (TypeError, ValueError):
+        hr = -1
+    has_hour = 0 <= hr < 24 and bool(np.isfinite(slots['lmp'][hr]).any()) if len(slots['bus_id']) else False
+    idx = _slots_in_view(slots, view) if has_hour else np.zeros(0, dtype=np.int64)
+    lines = slots['lines']
+    lines_hr = lines[lines['Hour'] == hr] if has_hour else lines.iloc[0:0]
 
     # If no bus data for this hour, return an empty map with a helpful title
-    if bus_detail_hr.empty:
+    if not len(idx):
         fig_empty = go.Figure()
         fig_empty.update_layout(
             hovermode='closest',
@@ -189,103 +457,68 @@ def plot_particular_hour(hr, bus_detail, line_detail):
                 pitch=0,
                 zoom=4.5,
             ),
-            title=f"No data available for Hr {hr}",
+            title=f"No buses in view at Hr {hr}" if has_hour else f"No data available for Hr {hr}",
             legend=dict(orientation='h', x=0, y=-0.1),
             margin=dict(l=10, r=10, t=40, b=40),
             height=None, width=None
         )
-        return fig_empty, line_detail_hr.iloc[0:0]
-
-    bus_detail_hr['ABS LMP'] = bus_detail_hr['LMP'].apply(lambda x: abs(x))
-    # The size would vary with LMP
-    bus_detail_hr['size'] = bus_detail_hr['ABS LMP']
-
-    size_max_ = bus_detail_hr['size'].max()
-    # Emphasize the extreme case in the plot by increasing size where prices <= -1e4
-    bus_detail_hr.loc[bus_detail_hr['LMP'] < 0, 'size'] = size_max_
-    #     bus_detail_hr.loc[bus_detail_hr['LMP'] >= 1000, 'size'] = size_max_
-
-    #     max_lmp_hr = bus_detail_hr['ABS LMP'].max()
-    #     min_lmp_hr = bus_detail_hr['ABS LMP'].min()
-
-    #     if (max_lmp_hr-min_lmp_hr) != 0:
-    #          bus_detail_hr['size'] = 5+(bus_detail_hr['ABS LMP']-min_lmp_hr)/(max_lmp_hr-min_lmp_hr)
-    #         print(bus_detail_hr['size'])
-    #     else:
-    #         print('LMP Prices are Same across all Busses')
-    #         bus_detail_hr['size'] = 5
-
-    bus_detail_mismatch = bus_detail_hr.loc[bus_detail_hr['Mismatch'] != 0]
-
-    # separate high congest from low congest
-    line_detail_hr_highcongest = line_detail_hr[
-        line_detail_hr['CongestionRatio'] >= 0.98] \
-        .reset_index().sort_values(by=['CongestionRatio'])
-    # Filter invalid coordinates for line endpoints
-    for col in ['From Bus Lat', 'From Bus Lng', 'To Bus Lat', 'To Bus Lng']:
-        line_detail_hr_highcongest[col] = pd.to_numeric(line_detail_hr_highcongest[col], errors='coerce')
-    line_detail_hr_highcongest = line_detail_hr_highcongest.dropna(subset=['From Bus Lat', 'From Bus Lng', 'To Bus Lat', 'To Bus Lng'])
-    line_detail_hr_highcongest = line_detail_hr_highcongest[
-        line_detail_hr_highcongest['From Bus Lat'].between(-90, 90) &
-        line_detail_hr_highcongest['To Bus Lat'].between(-90, 90) &
-        line_detail_hr_highcongest['From Bus Lng'].between(-180, 180) &
-        line_detail_hr_highcongest['To Bus Lng'].between(-180, 180)
-    ]
-
+        if view is not None:
+            fig_empty.update_layout(mapbox_center=view['center'], mapbox_zoom=view['zoom'])
+        return fig_empty, lines_hr
+
+    lmp = slots['lmp'][hr, idx]
+    flag = slots['flag'][hr, idx]
+    fig = go.Figure()
+    clustered = (view is not None and view['zoom'] < spatial.CLUSTER_ZOOM
+                 and len(idx) >= spatial.CLUSTER_MIN_POINTS)
+    if clustered:
+        clusters = _hex_clusters(slots, idx, view['zoom'])
+        mean, custom = clusters['hour_values'](hr)
+        fig.add_trace(go.Scattermapbox(
+            lat=clusters['lat'], lon=clusters['lng'], mode='markers',
+            marker=dict(size=clusters['marker_size'], color=mean, coloraxis='coloraxis', opacity=0.7),
+            hovertext=clusters['label'], customdata=custom,
+            hovertemplate=('<b>%{hovertext}</b><br>Mean LMP=%{marker.color:.2f}'
+                           '<br>LMP range=%{customdata[0]:.2f} to %{customdata[1]:.2f}'
+                           '<br>Demand=%{customdata[2]:.1f}<extra></extra>'),
+            name=CLUSTER_TRACE, showlegend=True,
+        ))
+        # This hour's flagged buses in view stay individual markers; the set is patched per hour
+        hi = idx[flag]
+        fig.add_trace(go.Scattermapbox(
+            lat=slots['lat'][hi], lon=slots['lng'][hi], mode='markers',
+            marker=dict(size=int(HIGHLIGHT_PX),
+                        color=np.round(slots['lmp'][hr, hi], 2), coloraxis='coloraxis', opacity=1.0),
+            hovertext=slots['hovertext'][hi], customdata=_status_text(slots, hr, hi),
+            hovertemplate='<b>%{hovertext}</b><br>LMP=%{marker.color:.2f}<br>%{customdata}<extra></extra>',
+            name=HIGHLIGHT_TRACE, showlegend=True,
+        ))
+    else:
+        # One marker per bus; this hour's flagged buses are enlarged
+        size = _bus_sizes(lmp)
+        size = np.where(flag, np.maximum(size, HIGHLIGHT_PX), size)
+        custom = [[d, st] for d, st in zip(np.round(slots['demand'][hr, idx], 2), _status_text(slots, hr, idx))]
+        fig.add_trace(go.Scattermapbox(
+            lat=slots['lat'][idx], lon=slots['lng'][idx], mode='markers',
+            marker=dict(size=size, color=np.round(lmp, 2), coloraxis='coloraxis', opacity=0.7),
+            hovertext=slots['hovertext'][idx], customdata=custom,
+            hovertemplate=('<b>%{hovertext}</b><br>LMP=%{marker.color:.2f}<br>Demand=%{customdata[0]:.2f}'
+                           '<br>%{customdata[1]}<extra></extra>'),
+            name=BUS_TRACE, showlegend=True,
+        ))
+
+    if view is not None:
+        lines_hr = lines_hr[spatial.segments_in_view(
+            view, lines_hr['From Bus Lat'], lines_hr['From Bus Lng'], lines_hr['To Bus Lat'], lines_hr['To Bus Lng'])]
     # Cap the number of rendered congested lines to reduce geometry load
     try:
         max_lines = int(os.getenv('LMP_MAX_LINE_TRACES', '500'))
     except Exception:
         max_lines = 500
-    if line_detail_hr_highcongest.shape[0] > max_lines:
+    if lines_hr.shape[0] > max_lines:
         # Keep the most congested lines (highest ratio)
-        line_detail_hr_highcongest = line_detail_hr_highcongest.tail(max_lines)
-
-    bus_highcongest = set(line_detail_hr_highcongest['To Bus'].unique()).union(
-        set(line_detail_hr_highcongest['From Bus'].unique()))
-    bus_detail_hr_highcongest = bus_detail_hr[
-        bus_detail_hr['Bus ID'].isin(bus_highcongest)]
-    bus_detail_hr_lowcongest = bus_detail_hr[
-        ~bus_detail_hr['Bus ID'].isin(bus_highcongest)]
-
-    #     print('Maximum Congestion Ratio')
-    #     print(line_detail_hr_highcongest['CongestionRatio'][0])
-    # plot highcongest before lowcongest so we could hover to see highcongest info even if these buses are in the same location
-    fig = px.scatter_mapbox(bus_detail_hr_lowcongest, lat="lat",
-                                       lon="lng", color="LMP", opacity=0.7,
-                                       size='size',
-                                       hover_name='Bus Name',
-                                       hover_data=['Bus ID', 'LMP',
-                                                   'Demand',
-                                                   'GEN UID'],
-                                       size_max=3, zoom=1)
-
-    if bus_detail_hr_highcongest.shape[0] != 0:
-        fig_highcongest = px.scatter_mapbox(bus_detail_hr_highcongest, lat="lat",
-                                lon="lng",
-                                color="LMP", opacity=0.7, size='size',
-                                hover_name='Bus Name',
-                                hover_data=['Bus ID', 'LMP', 'Demand',
-                                            'GEN UID'],
-                                size_max=3, zoom=1)
-        fig.add_trace(fig_highcongest.data[0])
-
-    if bus_detail_mismatch.shape[0] != 0:
-        busids_mismatch = list(bus_detail_mismatch['Bus ID'].unique())
-        line_detail_hr_mismatch = line_detail_hr[
-            line_detail_hr['From Bus'].isin(busids_mismatch) |
-            line_detail_hr['To Bus'].isin(busids_mismatch)]
-    if not bus_detail_mismatch.empty:
-        fig_mismatch = px.scatter_mapbox(bus_detail_mismatch, lat="lat",
-                         lon="lng", color="LMP", opacity=1.0,
-                         size='size',
-                         hover_name='Bus Name',
-                         hover_data=['Bus ID', 'LMP',
-                                 'Mismatch', 'Demand',
-                                 'GEN UID'],
-                         size_max=3, zoom=1)
-        if len(fig_mismatch.data) > 0:
-            fig.add_trace(fig_mismatch.data[0])
+        lines_hr = lines_hr.tail(max_lines)
+    fig.add_traces(_line_band_traces(lines_hr, slots, hr))
 
     fig.update_layout(
         hovermode='closest',
@@ -299,75 +532,19 @@ def plot_particular_hour(hr, bus_detail, line_detail):
             ),
             pitch=0,
             zoom=4.5,
-     )
-    )
-
-    # need to consider direction:the bus line is starting point
-    fig1 = go.Figure(fig)
-
-    # plot high congestion bus so we could hover them even if they overlap with other buses in same location
-    # Plot Transmission Lines Related to Mismatch Buses
-
-    # Build a colorscale for congested lines; avoid n_colors for 0 or 1 (division by zero)
-    num_lines = int(line_detail_hr_highcongest.shape[0])
-    if num_lines >= 2:
-        bluepurplered = n_colors('rgb(0, 0, 255)', 'rgb(255, 0, 0)', num_lines, colortype='rgb')
-        # Fix decimal point imprecision at the ends
-        bluepurplered[0] = 'rgb(0, 0, 255)'
-        bluepurplered[-1] = 'rgb(255, 0, 0)'
-    elif num_lines == 1:
-        bluepurplered = ['rgb(255, 0, 0)']
-    else:
-        bluepurplered = []
-
-    # Plot line details
-    if line_detail_hr_highcongest.shape[0] != 0:
-        for idx, line_detail_hr_row in line_detail_hr_highcongest.iterrows():
-            fromlmp = bus_detail_hr[
-                bus_detail_hr['Bus ID'] == line_detail_hr_row['From Bus']][
-                'LMP'].values[0]
-            tolmp = \
-                bus_detail_hr[
-                    bus_detail_hr['Bus ID'] == line_detail_hr_row['To Bus']][
-                    'LMP'].values[0]
-
-            fig1.add_trace(go.Scattermapbox(
-                mode="lines",
-                lat=line_detail_hr_row[['From Bus Lat', 'To Bus Lat']].values,
-                lon=line_detail_hr_row[['From Bus Lng', 'To Bus Lng']].values,
-                hovertemplate=line_detail_hr_row[
-                                  'UID_Flow'] + ' <br>From: ' + str(
-                    line_detail_hr_row['From Bus']) +
-                              '<br>To:' + str(line_detail_hr_row['To Bus']) +
-                              '<extra>CongesRatio={CongesRatio:.2f}</extra>'.format(
-                                  CongesRatio=line_detail_hr_row[
-                                      'CongestionRatio']) +
-                              '<extra><br>FromLMP={FromLMP:.2f}</extra>'.format(
-                                  FromLMP=fromlmp) +
-                              '<extra><br>ToLMP={ToLMP:.2f}</extra>'.format(
-                                  ToLMP=tolmp),
-                line=dict(
-                    width=5 + float(line_detail_hr_row['CongestionRatio']) * 10,
-                    color=bluepurplered[-1]), opacity=1,
-                name='Congested Lines', legendgroup='Congested Lines'
-            ))
-
-    date_label = None
-    try:
-        date_label = bus_detail_hr['Date'].iloc[0]
-    except Exception:
-        date_label = ''
-    fig1.update_layout(
-        title='LMPs Distribution at Hr {}, {} under Texas 7k Grid'.format(hr, date_label),
+        ),
+        title='LMPs Distribution at Hr {}, {} under Texas 7k Grid'.format(hr, slots['date']),
         legend=dict(orientation='h', x=0, y=-0.1),
-        coloraxis_colorbar=dict(orientation="h"),
+        coloraxis=dict(colorbar=dict(title=dict(text='LMP'), orientation='h')),
         margin=dict(l=10, r=10, t=40, b=40),
         height=None, width=None
     )
+    if view is not None:
+        fig.update_layout(mapbox_center=view['center'], mapbox_zoom=view['zoom'])
 
     # Subtle note when there are no congested lines to plot
-    if int(line_detail_hr_highcongest.shape[0]) == 0:
-        fig1.add_annotation(
+    if int(lines_hr.shape[0]) == 0:
+        fig.add_annotation(
             text="No congested lines for this hour",
             xref="paper",
             yref="paper",
@@ -380,26 +557,7 @@ def plot_particular_hour(hr, bus_detail, line_detail):
             bordercolor="rgba(0,0,0,0)",
             showarrow=False,
         )
-
-    for i in range(line_detail_hr_highcongest.shape[0]):
-        fig1.data[-(1 + i)].showlegend = False
-
-    if bus_detail_hr_highcongest.shape[0] != 0:
-        fig1.data[0].name = 'Buses with No Congested Lines Connected to'
-        fig1.data[1].name = 'Buses with Congested Lines Connected to'
-        fig1.data[0].showlegend = True
-        fig1.data[1].showlegend = True
-        if bus_detail_mismatch.shape[0] != 0:
-            fig1.data[2].name = 'Buses with Mismatch in Demand and Supply'
-            fig1.data[2].showlegend = True
-    else:
-        fig1.data[0].name = 'Buses'
-        fig1.data[0].showlegend = True
-        if bus_detail_mismatch.shape[0] != 0:
-            fig1.data[1].name = 'Buses with Mismatch in Demand and Supply'
-            fig1.data[1].showlegend = True
-    fig1.data[-1].showlegend = True
-    return fig1, line_detail_hr_highcongest
+    return fig, lines_hr
 
 
 def _extract_bus_line(obj):
@@ -425,76 +583,34 @@ def _extract_bus_line(obj):
     return bus_df, line_df
 
 def _resolve_case_insensitive(p: str) -> str | None:
-    path = Path(p)
-    if path.exists():
-        if LMP_DEBUG:
-            print(f"[LMP] Found path: {path}")
-        return str(path)
-    parent = path.parent
-    try:
-        target = path.name.lower()
-        for name in os.listdir(parent):
-            if name.lower() == target:
-                cand = parent / name
-                if cand.exists():
-                    if LMP_DEBUG:
-                        print(f"[LMP] Case-insensitive resolved: {cand}")
-                    return str(cand)
-    except Exception:
-        pass
-    return None
+    resolved = resolve_case_insensitive(p)
+    if resolved is not None and LMP_DEBUG:
+        print(f"[LMP] Resolved path: {resolved}")
+    return str(resolved) if resolved is not None else None
 
 
-def _load_pickle_from_bytes(byts: bytes):
-    _prepare_pandas_compat()
-    # Try bz2, then gzip, with standard pickle; fallback to dill if installed.
-    # Return None if all attempts fail.
-    try:
-        with io.BytesIO(byts) as stream:
-            with bz2.BZ2File(stream, 'r') as f:
-                return pickle.load(f)
-    except Exception as e:
-        if LMP_DEBUG:
-            print(f"[LMP] bz2 std pickle load failed: {e}")
-        pass
-    try:
-        with io.BytesIO(byts) as stream:
-            with gzip.GzipFile(fileobj=stream, mode='r') as f:
-                return pickle.load(f)
-    except Exception as e:
-        if LMP_DEBUG:
-            print(f"[LMP] gzip std pickle load failed: {e}")
-        pass
-    # dill with gzip
+def _load_pickle_from_bytes(byts: bytes, source: str | None = None):
+    """Unpickle a (compressed) LMP pickle; codec is sniffed and decoded once. None on failure."""
     try:
-        import dill as dill_pickle  # optional fallback
-        with io.BytesIO(byts) as stream:
-            with gzip.GzipFile(fileobj=stream, mode='r') as f:
-                return dill_pickle.load(f)
-    except Exception as e:
+        obj = load_pickle_bytes(byts, source=source)
         if LMP_DEBUG:
-            print(f"[LMP] gzip dill load failed: {e}")
-        pass
-    # dill with bz2
-    try:
-        import dill as dill_pickle
-        with io.BytesIO(byts) as stream:
-            with bz2.BZ2File(stream, 'r') as f:
-                return dill_pickle.load(f)
+            print(f"[LMP] Loaded {source or 'bytes'} via {codec_for(source) if source else 'sniffed codec'}")
+        return obj
     except Exception as e:
         if LMP_DEBUG:
-            print(f"[LMP] bz2 dill load failed: {e}")
+            print(f"[LMP] Pickle load failed for {source or 'bytes'}: {e}")
         return None
 
 
-def build_lmp_plot_file(file_name, bus, branch):
+def _read_lmp_pickle(file_name):
+    """Download (Dropbox) or read (local data dir) and unpickle one day; None if unavailable."""
     file_path = '/ORFEUS-Alice/data/lmps_data_visualization/t7k_v0.4.0-a2_rsvf-20/{}'.format(file_name)
     df_pickle = None
     if HAS_DROPBOX and dbx is not None:
         try:
             _, res = dbx.files_download(file_path)
             byts = res.content
-            df_pickle = _load_pickle_from_bytes(byts)
+            df_pickle = _load_pickle_from_bytes(byts, source=file_path)
             if LMP_DEBUG:
                 print(f"[LMP] Loaded from Dropbox: {file_path}: {df_pickle is not None}")
         except Exception as e:
@@ -502,8 +618,7 @@ def build_lmp_plot_file(file_name, bus, branch):
                 print(f"[LMP] Dropbox load failed for {file_path}: {e}")
             df_pickle = None
     if df_pickle is None:
-        root = str(SETTINGS.root_dir)
-        lmp_dir = os.path.join(root, 'data', 'lmps_data_visualization', 't7k_v0.4.0-a2_rsvf-20')
+        lmp_dir = os.path.join(str(SETTINGS.data_dir), 'lmps_data_visualization', 't7k_v0.4.0-a2_rsvf-20')
         local_path = os.path.join(lmp_dir, file_name)
         # Resolve case-insensitive if needed
         resolved = _resolve_case_insensitive(local_path)
@@ -515,44 +630,24 @@ def build_lmp_plot_file(file_name, bus, branch):
         if LMP_DEBUG:
             print(f"[LMP] Local path candidate: {resolved}")
         if resolved is not None and os.path.exists(resolved):
-            _prepare_pandas_compat()
-            # Prefer pandas.read_pickle with compression=infer when reading from path
             try:
-                df_pickle = pd.read_pickle(resolved, compression='infer')
+                with open(resolved, 'rb') as f:
+                    df_pickle = _load_pickle_from_bytes(f.read(), source=resolved)
+            except OSError as e:
                 if LMP_DEBUG:
-                    print(f"[LMP] Loaded via pandas.read_pickle: {resolved}")
-            except Exception:
-                # Fallback to manual gzip/bz2
-                try:
-                    with bz2.BZ2File(resolved, 'r') as f:
-                        df_pickle = pickle.load(f)
-                    if LMP_DEBUG:
-                        print(f"[LMP] Loaded via bz2 std pickle: {resolved}")
-                except Exception:
-                    try:
-                        with gzip.open(resolved, 'rb') as f:
-                            df_pickle = pickle.load(f)
-                        if LMP_DEBUG:
-                            print(f"[LMP] Loaded via gzip std pickle: {resolved}")
-                    except Exception:
-                        # Final fallback using dill if available
-                        try:
-                            import dill as dill_pickle
-                            with gzip.open(resolved, 'rb') as f:
-                                df_pickle = dill_pickle.load(f)
-                            if LMP_DEBUG:
-                                print(f"[LMP] Loaded via gzip dill: {resolved}")
-                        except Exception:
-                            try:
-                                import dill as dill_pickle
-                                with bz2.BZ2File(resolved, 'r') as f:
-                                    df_pickle = dill_pickle.load(f)
-                                if LMP_DEBUG:
-                                    print(f"[LMP] Loaded via bz2 dill: {resolved}")
-                            except Exception:
-                                if LMP_DEBUG:
-                                    print(f"[LMP] All local load attempts failed for {resolved}")
-                                df_pickle = None
+                    print(f"[LMP] Could not read {resolved}: {e}")
+                df_pickle = None
+    return df_pickle
+
+
+def build_lmp_plot_file(file_name, bus, branch):
+    # Off the request thread; concurrent requests for the same day share one download
+    try:
+        df_pickle = fetch(('lmp_pickle', file_name), lambda: _read_lmp_pickle(file_name))
+    except Exception as e:
+        if LMP_DEBUG:
+            print(f"[LMP] Fetch failed for {file_name}: {e}")
+        df_pickle = None
     if df_pickle is None:
         # minimal stub
         day = date_values_t7k[0] if len(date_values_t7k) > 0 else '2018-01-02'
@@ -600,6 +695,7 @@ def build_lmp_plot_file(file_name, bus, branch):
             line_detail['To Bus Lat'] = lat_c
             line_detail['To Bus Lng'] = lng_c
             line_detail['CongestionRatio'] = 0.0
+            bus_detail.attrs['lmp_stub'] = True
             return bus_detail, line_detail
     else:
         # Support multiple pickle schemas
@@ -611,24 +707,19 @@ def build_lmp_plot_file(file_name, bus, branch):
                                                     'From Name', 'To Name',
                                                     'Cont Rating']],
                                left_on='Line', right_on='UID')
-        line_detail['CongestionRatio'] = line_detail['Flow'].apply(
-            lambda x: abs(x)) / line_detail['Cont Rating']
+        line_detail['CongestionRatio'] = line_detail['Flow'].abs() / line_detail['Cont Rating']
 
         bus_detail = pd.merge(bus_detail, bus[
             ['Bus ID', 'lat', 'lng', 'Zone', 'Sub Name', 'Bus Name', 'Area',
              'GEN UID']],
                               left_on='Bus', right_on='Bus Name')
 
-        busid_lat = dict(zip(bus_detail['Bus ID'], bus_detail['lat']))
-        busid_lng = dict(zip(bus_detail['Bus ID'], bus_detail['lng']))
-        line_detail['To Bus Lat'] = line_detail['To Bus'].apply(
-            lambda x: busid_lat[x])
-        line_detail['To Bus Lng'] = line_detail['To Bus'].apply(
-            lambda x: busid_lng[x])
-        line_detail['From Bus Lat'] = line_detail['From Bus'].apply(
-            lambda x: busid_lat[x])
-        line_detail['From Bus Lng'] = line_detail['From Bus'].apply(
-            lambda x: busid_lng[x])
+        # Vectorized Bus ID -> coordinate lookups; buses missing from the day map to NaN
+        busid_geo = bus_detail.drop_duplicates('Bus ID', keep='last').set_index('Bus ID')
+        line_detail['To Bus Lat'] = line_detail['To Bus'].map(busid_geo['lat'])
+        line_detail['To Bus Lng'] = line_detail['To Bus'].map(busid_geo['lng'])
+        line_detail['From Bus Lat'] = line_detail['From Bus'].map(busid_geo['lat'])
+        line_detail['From Bus Lng'] = line_detail['From Bus'].map(busid_geo['lng'])
     except Exception:
         # Provide minimal geometry if merging fails
         if 'UID' not in line_detail.columns and 'Line' in line_detail.columns:
@@ -646,19 +737,315 @@ def build_lmp_plot_file(file_name, bus, branch):
             bus_detail['lat'] = lat_c
         if 'lng' not in bus_detail.columns:
             bus_detail['lng'] = lng_c
+    # Compact dtypes before the day is cached (see utils/schema.py)
+    bus_detail = compact(bus_detail, LMP_BUS_DTYPES)
+    line_detail = compact(line_detail, LMP_LINE_DTYPES)
+    if df_pickle is None:
+        bus_detail.attrs['lmp_stub'] = True
     return bus_detail, line_detail
 
+
+# Shared with the other workers when ORFEUS_CACHE_BACKEND is set (see utils/cache.py)
+_DAY_CACHE = SharedCache('lmp_day', maxsize=LMP_DAY_CACHE_SIZE)
+
+
+def load_lmp_day(date):
+    """Return (bus_detail, line_detail) for a day, loading each file once per process (or host).
+
+    Stub fallbacks are not cached, here or in the response cache, so a transient
+    load failure is retried on the next request. Callers must treat the
+    returned frames as read-only.
+    """
+    with stage('load'):
+        res = _DAY_CACHE.get_or_set(
+            date,
+            lambda: build_lmp_plot_file(file_name=date + '.p.gz', bus=bus, branch=branch),
+            should_cache=lambda res: not res[0].attrs.get('lmp_stub', False),
+        )
+    if res[0].attrs.get('lmp_stub', False):
+        response_cache.no_store()
+    return res
+
+
+def summarize_lmp_day(bus_detail, line_detail) -> dict:
+    """Caption numbers for a day: bus count, LMP range and congested lines, overall and per hour.
+
+    Per-hour values are 24-long lists (index = hour); hours without data have
+    ``None`` for min/max/mean and 0 for the counts.
+    """
+    hours = range(24)
+    out = {'n_bus': 0, 'lmp_min': None, 'lmp_max': None, 'congested': 0,
+           'hour_n_bus': [0] * 24, 'hour_min': [None] * 24, 'hour_max': [None] * 24,
+           'hour_mean': [None] * 24, 'hour_congested': [0] * 24}
+    if isinstance(bus_detail, pd.DataFrame) and not bus_detail.empty and {'LMP', 'Hour'} <= set(bus_detail.columns):
+        lmp = pd.to_numeric(bus_detail['LMP'], errors='coerce').to_numpy(dtype='float64')
+        hr = pd.to_numeric(bus_detail['Hour'], errors='coerce').to_numpy(dtype='float64')
+        ok = np.isfinite(lmp) & np.isin(hr, hours)
+        lmp, hr = lmp[ok], hr[ok].astype(np.int64)
+        if lmp.size:
+            out['lmp_min'], out['lmp_max'] = float(lmp.min()), float(lmp.max())
+            count = np.bincount(hr, minlength=24)
+            total = np.bincount(hr, weights=lmp, minlength=24)
+            lo = np.full(24, np.inf)
+            hi = np.full(24, -np.inf)
+            np.minimum.at(lo, hr, lmp)
+            np.maximum.at(hi, hr, lmp)
+            for h in hours:
+                if count[h]:
+                    out['hour_n_bus'][h] = int(count[h])
+                    out['hour_min'][h] = float(lo[h])
+                    out['hour_max'][h] = float(hi[h])
+                    out['hour_mean'][h] = float(total[h] / count[h])
+        if 'Bus ID' in bus_detail.columns:
+            out['n_bus'] = int(bus_detail['Bus ID'].nunique())
+        else:
+            out['n_bus'] = max(out['hour_n_bus'])
+    if isinstance(line_detail, pd.DataFrame) and {'CongestionRatio', 'Hour'} <= set(line_detail.columns):
+        ratio = pd.to_numeric(line_detail['CongestionRatio'], errors='coerce').to_numpy(dtype='float64')
+        hr = pd.to_numeric(line_detail['Hour'], errors='coerce').to_numpy(dtype='float64')
+        hot = (ratio >= 0.98) & np.isin(hr, hours)
+        per_hour = np.bincount(hr[hot].astype(np.int64), minlength=24)
+        out['hour_congested'] = [int(c) for c in per_hour[:24]]
+        out['congested'] = int(per_hour.sum())
+    return out
+
+
+# Tiny per-day records; shared like the days so one worker's summary serves the rest
+_SUMMARY_CACHE = SharedCache('lmp_day_summary', maxsize=4 * LMP_DAY_CACHE_SIZE)
+
+
+def lmp_day_summary(date) -> dict:
+    """``summarize_lmp_day`` for a day, computed once when the day is first captioned."""
+    def build():
+        bus_detail, line_detail = load_lmp_day(date)
+        summary = summarize_lmp_day(bus_detail, line_detail)
+        summary['stub'] = bool(bus_detail.attrs.get('lmp_stub', False))
+        return summary
+    return _SUMMARY_CACHE.get_or_set(date, build, should_cache=lambda s: not s['stub'])
+
+
+def lmp_caption(date, hr, summary: dict) -> str:
+    """Accessible caption for the hourly map, from a ``lmp_day_summary`` record."""
+    caption = f"LMP geographic distribution for hour {hr} on {date}."
+    try:
+        h = int(hr)
+    except (TypeError, ValueError):
+        h = -1
+    if 0 <= h < 24 and summary['hour_min'][h] is not None:
+        caption += (f" Buses: {summary['hour_n_bus'][h]}; LMP min {summary['hour_min'][h]:.2f}, "
+                    f"mean {summary['hour_mean'][h]:.2f}, max {summary['hour_max'][h]:.2f}.")
+    if summary['lmp_min'] is not None:
+        caption += f" Day range {summary['lmp_min']:.2f} to {summary['lmp_max']:.2f}."
+    if 0 <= h < 24:
+        caption += f" Congested lines (>=98% rating): {summary['hour_congested'][h]} this hour"
+        caption += f", {summary['congested']} line-hours over the day."
+    return caption
+
+
+def _encode_f32(values) -> str:
+    """Base64-encode a numeric array as little-endian float32 bytes."""
+    return base64.b64encode(np.ascontiguousarray(values, dtype='<f4').tobytes()).decode('ascii')
+
+
+def day_lmp_vectors(date, bus_detail):
+    """Pack a day's LMPs as fixed bus geometry plus a 24 x n_bus float32 matrix.
+
+    The geometry is sent once; the browser switches hours by slicing the matrix.
+    Hours missing for a bus are encoded as NaN.
+    """
+    df = bus_detail[['Bus ID', 'Bus Name', 'lat', 'lng', 'Hour', 'LMP']].copy()
+    df['lat'] = pd.to_numeric(df['lat'], errors='coerce')
+    df['lng'] = pd.to_numeric(df['lng'], errors='coerce')
+    df['LMP'] = pd.to_numeric(df['LMP'], errors='coerce')
+    df = df.dropna(subset=['lat', 'lng'])
+    df = df[df['lat'].between(-90, 90) & df['lng'].between(-180, 180)]
+    geo = df.drop_duplicates('Bus ID').set_index('Bus ID')[['Bus Name', 'lat', 'lng']]
+    matrix = (df.pivot_table(index='Hour', columns='Bus ID', values='LMP', aggfunc='mean')
+                .reindex(index=range(24), columns=geo.index))
+    lmp = matrix.to_numpy(dtype='float32')
+    finite = lmp[np.isfinite(lmp)]
+    return {
+        'date': date,
+        'n_bus': int(len(geo)),
+        'hours': 24,
+        'lat': _encode_f32(geo['lat'].to_numpy()),
+        'lon': _encode_f32(geo['lng'].to_numpy()),
+        'name': [str(n) for n in geo['Bus Name']],
+        'lmp': _encode_f32(lmp),
+        'cmin': float(finite.min()) if finite.size else 0.0,
+        'cmax': float(finite.max()) if finite.size else 0.0,
+        'abs_max': float(np.abs(finite).max()) if finite.size else 0.0,
+        'layout': {
+            'hovermode': 'closest',
+            'mapbox': {'accesstoken': PLOT_TOKEN, 'style': PLOT_STYLE, 'bearing': 0,
+                       'center': {'lat': 31, 'lon': -99.9018}, 'pitch': 0, 'zoom': 4.5},
+            'coloraxis': {'colorbar': {'orientation': 'h', 'title': {'text': 'LMP'}}},
+            'margin': {'l': 10, 'r': 10, 't': 40, 'b': 40},
+        },
+    }
+
+def lmp_hour_table(date, hr, max_rows: int = 50):
+    """Accessible table of the first ``max_rows`` buses for an hour, from the cached day."""
+    bus_detail, _ = load_lmp_day(date)
+    bus_detail_hr = bus_detail.loc[bus_detail['Hour'] == hr]
+    columns = [('Bus Name', 'Bus'), ('Bus ID', 'Bus ID'), ('lat', 'Lat'), ('lng', 'Lon'),
+               ('LMP', 'LMP'), ('Demand', 'Demand')]
+    columns = [(c, h) for c, h in columns if c in bus_detail_hr.columns]
+    head = widen_frame(bus_detail_hr[[c for c, _ in columns]].head(max_rows))
+    return records_to_table_html([h for _, h in columns], list(head.itertuples(index=False, name=None)))
+
+
+def _stats_map_layout() -> dict:
+    return dict(
+        hovermode='closest',
+        mapbox=dict(accesstoken=PLOT_TOKEN, style=PLOT_STYLE, bearing=0,
+                    center=go.layout.mapbox.Center(lat=31, lon=-99.9018), pitch=0, zoom=4.5),
+        margin=dict(l=10, r=10, t=40, b=40),
+        height=None, width=None,
+    )
+
+
+def plot_lmp_stats(metric, stats=None):
+    """Map of a multi-day statistic (see utils/lmp_stats.py) and its caption.
+
+    Buses are coloured by their statistic; line statistics are drawn at the
+    line midpoints. Without a statistics file an empty map explains how to
+    build one.
+    """
+    stats = stats if stats is not None else lmp_stats.load_stats()
+    label, kind = lmp_stats.METRICS.get(metric, lmp_stats.METRICS['lmp_mean'])
+    fig = go.Figure()
+    fig.update_layout(**_stats_map_layout())
+    if stats is None:
+        fig.update_layout(title='No multi-day statistics available')
+        return fig, ('Multi-day statistics have not been built. '
+                     'Run python utils/lmp_stats.py on the LMP data directory.')
+    metric = metric if metric in lmp_stats.METRICS else 'lmp_mean'
+    df = lmp_stats.metric_frame(stats, metric)
+    fmt = '.0f' if metric.endswith('_hours') else '.2f'
+    meta = stats['meta']
+    period = f"{meta.get('start')} to {meta.get('end')} ({meta.get('days')} days)"
+    fig.add_trace(go.Scattermapbox(
+        lat=df['lat'], lon=df['lng'], mode='markers', text=df['name'],
+        marker=dict(size=6 if kind == 'bus' else 5, color=df['value'], colorscale='Plasma', showscale=True,
+                    colorbar=dict(orientation='h', title=dict(text=label))),
+        hovertemplate='%{text}<br>' + label + ': %{marker.color:' + fmt + '}<extra></extra>',
+        name='Buses' if kind == 'bus' else 'Lines',
+    ))
+    fig.update_layout(title=f'{label}, {period}')
+    caption = f"{label} per {kind} over {period}."
+    if len(df):
+        top = df.iloc[-1]
+        caption += (f" {'Buses' if kind == 'bus' else 'Lines'}: {len(df)}; min {df['value'].min():{fmt}}, "
+                    f"max {df['value'].max():{fmt}} ({top['name']}).")
+    return fig, caption
+
+
+def _bus_trace_count(fig) -> int:
+    """Number of leading bus (marker) traces; congested lines follow them."""
+    n = 0
+    for tr in fig.data:
+        if getattr(tr, 'mode', None) == 'lines':
+            break
+        n += 1
+    return n
+
+
+def _trace_signature(tr) -> str:
+    """Hash of what a Patch keeps: a bus trace's points and hover labels, or a trace's style.
+
+    The line bands and the clustered view's highlight trace change their
+    points every hour, so only their style is hashed.
+    """
+    h = hashlib.md5()
+    h.update(f'{tr.mode}\x1f{tr.name}\x1f{tr.hovertemplate}'.encode('utf-8'))
+    if tr.mode == 'lines':
+        h.update(str(tr.line.width).encode('utf-8'))
+    elif tr.name != HIGHLIGHT_TRACE:
+        for arr in (tr.lat, tr.lon):
+            h.update(np.asarray(arr if arr is not None else [], dtype='float64').tobytes())
+        h.update('\x1f'.join(map(str, tr.hovertext if tr.hovertext is not None else ())).encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def _lmp_figure_state(date, search, embed, fig) -> dict:
+    """Describe the figure now on the client so the next hour can be sent as a Patch."""
+    return {
+        'key': [date, search or '', bool(embed)],
+        'n_bus': _bus_trace_count(fig),
+        'n_traces': len(fig.data),
+        'signatures': [_trace_signature(tr) for tr in fig.data],
+    }
+
+
+def _lmp_hour_patch(prev: dict, state: dict, fig):
+    """Return a dash.Patch turning the previous hour's figure into ``fig``.
+
+    ``plot_particular_hour`` draws every hour of a day (and view) with the
+    same traces over the same points, so for an unchanged trace only the
+    per-point values are sent: ``marker.color``/``marker.size``/``customdata``
+    for buses and hexagons, the segments of each congested-line band, and the
+    hour's own flagged buses on the clustered view's highlight trace.
+    Traces that differ (a pan moved the view) are replaced whole. Mapbox
+    layout, legend and colorbar are left untouched on the client. Returns
+    None when either figure is the empty map or the trace layout changed.
+    """
+    signatures = state['signatures']
+    prev_signatures = prev.get('signatures') or []
+    if state['n_bus'] == 0 or not prev.get('n_bus') or len(prev_signatures) != len(signatures):
+        return None
+    patched = dash.Patch()
+    for i, tr in enumerate(fig.data):
+        if prev_signatures[i] != signatures[i]:
+            patched['data'][i] = tr.to_plotly_json()
+        elif tr.mode == 'lines':
+            patched['data'][i]['lat'] = tr.lat
+            patched['data'][i]['lon'] = tr.lon
+            patched['data'][i]['customdata'] = tr.customdata
+        elif tr.name == HIGHLIGHT_TRACE:
+            patched['data'][i]['lat'] = tr.lat
+            patched['data'][i]['lon'] = tr.lon
+            patched['data'][i]['hovertext'] = tr.hovertext
+            patched['data'][i]['marker']['color'] = tr.marker.color
+            patched['data'][i]['customdata'] = tr.customdata
+        else:
+            patched['data'][i]['marker']['color'] = tr.marker.color
+            patched['data'][i]['marker']['size'] = tr.marker.size
+            patched['data'][i]['customdata'] = tr.customdata
+    patched['layout']['title'] = fig.layout.title.to_plotly_json()
+    patched['layout']['annotations'] = [a.to_plotly_json() for a in fig.layout.annotations]
+    return patched
+
+
 @dash.callback(
     Output('fig_lmp_geo', 'figure'),
     Output('fig_lmp_geo-caption', 'children'),
+    Output('fig_lmp_geo-state', 'data'),
+    Output('fig_lmp_geo-table', 'children'),
     Input('date_values_t7k_lmps', 'value'),
     Input('hr_values_t7k_lmps', 'value'),
     Input('url-lmps', 'search'),
-    State('embed-store', 'data'))
-def hourly_cost_dist_rts(date, hr, search, embed):
-    bus_detail, line_detail = build_lmp_plot_file(file_name=date + '.p.gz',
-                                                  bus=bus, branch=branch)
-    fig, _ = plot_particular_hour(hr, bus_detail, line_detail)
+    Input('fig_lmp_geo', 'relayoutData'),
+    Input('fig_lmp_geo-focus', 'data'),
+    State('embed-store', 'data'),
+    State('fig_lmp_geo-state', 'data'),
+    State('fig_lmp_geo-table-summary', 'n_clicks'))
+@coalesce
+def hourly_cost_dist_rts(date, hr, search, relayout=None, focus=None, embed=None, prev_state=None, table_clicks=None):
+    # Only pans and zooms change what is drawn; other relayouts (autosize, drag mode) do not
+    panned = ctx.triggered_id == 'fig_lmp_geo'
+    if panned and not any(str(k).startswith('mapbox.') for k in (relayout or {})):
+        raise dash.exceptions.PreventUpdate
+    focused = 'fig_lmp_geo-focus.data' in ctx.triggered_prop_ids
+    if focus and relayout == focus.get('relayout'):
+        view = spatial.viewport({'mapbox.center': focus['center'], 'mapbox.zoom': focus['zoom']})
+    else:
+        view = spatial.viewport(relayout)
+    bus_detail, line_detail = load_lmp_day(date)
+    with stage('figure'):
+        fig, _ = plot_particular_hour(hr, bus_detail, line_detail, view=view)
+        if focus and focus.get('kind'):
+            fig.add_trace(_focus_trace(focus))
     if embed:
         try:
             fig.update_layout(margin=dict(l=10, r=10, t=30, b=10), width=None, height=None)
@@ -677,34 +1064,264 @@ def hourly_cost_dist_rts(date, hr, search, embed):
         except Exception:
             pass
     # Build accessible caption summarizing key stats
+    # Day and per-hour numbers are precomputed once per day (lmp_day_summary)
     caption = f"LMP geographic distribution for hour {hr} on {date}."
     try:
-        if isinstance(bus_detail, pd.DataFrame) and not bus_detail.empty and 'LMP' in bus_detail.columns:
-            lmp_vals = pd.to_numeric(bus_detail['LMP'], errors='coerce').dropna().tolist()
-            if lmp_vals:
-                mn = min(lmp_vals); mx = max(lmp_vals)
-                caption += f" Buses: {len(bus_detail)}; LMP min {mn:.2f}, max {mx:.2f}."
-        if isinstance(line_detail, pd.DataFrame) and 'CongestionRatio' in line_detail.columns:
-            congested = (line_detail['CongestionRatio'] >= 0.98).sum()
-            caption += f" Congested lines (>=98% rating): {congested}."
+        caption = lmp_caption(date, hr, lmp_day_summary(date))
         if 'title' in fig.layout and fig.layout.title:
             caption += f" Title: {fig.layout.title.text}."
+        if any(tr.name == CLUSTER_TRACE for tr in fig.data):
+            caption += " At this zoom most buses are grouped into hexagons colored by mean LMP; zoom in to see each bus."
     except Exception:
         pass
-    return fig, caption
+    # Once the data table has been opened, keep it in step with the figure
+    table = dash.no_update
+    if details_requested(table_clicks):
+        try:
+            table = lmp_hour_table(date, hr)
+        except Exception:
+            table = html.Em('Unavailable')
+    state = _lmp_figure_state(date, search, embed, fig)
+    # Same day and view, new hour or pan: send only what changed, leaving the map where the user put it.
+    # A jump to an event always sends the full figure so the map moves to it.
+    if (ctx.triggered_id == 'hr_values_t7k_lmps' or panned) and not focused and prev_state \
+            and prev_state.get('key') == state['key']:
+        try:
+            with stage('transform'):
+                patched = _lmp_hour_patch(prev_state, state, fig)
+        except Exception as e:
+            if LMP_DEBUG:
+                print(f"[LMP] Patch build failed, sending full figure: {e}")
+            patched = None
+        if patched is not None:
+            return patched, caption, state, table
+    return fig, caption, state, table
 
 
+# Data table is built only when the <details> is opened
 @dash.callback(
-    Output('fig_lmp_geo-table', 'children'),
-    Input('fig_lmp_geo', 'figure')
+    Output('fig_lmp_geo-table', 'children', allow_duplicate=True),
+    Input('fig_lmp_geo-table-summary', 'n_clicks'),
+    State('date_values_t7k_lmps', 'value'),
+    State('hr_values_t7k_lmps', 'value'),
+    prevent_initial_call=True
 )
-def _update_lmp_table(fig_json):
+@coalesce
+def _update_lmp_table(n_clicks, date, hr):
+    if not details_first_opened(n_clicks) or not date or hr is None:
+        return dash.no_update
     try:
-        return figure_to_table_html(fig_json)
+        return lmp_hour_table(date, hr)
     except Exception:
         return html.Em('Unavailable')
 
 
+@dash.callback(
+    Output('lmp-day-store', 'data'),
+    Input('date_values_t7k_lmps', 'value'))
+@coalesce
+def _load_lmp_day_vectors(date):
+    if not date:
+        return None
+    bus_detail, _ = load_lmp_day(date)
+    try:
+        return day_lmp_vectors(date, bus_detail)
+    except Exception as e:
+        if LMP_DEBUG:
+            print(f"[LMP] Day vector encoding failed for {date}: {e}")
+        return None
+
+
+@dash.callback(
+    Output('fig_lmp_stats', 'figure'),
+    Output('fig_lmp_stats-caption', 'children'),
+    Input('lmp-stats-metric', 'value'))
+@coalesce
+def _update_lmp_stats(metric):
+    with stage('figure'):
+        return plot_lmp_stats(metric)
+
+
+@functools.lru_cache(maxsize=2)
+def _event_elements(index):
+    """Searchable 'Line <UID>' / 'Bus <ID>' items of an index, most events first."""
+    return PrefixIndex([f'Line {uid}' for uid, _ in index.busiest('line')] +
+                       [f'Bus {bus_id}' for bus_id, _ in index.busiest('bus')])
+
+
+def _event_kind(element):
+    kind, _, key = (element or '').partition(' ')
+    return kind.lower(), key
+
+
+@dash.callback(
+    Output('lmp-event-element', 'options'),
+    Input('lmp-event-element', 'search_value'),
+    State('lmp-event-element', 'value'))
+def _search_event_elements(search_value, value):
+    index = load_index()
+    if index is None:
+        return []
+    return dropdown_options(_event_elements(index), search_value, value)
+
+
+@dash.callback(
+    Output('lmp-event', 'options'),
+    Output('lmp-event', 'value'),
+    Output('lmp-event-summary', 'children'),
+    Input('lmp-event-element', 'value'),
+    Input('lmp-event', 'search_value'),
+    State('lmp-event', 'value'))
+def _list_events(element, search_value, value):
+    index = load_index()
+    if index is None:
+        return [], None, ('No congestion index has been built. '
+                          'Run python utils/congestion_index.py on the LMP data directory.')
+    meta = index.meta
+    if not element:
+        return [], None, (f"Search a line or bus to list its hours at or above {meta['ratio_threshold']:.0%} "
+                          f"of rating or priced outside {meta['lmp_below']:g} to {meta['lmp_above']:g}, "
+                          f"{meta['start']} to {meta['end']}.")
+    kind, key = _event_kind(element)
+    # A new element clears the event; typing only refilters (re-sending the value would jump again)
+    new_element = ctx.triggered_id == 'lmp-event-element'
+    if new_element:
+        value, search_value = None, None
+    events = index.events(kind, key, prefix=(search_value or '').strip() or None, limit=SEARCH_LIMIT)
+    if kind == 'line':
+        options = [{'label': f'{d} hr {h}: {v:.1%} of rating', 'value': f'{d}|{h}'} for d, h, v in events]
+        summary = f"{element}: {index.count(kind, key)} hours at or above {meta['ratio_threshold']:.0%} of rating"
+    else:
+        options = [{'label': f'{d} hr {h}: LMP {v:.2f}', 'value': f'{d}|{h}'} for d, h, v in events]
+        summary = (f"{element}: {index.count(kind, key)} hours priced at or above {meta['lmp_above']:g} "
+                   f"or below {meta['lmp_below']:g}")
+    summary += f", {meta['start']} to {meta['end']}. Pick one to show it on the map."
+    if value and value not in {o['value'] for o in options}:
+        d, _, h = value.partition('|')
+        options.insert(0, {'label': f'{d} hr {h}', 'value': value})
+    return options, None if new_element else dash.no_update, summary
+
+
+def _bus_location(bus_id):
+    rows = bus.loc[bus['Bus ID'] == bus_id, ['lat', 'lng']].dropna()
+    return None if rows.empty else (float(rows.iloc[0]['lat']), float(rows.iloc[0]['lng']))
+
+
+def event_focus(element) -> dict | None:
+    """Map focus for a 'Line <UID>' / 'Bus <ID>' element: its points, a center and a zoom that frames it."""
+    kind, key = _event_kind(element)
+    try:
+        if kind == 'bus':
+            points = [_bus_location(int(key))]
+        elif kind == 'line':
+            rows = branch.loc[branch['UID'].astype(str) == key, ['From Bus', 'To Bus']]
+            if rows.empty:
+                return None
+            points = [_bus_location(int(b)) for b in rows.iloc[0]]
+        else:
+            return None
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not points or any(p is None for p in points):
+        return None
+    lat = [p[0] for p in points]
+    lon = [p[1] for p in points]
+    # Zoom out far enough for a long line to span at most half the map
+    span = max(max(lon) - min(lon), (max(lat) - min(lat)) * spatial.MAP_PX[0] / spatial.MAP_PX[1], 1e-6)
+    zoom = min(FOCUS_ZOOM, float(np.log2(360.0 * spatial.MAP_PX[0] / (2 * 256.0 * span))))
+    return {'kind': kind, 'label': element, 'lat': lat, 'lon': lon,
+            'center': {'lat': (max(lat) + min(lat)) / 2, 'lon': (max(lon) + min(lon)) / 2},
+            'zoom': round(max(zoom, spatial.CLUSTER_ZOOM), 2)}
+
+
+def _focus_trace(focus: dict):
+    """Halo drawn over the jumped-to line or bus."""
+    name = f"Selected {focus['label']}"
+    if focus['kind'] == 'line':
+        return go.Scattermapbox(lat=focus['lat'], lon=focus['lon'], mode='lines', name=name,
+                                line=dict(width=10, color=FOCUS_COLOR), hoverinfo='name')
+    return go.Scattermapbox(lat=focus['lat'], lon=focus['lon'], mode='markers', name=name,
+                            marker=dict(size=24, color=FOCUS_COLOR), hoverinfo='name')
+
+
+@dash.callback(
+    Output('date_values_t7k_lmps', 'value'),
+    Output('hr_values_t7k_lmps', 'value'),
+    Output('fig_lmp_geo-focus', 'data'),
+    Input('lmp-event', 'value'),
+    State('lmp-event-element', 'value'),
+    State('fig_lmp_geo', 'relayoutData'),
+    State('fig_lmp_geo-focus', 'data'),
+    prevent_initial_call=True)
+def _jump_to_event(event, element, relayout, prev_focus):
+    if not event:
+        # Drop the highlight but keep the map where the last jump put it
+        if not prev_focus or not prev_focus.get('kind'):
+            return dash.no_update, dash.no_update, dash.no_update
+        return dash.no_update, dash.no_update, {**prev_focus, 'kind': None}
+    date, _, hour = event.partition('|')
+    focus = event_focus(element)
+    if focus is not None:
+        # The focus view holds until the map reports a different view (the user pans or zooms)
+        focus['relayout'] = relayout
+    return date, int(hour), focus
+
+
+# Hour switching and playback run in the browser (assets/lmp-day-player.js)
+dash.clientside_callback(
+    dash.ClientsideFunction(namespace='lmp', function_name='renderHour'),
+    Output('fig_lmp_day', 'figure'),
+    Output('fig_lmp_day-caption', 'children'),
+    Input('lmp-day-store', 'data'),
+    Input('lmp-day-hour', 'value'),
+)
+
+dash.clientside_callback(
+    dash.ClientsideFunction(namespace='lmp', function_name='togglePlay'),
+    Output('lmp-day-interval', 'disabled'),
+    Output('lmp-day-play', 'children'),
+    Output('lmp-day-play', 'aria-pressed'),
+    Input('lmp-day-play', 'n_clicks'),
+)
+
+dash.clientside_callback(
+    dash.ClientsideFunction(namespace='lmp', function_name='advanceHour'),
+    Output('lmp-day-hour', 'value'),
+    Input('lmp-day-interval', 'n_intervals'),
+    State('lmp-day-hour', 'value'),
+    prevent_initial_call=True,
+)
+
+dash.clientside_callback(
+    """function(val) { return (val === null || val === undefined) ? '' : 'Hour selected ' + val; }""",
+    Output('live-lmp-day-hour', 'children'),
+    Input('lmp-day-hour', 'value'),
+)
+
+
+
+def _warm_defaults():
+    """Load the default day, build its hour-15 map and read the statistics and event files (see utils/warmup.py)."""
+    if not len(date_values_t7k):
+        return
+    date = date_values_t7k[0]
+    bus_detail, line_detail = load_lmp_day(date)
+    plot_particular_hour(15, bus_detail, line_detail, view=spatial.viewport(None))
+    day_lmp_vectors(date, bus_detail)
+    lmp_day_summary(date)
+    lmp_stats.load_stats()
+    index = load_index()
+    if index is not None:
+        _event_elements(index)
+
+
+warmup.register('lmp', _warm_defaults)
+
+# Day and hour views only; the statistics map and event search read files that
+# are rebuilt in place (utils/lmp_stats.py, utils/congestion_index.py)
+response_cache.cacheable('fig_lmp_geo', 'fig_lmp_geo-caption', 'fig_lmp_geo-state', 'fig_lmp_geo-table',
+                         'lmp-day-store')
+
 @dash.callback(
     Output('lmps-overview-section', 'style'),
     Output('lmps-plot-section', 'style'),
@@ -3,7 +3,11 @@ from typing import List
 from datetime import date, timedelta, datetime
 from utils.ui import html, dcc, Input, Output, State, ctx, dash, COLORBLIND_PALETTE, PATTERN_SHAPES
 import plotly.express as px
-from utils.accessibility import figure_to_table_html
+from utils.accessibility import records_to_table_html, lazy_table_details, details_requested, details_first_opened
+from utils.metrics import stage
+from utils.singleflight import coalesce
+from utils import response_cache, warmup
+from utils.search import PrefixIndex, dropdown_options
 
 import dash
 import dash_bootstrap_components as dbc
@@ -34,10 +38,22 @@ end_date = start_date + timedelta(hours=23)
 daterange_t7k = pd.date_range(start_date, end_date, freq='h')
 
 
+def _asset_frame(allocs, asset_id):
+    """'time' plus the selected asset; lazy allocation frames load just that column."""
+    if hasattr(allocs, 'frame'):
+        return allocs.frame([asset_id] if asset_id else [])
+    return allocs
+
+
 def _safe_daily_mean(df: pd.DataFrame, daterange: pd.DatetimeIndex, expected_cols: List[str]) -> pd.Series:
     """Compute mean over daterange safely, returning zeros for missing cols."""
     try:
-        if 'time' in df.columns:
+        if hasattr(df, 'take_rows'):
+            filtered = df.take_rows(df.time.isin(daterange))
+            if not filtered.empty:
+                s = filtered.set_index('time').mean(numeric_only=True).astype(float)
+                return s.reindex(expected_cols).fillna(0.0)
+        elif 'time' in df.columns:
             mask = df['time'].isin(daterange)
             filtered = df.loc[mask]
             if not filtered.empty:
@@ -58,6 +74,10 @@ type_allocs_t7k_day = _safe_daily_mean(type_allocs_t7k, daterange_t7k, ['WIND',
 asset_cols_t7k = [c for c in asset_allocs_t7k.columns if c != 'time']
 asset_allocs_t7k_day = _safe_daily_mean(asset_allocs_t7k, daterange_t7k, asset_cols_t7k)
 
+# Searchable asset dropdowns: only the top matches for the typed text are sent
+_ASSET_INDEX_RTS = PrefixIndex(asset_cols_rts)
+_ASSET_INDEX_T7K = PrefixIndex(asset_cols_t7k)
+
 html_div_risk_allocation_overview =  html.Div(children=[
                 html.Div([
                     dcc.Markdown(children=markdown_text_riskalloc, className='markdown', id='riskalloc-markdown')
@@ -132,8 +152,9 @@ def dcc_tab_risk_allocation(label = 'RTS', yesterdate_verbal = yesterdate_verbal
                     **{'data-label': 'Select Asset Id'},
                     children=[
                         html.Label('Select Asset Id', id=f'label-{asset_ids_id}', htmlFor=asset_ids_id),
+                        # Options are filled per keystroke from the server-side index
                         dcc.Dropdown(
-                            asset_ids,
+                            [asset_ids[0]],
                             placeholder='Asset ID',
                             id=asset_ids_id,
                             value=asset_ids[0],
@@ -193,10 +214,8 @@ def dcc_tab_risk_allocation(label = 'RTS', yesterdate_verbal = yesterdate_verbal
                     ),
                     html.Figcaption(id=f"{fig_id_asset_alloc}-caption", className='vis-caption', tabIndex=0)
                 ], className='graph-figure', role='group', **{"aria-labelledby": f"{fig_id_asset_alloc}-caption"}),
-                html.Details([
-                    html.Summary("Data table (asset)", **{"aria-controls": f"{fig_id_asset_alloc}-table"}),
-                    html.Div(id=f"{fig_id_asset_alloc}-table", className='vis-table-wrapper')
-                ], open=False)
+                lazy_table_details(f"{fig_id_asset_alloc}-table", "Data table (asset)"),
+                dcc.Store(id=f"{fig_id_asset_alloc}-period", data='1day')
             ])
         ], justify='start', align='start')
 
@@ -240,10 +259,8 @@ def dcc_tab_risk_allocation(label = 'RTS', yesterdate_verbal = yesterdate_verbal
                     ),
                     html.Figcaption(id=f"{fig_id_type_alloc}-caption", className='vis-caption', tabIndex=0)
                 ], className='graph-figure', role='group', **{"aria-labelledby": f"{fig_id_type_alloc}-caption"}),
-                html.Details([
-                    html.Summary("Data table (types)", **{"aria-controls": f"{fig_id_type_alloc}-table"}),
-                    html.Div(id=f"{fig_id_type_alloc}-table", className='vis-table-wrapper')
-                ], open=False)
+                lazy_table_details(f"{fig_id_type_alloc}-table", "Data table (types)"),
+                dcc.Store(id=f"{fig_id_type_alloc}-period", data='1day')
             ])
         ], justify='start'),
 
@@ -374,6 +391,32 @@ def _riskalloc_update_tab_styles(active):
         return {'display': 'none'}, {}, 'false', 'true', -1, 0
     return {}, {'display': 'none'}, 'true', 'false', 0, -1
 
+def _risk_alloc_window(type_allocs, version='RTS', period='1day'):
+    """Rows of an allocation frame covered by a period ('1day', '1week' or 'hist')."""
+    if 'time' not in type_allocs.columns or type_allocs.empty:
+        return type_allocs.iloc[0:0]
+    if period == 'hist':
+        return type_allocs
+    startyear_ = '2020-' if version == 'RTS' else '2018-'
+    end_date = datetime.strptime(startyear_ + todaydate, "%Y-%m-%d")
+    if version == 'RTS':
+        delta = timedelta(weeks=1) if period == '1week' else timedelta(days=1)
+        daterange = pd.date_range(end_date - delta, end_date, freq='h')
+        return type_allocs[type_allocs['time'].isin(daterange)]
+    hours = 24 * 7 if period == '1week' else 24
+    return type_allocs.iloc[-hours:, ]
+
+
+def _period_from_trigger(prefix: str) -> str:
+    """Map the clicked '<prefix>-1day|1week|hist' button to a period (default '1day')."""
+    trig = ctx.triggered_id
+    if isinstance(trig, str) and trig.startswith(prefix + '-'):
+        period = trig[len(prefix) + 1:]
+        if period in ('1day', '1week', 'hist'):
+            return period
+    return '1day'
+
+
 def plot_mean_asset_type_risk_alloc(type_allocs, version='RTS', period='1day',
                                     level='asset_type', asset_id=None):
     # Empty-state helper
@@ -382,13 +425,11 @@ def plot_mean_asset_type_risk_alloc(type_allocs, version='RTS', period='1day',
         fig.update_layout(title=title, xaxis_title='Date', yaxis_title='Reliability Cost Index ($)')
         return fig
     if version == 'RTS':
-        startyear_ = '2020-'
         if level == 'asset_type':
             y_ = ['WIND', 'PV', 'RTPV']
         else:
             y_ = asset_id
     else:
-        startyear_ = '2018-'
         if level == 'asset_type':
             y_ = ['WIND', 'PV']
         else:
@@ -407,47 +448,14 @@ def plot_mean_asset_type_risk_alloc(type_allocs, version='RTS', period='1day',
     if missing:
         return _empty_fig(f"Missing columns: {', '.join(missing)}")
 
-    if period == 'hist':
-        if 'time' not in type_allocs.columns or type_allocs.empty:
-            return _empty_fig()
-        fig_type_allocs = px.line(type_allocs, x='time', y=y_,
-                                  hover_data={"time": "|%H, %b %d"})
-        fig_type_allocs.update_xaxes(tickformat='%H \n %b %d, %Y',
-                                     title_font_size=25)
-
-    else:
-        end_date = datetime.strptime(startyear_ + todaydate, "%Y-%m-%d")
-        if period == '1day':
-            if 'time' not in type_allocs.columns or type_allocs.empty:
-                return _empty_fig()
-            if version == 'RTS':
-                delta = timedelta(days=1)
-                daterange = pd.date_range(end_date - delta, end_date, freq='h')
-                type_allocs_day = type_allocs[type_allocs['time'].isin(daterange)]
-            else:
-                type_allocs_day = type_allocs.iloc[-24:, ]
-            if type_allocs_day.empty:
-                return _empty_fig()
-            fig_type_allocs = px.line(type_allocs_day, x='time', y=y_,
-                                      hover_data={"time": "|%H, %b %d"})
-            fig_type_allocs.update_xaxes(tickformat='%H \n %b %d',
-                                         title_font_size=25)
-
-        elif period == '1week':
-            if 'time' not in type_allocs.columns or type_allocs.empty:
-                return _empty_fig()
-            if version == 'RTS':
-                delta = timedelta(weeks=1)
-                daterange = pd.date_range(end_date - delta, end_date, freq='h')
-                type_allocs_day = type_allocs[type_allocs['time'].isin(daterange)]
-            else:
-                type_allocs_day = type_allocs.iloc[-24*7:, ]
-            if type_allocs_day.empty:
-                return _empty_fig()
-            fig_type_allocs = px.line(type_allocs_day, x='time', y=y_,
-                                      hover_data={"time": "|%H, %b %d"})
-            fig_type_allocs.update_xaxes(tickformat='%H \n %b %d',
-                                         title_font_size=25)
+    with stage('transform'):
+        type_allocs_day = _risk_alloc_window(type_allocs, version=version, period=period)
+    if type_allocs_day.empty:
+        return _empty_fig()
+    fig_type_allocs = px.line(type_allocs_day, x='time', y=y_,
+                              hover_data={"time": "|%H, %b %d"})
+    fig_type_allocs.update_xaxes(tickformat='%H \n %b %d, %Y' if period == 'hist' else '%H \n %b %d',
+                                 title_font_size=25)
 
     # Label traces defensively
     if len(fig_type_allocs.data) >= 1:
@@ -488,27 +496,48 @@ def plot_mean_asset_type_risk_alloc(type_allocs, version='RTS', period='1day',
     return fig_type_allocs
 
 
+TYPE_LABELS = {'WIND': 'Wind', 'PV': 'Solar', 'RTPV': 'Rooftop Solar'}
+
+
+def risk_alloc_table(allocs, version, period, columns, max_rows: int = 50):
+    """Accessible table for the rows a period shows, sliced from the in-memory allocation frame."""
+    window = _risk_alloc_window(allocs, version=version, period=period)
+    cols = [c for c in columns if c in window.columns]
+    if not cols:
+        return html.Em('No data')
+    head = window[['time'] + cols].head(max_rows)
+    rows = [[ts.strftime('%Y-%m-%d %H:%M') if hasattr(ts, 'strftime') else ts, *vals]
+            for ts, *vals in head.itertuples(index=False, name=None)]
+    return records_to_table_html(['Time'] + [TYPE_LABELS.get(c, str(c)) for c in cols], rows)
+
+
+def _table_if_open(n_clicks, allocs, version, period, columns, first_open=False):
+    # Main callbacks refresh an already opened table; the toggle callbacks only fill it the first time
+    if not (details_first_opened(n_clicks) if first_open else details_requested(n_clicks)):
+        return dash.no_update
+    try:
+        return risk_alloc_table(allocs, version, period or '1day', columns)
+    except Exception:
+        return html.Em('Unavailable')
+
+
 @dash.callback(
     Output("fig_mean_asset_type_risk_alloc_rts", "figure"),
     Output("fig_mean_asset_type_risk_alloc_rts-caption", "children"),
+    Output("fig_mean_asset_type_risk_alloc_rts-period", "data"),
+    Output("fig_mean_asset_type_risk_alloc_rts-table", "children"),
     Input('rts-type-allocs-1day', 'n_clicks'),
     Input('rts-type-allocs-1week', 'n_clicks'),
     Input('rts-type-allocs-hist', 'n_clicks'),
-    State('embed-store', 'data')
+    State('embed-store', 'data'),
+    State('fig_mean_asset_type_risk_alloc_rts-table-summary', 'n_clicks')
 )
-def plot_mean_asset_type_risk_alloc_daterange_rts(btn1, btn2, btn3, embed):
-    if "rts-type-allocs-1day" == ctx.triggered_id:
-        fig = plot_mean_asset_type_risk_alloc(type_allocs_rts, version='RTS',
-                                              period='1day')
-    elif "rts-type-allocs-1week" == ctx.triggered_id:
-        fig = plot_mean_asset_type_risk_alloc(type_allocs_rts, version='RTS',
-                                              period='1week')
-    elif "rts-type-allocs-hist" == ctx.triggered_id:
-        fig = plot_mean_asset_type_risk_alloc(type_allocs_rts, version='RTS',
-                                              period='hist')
-    else:
+@coalesce
+def plot_mean_asset_type_risk_alloc_daterange_rts(btn1, btn2, btn3, embed, table_clicks=None):
+    period = _period_from_trigger('rts-type-allocs')
+    with stage('figure'):
         fig = plot_mean_asset_type_risk_alloc(type_allocs_rts, version='RTS',
-                                              period='1day')
+                                              period=period)
     try:
         if embed:
             fig.update_layout(margin=dict(l=10, r=10, t=30, b=10), width=None, height=None)
@@ -527,56 +556,44 @@ def plot_mean_asset_type_risk_alloc_daterange_rts(btn1, btn2, btn3, embed):
     except Exception:
         pass
     caption = " | ".join(cap) if cap else "Reliability Cost Index time series chart"
-    return fig, caption
+    table = _table_if_open(table_clicks, type_allocs_rts, 'RTS', period, ['WIND', 'PV', 'RTPV'])
+    return fig, caption, period, table
 
 
+# Data tables are built only when their <details> is opened
 @dash.callback(
-    Output('fig_mean_asset_type_risk_alloc_rts-table', 'children'),
-    Input('fig_mean_asset_type_risk_alloc_rts', 'figure')
+    Output('fig_mean_asset_type_risk_alloc_rts-table', 'children', allow_duplicate=True),
+    Input('fig_mean_asset_type_risk_alloc_rts-table-summary', 'n_clicks'),
+    State('fig_mean_asset_type_risk_alloc_rts-period', 'data'),
+    prevent_initial_call=True
 )
-def _update_rts_type_table(fig_json):
-    try:
-        return figure_to_table_html(fig_json)
-    except Exception:
-        return html.Em('Unavailable')
+def _update_rts_type_table(n_clicks, period):
+    return _table_if_open(n_clicks, type_allocs_rts, 'RTS', period, ['WIND', 'PV', 'RTPV'], first_open=True)
 
 
 @dash.callback(
     Output('fig_asset_risk_alloc_rts', 'figure'),
     Output('fig_asset_risk_alloc_rts-caption', 'children'),
+    Output('fig_asset_risk_alloc_rts-period', 'data'),
+    Output('fig_asset_risk_alloc_rts-table', 'children'),
     Input('asset_ids_risk_alloc_rts', 'value'),
     Input('rts-asset-allocs-1day', 'n_clicks'),
     Input('rts-asset-allocs-1week', 'n_clicks'),
     Input('rts-asset-allocs-hist', 'n_clicks'),
-    State('embed-store', 'data')
+    State('embed-store', 'data'),
+    State('fig_asset_risk_alloc_rts-table-summary', 'n_clicks')
 )
-def asset_ids_risk_alloc_rts(asset_id, button1, button2, button3, embed):
-    if asset_id is None:
-        return plot_mean_asset_type_risk_alloc(asset_allocs_rts, version='RTS', period='1day', level='asset_id', asset_id=None)
-    if "rts-asset-allocs-1day" == ctx.triggered_id:
-        fig_asset_allocs = plot_mean_asset_type_risk_alloc(asset_allocs_rts,
-                                                           version='RTS',
-                                                           period='1day',
-                                                           level='asset_id',
-                                                           asset_id=asset_id)
-    elif "rts-asset-allocs-1week" == ctx.triggered_id:
-        fig_asset_allocs = plot_mean_asset_type_risk_alloc(asset_allocs_rts,
-                                                           version='RTS',
-                                                           period='1week',
-                                                           level='asset_id',
-                                                           asset_id=asset_id)
-    elif "rts-asset-allocs-hist" == ctx.triggered_id:
-        fig_asset_allocs = plot_mean_asset_type_risk_alloc(asset_allocs_rts,
+@coalesce
+def asset_ids_risk_alloc_rts(asset_id, button1, button2, button3, embed, table_clicks=None):
+    period = _period_from_trigger('rts-asset-allocs')
+    with stage('figure'):
+        fig_asset_allocs = plot_mean_asset_type_risk_alloc(_asset_frame(asset_allocs_rts, asset_id),
                                                            version='RTS',
-                                                           period='hist',
-                                                           level='asset_id',
-                                                           asset_id=asset_id)
-    else:
-        fig_asset_allocs = plot_mean_asset_type_risk_alloc(asset_allocs_rts,
-                                                           version='RTS',
-                                                           period='1day',
+                                                           period=period,
                                                            level='asset_id',
                                                            asset_id=asset_id)
+    if asset_id is None:
+        return fig_asset_allocs, "Select an asset to view the time series", period, dash.no_update
     try:
         if embed:
             fig_asset_allocs.update_layout(margin=dict(l=10, r=10, t=30, b=10), width=None, height=None)
@@ -591,17 +608,18 @@ def asset_ids_risk_alloc_rts(asset_id, button1, button2, button3, embed):
                 caption += f"; min {min(yvals):.2f}, max {max(yvals):.2f}, mean {sum(yvals)/len(yvals):.2f}"
     except Exception:
         pass
-    return fig_asset_allocs, caption
+    table = _table_if_open(table_clicks, _asset_frame(asset_allocs_rts, asset_id), 'RTS', period, [asset_id])
+    return fig_asset_allocs, caption, period, table
 
 @dash.callback(
-    Output('fig_asset_risk_alloc_rts-table', 'children'),
-    Input('fig_asset_risk_alloc_rts', 'figure')
+    Output('fig_asset_risk_alloc_rts-table', 'children', allow_duplicate=True),
+    Input('fig_asset_risk_alloc_rts-table-summary', 'n_clicks'),
+    State('fig_asset_risk_alloc_rts-period', 'data'),
+    State('asset_ids_risk_alloc_rts', 'value'),
+    prevent_initial_call=True
 )
-def _update_rts_asset_table(fig_json):
-    try:
-        return figure_to_table_html(fig_json)
-    except Exception:
-        return html.Em('Unavailable')
+def _update_rts_asset_table(n_clicks, period, asset_id):
+    return _table_if_open(n_clicks, _asset_frame(asset_allocs_rts, asset_id), 'RTS', period, [asset_id], first_open=True)
 
 
 @dash.callback(
@@ -617,29 +635,58 @@ def find_daily_index_asset_id_rts(asset_id):
 def find_daily_index_asset_id(asset_id):
     return f'{asset_id}'
 
+@dash.callback(
+    Output('asset_ids_risk_alloc_rts', 'options'),
+    Input('asset_ids_risk_alloc_rts', 'search_value'),
+    State('asset_ids_risk_alloc_rts', 'value'))
+def search_asset_ids_rts(search_value, value):
+    return dropdown_options(_ASSET_INDEX_RTS, search_value, value)
+
+@dash.callback(
+    Output('asset_ids_risk_alloc_t7k', 'options'),
+    Input('asset_ids_risk_alloc_t7k', 'search_value'),
+    State('asset_ids_risk_alloc_t7k', 'value'))
+def search_asset_ids_t7k(search_value, value):
+    return dropdown_options(_ASSET_INDEX_T7K, search_value, value)
+
+
+def _warm_defaults():
+    """Build the 1-day type and first-asset figures for both systems (see utils/warmup.py)."""
+    for version, type_allocs, asset_allocs, assets in (('RTS', type_allocs_rts, asset_allocs_rts, asset_cols_rts),
+                                                       ('T7K', type_allocs_t7k, asset_allocs_t7k, asset_cols_t7k)):
+        plot_mean_asset_type_risk_alloc(type_allocs, version=version, period='1day')
+        if assets:
+            plot_mean_asset_type_risk_alloc(_asset_frame(asset_allocs, assets[0]), version=version,
+                                            period='1day', level='asset_id', asset_id=assets[0])
+
+
+warmup.register('risk_allocation', _warm_defaults)
+
+# The allocations are loaded once at import, so these responses never go stale
+response_cache.cacheable(*(f'{fig}_{version}{suffix}'
+                           for fig in ('fig_mean_asset_type_risk_alloc', 'fig_asset_risk_alloc')
+                           for version in ('rts', 't7k')
+                           for suffix in ('', '-caption', '-period', '-table')))
+
 
 
 @dash.callback(
     Output("fig_mean_asset_type_risk_alloc_t7k", "figure"),
     Output("fig_mean_asset_type_risk_alloc_t7k-caption", "children"),
+    Output("fig_mean_asset_type_risk_alloc_t7k-period", "data"),
+    Output("fig_mean_asset_type_risk_alloc_t7k-table", "children"),
     Input('t7k-type-allocs-1day', 'n_clicks'),
     Input('t7k-type-allocs-1week', 'n_clicks'),
     Input('t7k-type-allocs-hist', 'n_clicks'),
-    State('embed-store', 'data')
+    State('embed-store', 'data'),
+    State('fig_mean_asset_type_risk_alloc_t7k-table-summary', 'n_clicks')
 )
-def plot_mean_asset_type_risk_alloc_daterange_t7k(btn1, btn2, btn3, embed):
-    if "t7k-type-allocs-1day" == ctx.triggered_id:
+@coalesce
+def plot_mean_asset_type_risk_alloc_daterange_t7k(btn1, btn2, btn3, embed, table_clicks=None):
+    period = _period_from_trigger('t7k-type-allocs')
+    with stage('figure'):
         fig = plot_mean_asset_type_risk_alloc(type_allocs_t7k, version='T7K',
-                                              period='1day')
-    elif "t7k-type-allocs-1week" == ctx.triggered_id:
-        fig = plot_mean_asset_type_risk_alloc(type_allocs_t7k, version='T7K',
-                                              period='1week')
-    elif "t7k-type-allocs-hist" == ctx.triggered_id:
-        fig = plot_mean_asset_type_risk_alloc(type_allocs_t7k, version='T7K',
-                                              period='hist')
-    else:
-        fig = plot_mean_asset_type_risk_alloc(type_allocs_t7k, version='T7K',
-                                              period='1day')
+                                              period=period)
     try:
         if embed:
             fig.update_layout(margin=dict(l=10, r=10, t=30, b=10), width=None, height=None)
@@ -656,54 +703,41 @@ def plot_mean_asset_type_risk_alloc_daterange_t7k(btn1, btn2, btn3, embed):
     except Exception:
         pass
     caption = " | ".join(cap) if cap else "Reliability Cost Index time series chart"
-    return fig, caption
+    table = _table_if_open(table_clicks, type_allocs_t7k, 'T7K', period, ['WIND', 'PV'])
+    return fig, caption, period, table
 
 @dash.callback(
-    Output('fig_mean_asset_type_risk_alloc_t7k-table', 'children'),
-    Input('fig_mean_asset_type_risk_alloc_t7k', 'figure')
+    Output('fig_mean_asset_type_risk_alloc_t7k-table', 'children', allow_duplicate=True),
+    Input('fig_mean_asset_type_risk_alloc_t7k-table-summary', 'n_clicks'),
+    State('fig_mean_asset_type_risk_alloc_t7k-period', 'data'),
+    prevent_initial_call=True
 )
-def _update_t7k_type_table(fig_json):
-    try:
-        return figure_to_table_html(fig_json)
-    except Exception:
-        return html.Em('Unavailable')
+def _update_t7k_type_table(n_clicks, period):
+    return _table_if_open(n_clicks, type_allocs_t7k, 'T7K', period, ['WIND', 'PV'], first_open=True)
 
 @dash.callback(
     Output('fig_asset_risk_alloc_t7k', 'figure'),
     Output('fig_asset_risk_alloc_t7k-caption', 'children'),
+    Output('fig_asset_risk_alloc_t7k-period', 'data'),
+    Output('fig_asset_risk_alloc_t7k-table', 'children'),
     Input('asset_ids_risk_alloc_t7k', 'value'),
     Input('t7k-asset-allocs-1day', 'n_clicks'),
     Input('t7k-asset-allocs-1week', 'n_clicks'),
     Input('t7k-asset-allocs-hist', 'n_clicks'),
-    State('embed-store', 'data')
+    State('embed-store', 'data'),
+    State('fig_asset_risk_alloc_t7k-table-summary', 'n_clicks')
 )
-def asset_ids_risk_alloc_t7k(asset_id, button1, button2, button3, embed):
-    if asset_id is None:
-        return plot_mean_asset_type_risk_alloc(asset_allocs_t7k, version='T7K', period='1day', level='asset_id', asset_id=None)
-    if "t7k-asset-allocs-1day" == ctx.triggered_id:
-        fig_asset_allocs = plot_mean_asset_type_risk_alloc(asset_allocs_t7k,
-                                                           version='T7K',
-                                                           period='1day',
-                                                           level='asset_id',
-                                                           asset_id=asset_id)
-    elif "t7k-asset-allocs-1week" == ctx.triggered_id:
-        fig_asset_allocs = plot_mean_asset_type_risk_alloc(asset_allocs_t7k,
-                                                           version='T7K',
-                                                           period='1week',
-                                                           level='asset_id',
-                                                           asset_id=asset_id)
-    elif "t7k-asset-allocs-hist" == ctx.triggered_id:
-        fig_asset_allocs = plot_mean_asset_type_risk_alloc(asset_allocs_t7k,
+@coalesce
+def asset_ids_risk_alloc_t7k(asset_id, button1, button2, button3, embed, table_clicks=None):
+    period = _period_from_trigger('t7k-asset-allocs')
+    with stage('figure'):
+        fig_asset_allocs = plot_mean_asset_type_risk_alloc(_asset_frame(asset_allocs_t7k, asset_id),
                                                            version='T7K',
-                                                           period='hist',
-                                                           level='asset_id',
-                                                           asset_id=asset_id)
-    else:
-        fig_asset_allocs = plot_mean_asset_type_risk_alloc(asset_allocs_t7k,
-                                                           version='T7K',
-                                                           period='1day',
+                                                           period=period,
                                                            level='asset_id',
                                                            asset_id=asset_id)
+    if asset_id is None:
+        return fig_asset_allocs, "Select an asset to view the time series", period, dash.no_update
     try:
         if embed:
             fig_asset_allocs.update_layout(margin=dict(l=10, r=10, t=30, b=10), width=None, height=None)
@@ -717,17 +751,18 @@ def asset_ids_risk_alloc_t7k(asset_id, button1, button2, button3, embed):
                 caption += f"; min {min(yvals):.2f}, max {max(yvals):.2f}, mean {sum(yvals)/len(yvals):.2f}"
     except Exception:
         pass
-    return fig_asset_allocs, caption
+    table = _table_if_open(table_clicks, _asset_frame(asset_allocs_t7k, asset_id), 'T7K', period, [asset_id])
+    return fig_asset_allocs, caption, period, table
 
 @dash.callback(
-    Output('fig_asset_risk_alloc_t7k-table', 'children'),
-    Input('fig_asset_risk_alloc_t7k', 'figure')
+    Output('fig_asset_risk_alloc_t7k-table', 'children', allow_duplicate=True),
+    Input('fig_asset_risk_alloc_t7k-table-summary', 'n_clicks'),
+    State('fig_asset_risk_alloc_t7k-period', 'data'),
+    State('asset_ids_risk_alloc_t7k', 'value'),
+    prevent_initial_call=True
 )
-def _update_t7k_asset_table(fig_json):
-    try:
-        return figure_to_table_html(fig_json)
-    except Exception:
-        return html.Em('Unavailable')
+def _update_t7k_asset_table(n_clicks, period, asset_id):
+    return _table_if_open(n_clicks, _asset_frame(asset_allocs_t7k, asset_id), 'T7K', period, [asset_id], first_open=True)
 
 
 @dash.callback(
@@ -10,11 +10,18 @@ try:
     from utils.ui import ctx as _dash_ctx  # noqa: F401
 except Exception:
     _dash_ctx = None
-from utils.accessibility import figure_to_table_html
+from utils.accessibility import figure_to_table_html, records_to_table_html, lazy_table_details, details_requested, details_first_opened
+from utils.cache import SharedCache
+from utils.fetch import fetch
+from utils.layout_cache import lazy_dropdown
+from utils.metrics import stage
+from utils.singleflight import coalesce
+from utils import response_cache, warmup
+from utils.search import PrefixIndex, dropdown_options
 import plotly.express as px
 import plotly.graph_objects as go
 
-from inputs.inputs import date_values_rts, date_values_t7k, energy_types, energy_types_asset_ids_rts_csv, energy_types_asset_ids_t7k_csv, ROOT_DIR, dbx, HAS_DROPBOX
+from inputs.inputs import date_values_rts, date_values_t7k, energy_types, energy_types_asset_ids_rts_csv, energy_types_asset_ids_t7k_csv, DATA_DIR, dbx, HAS_DROPBOX
 from utils.config import SETTINGS
 from utils.md import load_markdown, extract_first_h1
 markdown_text_scenario = load_markdown('markdown', 'scenarios.md')
@@ -23,6 +30,11 @@ dash.register_page(__name__, path='/scenariovisualize', name='Scenarios', order=
 
 # Optional local PGScen scenarios directory (from another repo)
 PGSCEN_DIR = str(SETTINGS.pgscen_dir)
+try:
+    SCENARIO_CACHE_SIZE = int(os.getenv('SCENARIO_CACHE_SIZE', '32'))
+except Exception:
+    SCENARIO_CACHE_SIZE = 32
+_SCENARIO_CACHE = SharedCache('scenario_frame', maxsize=SCENARIO_CACHE_SIZE)
 
 def _try_build_fig_from_pgscen(version: str, day: str, energy_type: str):
     """Try to build a scenarios figure from local PGScen CSV.GZ files.
@@ -122,7 +134,7 @@ def dcc_tab_scenariovisualize(label= 'RTS',
                     dbc.Col([
                         html.Label([
                             'Select Day',
-                            dcc.Dropdown(
+                            lazy_dropdown(
                                 date_values,
                                 id=date_values_id,
                                 value=date_values[0],
@@ -165,10 +177,7 @@ def dcc_tab_scenariovisualize(label= 'RTS',
                             config={"responsive": True}),
                         html.Figcaption(id=f"{scenario_plot_id}-caption", className='vis-caption', tabIndex=0)
                     ], className='graph-figure', role='group', **{"aria-labelledby": f"{scenario_plot_id}-caption"}),
-                    html.Details([
-                        html.Summary("Data table", **{"aria-controls": f"{scenario_plot_id}-table"}),
-                        html.Div(id=f"{scenario_plot_id}-table", className='vis-table-wrapper')
-                    ], open=False)
+                    lazy_table_details(f"{scenario_plot_id}-table")
                 ]))
             ]
     return html.Div(tab_children)
@@ -283,8 +292,8 @@ def _announce_asset_t7k(val):
     return f"Asset ID selected {val}"
 
 
-def build_timeseries(version, day, asset_type, asset_id):
-    day = day.replace('-', '')
+def _read_scenario_frame(version, day, asset_type, asset_id):
+    """Read a per-asset scenarios CSV (Dropbox, then local variants); None if not found."""
     file_path = '/ORFEUS-Alice/data/scenarios_data/{}-scens-csv/{}/{}/{}.csv'.format(
         version, day, asset_type, asset_id)
     df = None
@@ -327,12 +336,12 @@ def build_timeseries(version, day, asset_type, asset_id):
         found = False
         for aid in asset_variants:
             candidates = [
-                f"data/scenarios_data/{version}-scens-csv/{day}/{asset_type}/{aid}.csv",
-                f"data/scenarios_data/{version}-scens-csv/notuning/{day}/{asset_type}/{aid}.csv",
-                f"data/scenarios_data/{version}-scens-csv/tuning/{day}/{asset_type}/{aid}.csv",
+                f"scenarios_data/{version}-scens-csv/{day}/{asset_type}/{aid}.csv",
+                f"scenarios_data/{version}-scens-csv/notuning/{day}/{asset_type}/{aid}.csv",
+                f"scenarios_data/{version}-scens-csv/tuning/{day}/{asset_type}/{aid}.csv",
             ]
             for rel in candidates:
-                local_path = os.path.join(ROOT_DIR, rel)
+                local_path = os.path.join(DATA_DIR, rel)
                 if os.path.exists(local_path):
                     try:
                         df = pd.read_csv(local_path, index_col=0).reset_index()
@@ -342,21 +351,53 @@ def build_timeseries(version, day, asset_type, asset_id):
                         df = None
             if found:
                 break
-        if df is None:
-            # Try PGScen directory (expects YYYY-MM-DD)
-            day_iso = f"{day[:4]}-{day[4:6]}-{day[6:8]}"
-            fig_pg = _try_build_fig_from_pgscen(version, day_iso, asset_type)
-            if fig_pg is not None:
-                return fig_pg
-            # No data available: return an annotated empty figure
-            msg = f"No data found for {asset_type}:{asset_id} on {day_iso}"
-            fig = go.Figure()
-            fig.add_annotation(text=msg, xref="paper", yref="paper",
-                               x=0.5, y=0.5, showarrow=False,
-                               font=dict(size=18))
-            fig.update_layout(title=f"{asset_id} — {day_iso}")
-            return fig
+    return df
+
+
+def _fetch_scenario_frame(version, day, asset_type, asset_id):
+    # Read on the I/O pool; concurrent requests for the same asset-day share one download
+    try:
+        return fetch(('scenario_frame', version, day, asset_type, str(asset_id)),
+                     lambda: _read_scenario_frame(version, day, asset_type, asset_id))
+    except Exception:
+        return None
+
+
+def load_scenario_frame(version, day, asset_type, asset_id):
+    """Return the scenarios frame for an asset-day (``day`` as YYYYMMDD), read once per process.
 
+    Misses are not cached so newly added files are picked up, and the
+    responses built from them are kept out of the response cache. Callers must
+    not mutate the frame.
+    """
+    with stage('load'):
+        df = _SCENARIO_CACHE.get_or_set(
+            (version, day, asset_type, str(asset_id)),
+            lambda: _fetch_scenario_frame(version, day, asset_type, asset_id),
+            should_cache=lambda df: df is not None)
+    if df is None:
+        response_cache.no_store()
+    return df
+
+
+def _missing_scenario_figure(version, day, asset_type, asset_id):
+    # Try PGScen directory (expects YYYY-MM-DD)
+    day_iso = f"{day[:4]}-{day[4:6]}-{day[6:8]}"
+    fig_pg = _try_build_fig_from_pgscen(version, day_iso, asset_type)
+    if fig_pg is not None:
+        return fig_pg
+    # No data available: return an annotated empty figure
+    msg = f"No data found for {asset_type}:{asset_id} on {day_iso}"
+    fig = go.Figure()
+    fig.add_annotation(text=msg, xref="paper", yref="paper",
+                       x=0.5, y=0.5, showarrow=False,
+                       font=dict(size=18))
+    fig.update_layout(title=f"{asset_id} — {day_iso}")
+    return fig
+
+
+def _scenario_summary(df, day):
+    """Return (hourly timeline, summary frame) for a scenarios frame on ``day`` (YYYYMMDD)."""
     # build the list of date values
     # start from 00:00 to 23:00 on the day in local time
     start_date = datetime.strptime(
@@ -365,6 +406,30 @@ def build_timeseries(version, day, asset_type, asset_id):
     end_date = start_date + timedelta(hours=23)
     date_values_7k = pd.date_range(start=start_date, end=end_date, freq='h')
 
+    scen_summary = df.iloc[2:, 2:].describe()
+    df_summary = pd.DataFrame({'date': date_values_7k,
+                               'actual': df.loc[df['Type'] == 'Actual'].iloc[:,
+                                         2:].values.flatten(),
+                               'forecast': df.loc[
+                                               df['Type'] == 'Forecast'].iloc[
+                                           :, 2:].values.flatten(),
+                               'scen_avg': scen_summary.loc['mean', :].values,
+                               '5%': df.iloc[2:, 2:].quantile(0.05).values,
+                               '95%': df.iloc[2:, 2:].quantile(0.95).values,
+                               '25%': scen_summary.loc['25%', :].values,
+                               '75%': scen_summary.loc['75%', :].values,
+                               'max': scen_summary.loc['max', :].values,
+                               'min': scen_summary.loc['min', :].values})
+    return date_values_7k, df_summary
+
+
+def build_timeseries(version, day, asset_type, asset_id):
+    day = day.replace('-', '')
+    df = load_scenario_frame(version, day, asset_type, asset_id)
+    if df is None:
+        return _missing_scenario_figure(version, day, asset_type, asset_id)
+    with stage('transform'):
+        date_values_7k, df_summary = _scenario_summary(df, day)
     # find 5 percentile extreme scenarios
     df_5per = pd.DataFrame()
     df_95per = pd.DataFrame()
@@ -384,21 +449,6 @@ def build_timeseries(version, day, asset_type, asset_id):
     df_95per.name = 'date'
     df_95per.columns = np.arange(1, num_largest + 1)
 
-    scen_summary = df.iloc[2:, 2:].describe()
-    df_summary = pd.DataFrame({'date': date_values_7k,
-                               'actual': df.loc[df['Type'] == 'Actual'].iloc[:,
-                                         2:].values.flatten(),
-                               'forecast': df.loc[
-                                               df['Type'] == 'Forecast'].iloc[
-                                           :, 2:].values.flatten(),
-                               'scen_avg': scen_summary.loc['mean', :].values,
-                               '5%': df.iloc[2:, 2:].quantile(0.05).values,
-                               '95%': df.iloc[2:, 2:].quantile(0.95).values,
-                               '25%': scen_summary.loc['25%', :].values,
-                               '75%': scen_summary.loc['75%', :].values,
-                               'max': scen_summary.loc['max', :].values,
-                               'min': scen_summary.loc['min', :].values})
-
     # summary plot
     fig_summary = px.line(df_summary, x='date',
                           y=['scen_avg', 'actual', 'forecast'])
@@ -456,6 +506,36 @@ def build_timeseries(version, day, asset_type, asset_id):
 
     return fig
 
+def scenario_table(version, day, asset_type, asset_id, fig=None, max_rows: int = 50):
+    """Accessible hourly summary table for an asset-day, from the cached scenarios frame.
+
+    Without a frame, the figure the plot callback just built (``fig``) is
+    tabulated; the toggle callbacks pass none, so the fallback is rebuilt here
+    rather than uploading the figure from the browser.
+    """
+    day = (day or '').replace('-', '')
+    df = load_scenario_frame(version, day, asset_type, asset_id)
+    if df is None:
+        if fig is None:
+            fig = _missing_scenario_figure(version, day, asset_type, asset_id)
+        return figure_to_table_html(fig, max_rows=max_rows)
+    _, df_summary = _scenario_summary(df, day)
+    cols = ['date', 'actual', 'forecast', 'scen_avg', '5%', '95%']
+    head = df_summary[cols].head(max_rows)
+    rows = [[ts.strftime('%Y-%m-%d %H:%M'), *vals] for ts, *vals in head.itertuples(index=False, name=None)]
+    return records_to_table_html(['Time', 'Actual', 'Forecast', 'Scen Avg', '5%', '95%'], rows)
+
+
+def _table_if_open(n_clicks, version, day, asset_type, asset_id, fig=None, first_open=False):
+    # Main callbacks refresh an already opened table; the toggle callbacks only fill it the first time
+    if not (details_first_opened(n_clicks) if first_open else details_requested(n_clicks)):
+        return dash.no_update
+    try:
+        return scenario_table(version, day, asset_type, asset_id, fig=fig)
+    except Exception:
+        return html.Em('Unavailable')
+
+
 # --- Accessible tab interaction callbacks (Scenarios) ---
 @dash.callback(
     Output('scenarios-active-tab', 'data'),
@@ -488,59 +568,94 @@ def _scenarios_update_tab_styles(active):
     return {}, {'display': 'none'}, 'true', 'false', 0, -1
 
 
+# Asset dropdowns are server-paged: each keystroke returns the top matches from a prefix index
+_ASSET_INDEX = {
+    'rts': {t: PrefixIndex(ids) for t, ids in energy_types_asset_ids_rts_csv.items()},
+    't7k': {t: PrefixIndex(ids) for t, ids in energy_types_asset_ids_t7k_csv.items()},
+}
+
+
+def _asset_options(version, energy_type, search_value, value):
+    index = _ASSET_INDEX[version].get(energy_type)
+    if index is None:
+        return []
+    trig = getattr(_dash_ctx, 'triggered_id', None)
+    if trig == f'energy_types_{version}':
+        # New asset type: the previous selection does not belong to it
+        value = _default_asset(version, energy_type)
+    return dropdown_options(index, search_value, value)
+
+
+def _default_asset(version, energy_type):
+    index = _ASSET_INDEX[version].get(energy_type)
+    ids = index.items if index is not None else []
+    # T7K prefers a middle option if available; RTS the first
+    if version == 't7k' and len(ids) > 2:
+        return ids[2]
+    return ids[0] if ids else None
+
+
 @dash.callback(
     Output('asset_ids_t7k', 'options'),
-    Input('energy_types_t7k', 'value'))
-def set_asset_ids_options(energy_type):
-    return [{'label': i, 'value': i} for i in
-            energy_types_asset_ids_t7k_csv[energy_type]]
+    Input('energy_types_t7k', 'value'),
+    Input('asset_ids_t7k', 'search_value'),
+    State('asset_ids_t7k', 'value'))
+def set_asset_ids_options(energy_type, search_value, value):
+    return _asset_options('t7k', energy_type, search_value, value)
 
 
 @dash.callback(
     Output('asset_ids_t7k', 'value'),
-    Input('asset_ids_t7k', 'options'))
-def set_asset_ids_value(energy_types_asset_ids_t7k_csv):
-    try:
-        # prefer a middle option if available, else first, else None
-        if len(energy_types_asset_ids_t7k_csv) > 2:
-            return energy_types_asset_ids_t7k_csv[2]['value']
-        if len(energy_types_asset_ids_t7k_csv) > 0:
-            return energy_types_asset_ids_t7k_csv[0]['value']
-    except Exception:
-        pass
-    return None
+    Input('energy_types_t7k', 'value'))
+def set_asset_ids_value(energy_type):
+    return _default_asset('t7k', energy_type)
 
 
 @dash.callback(
     Output('asset_ids_rts', 'options'),
-    Input('energy_types_rts', 'value'))
-def set_asset_ids_options(energy_type):
-    return [{'label': i, 'value': i} for i in
-            energy_types_asset_ids_rts_csv[energy_type]]
+    Input('energy_types_rts', 'value'),
+    Input('asset_ids_rts', 'search_value'),
+    State('asset_ids_rts', 'value'))
+def set_asset_ids_options(energy_type, search_value, value):
+    return _asset_options('rts', energy_type, search_value, value)
 
 
 @dash.callback(
     Output('asset_ids_rts', 'value'),
-    Input('asset_ids_rts', 'options'))
-def set_asset_ids_value(energy_types_asset_ids_rts_csv):
-    try:
-        if len(energy_types_asset_ids_rts_csv) > 0:
-            return energy_types_asset_ids_rts_csv[0]['value']
-    except Exception:
-        pass
-    return None
+    Input('energy_types_rts', 'value'))
+def set_asset_ids_value(energy_type):
+    return _default_asset('rts', energy_type)
+
+
+def _warm_defaults():
+    """Build both tabs' default figures: first day, 'load', default asset (see utils/warmup.py)."""
+    for version, dates in (('rts', date_values_rts), ('t7k', date_values_t7k)):
+        asset_id = _default_asset(version, 'load')
+        if len(dates) and asset_id is not None:
+            build_timeseries(version, dates[0], 'load', asset_id)
+
+
+warmup.register('scenarios', _warm_defaults)
+
+response_cache.cacheable(*(f'{version}_scenario_plot_notuning{suffix}'
+                           for version in ('rts', 't7k') for suffix in ('', '-caption', '-table')))
+
 
 @dash.callback(
     Output('t7k_scenario_plot_notuning', 'figure'),
     Output('t7k_scenario_plot_notuning-caption', 'children'),
+    Output('t7k_scenario_plot_notuning-table', 'children'),
     # Input('version_t7k', 'value'),
     Input('date_values_t7k', 'value'),
     Input('energy_types_t7k', 'value'),
     Input('asset_ids_t7k', 'value'),
     Input('url-scenarios', 'search'),
-    State('embed-store', 'data'))
-def update_scenario_plot(day, asset_type, asset_id, search, embed):
-    fig = build_timeseries('t7k', day, asset_type, asset_id)
+    State('embed-store', 'data'),
+    State('t7k_scenario_plot_notuning-table-summary', 'n_clicks'))
+@coalesce
+def update_scenario_plot(day, asset_type, asset_id, search, embed, table_clicks=None):
+    with stage('figure'):
+        fig = build_timeseries('t7k', day, asset_type, asset_id)
     try:
         if embed:
             fig.update_layout(margin=dict(l=10, r=10, t=30, b=10), width=None, height=None)
@@ -567,20 +682,24 @@ def update_scenario_plot(day, asset_type, asset_id, search, embed):
                 caption += " " + "; ".join(stats_parts)
     except Exception:
         pass
-    return fig, caption
+    return fig, caption, _table_if_open(table_clicks, 't7k', day, asset_type, asset_id, fig=fig)
 
 
 @dash.callback(
     Output('rts_scenario_plot_notuning', 'figure'),
     Output('rts_scenario_plot_notuning-caption', 'children'),
+    Output('rts_scenario_plot_notuning-table', 'children'),
     # Input('version_t7k', 'value'),
     Input('date_values_rts', 'value'),
     Input('energy_types_rts', 'value'),
     Input('asset_ids_rts', 'value'),
     Input('url-scenarios', 'search'),
-    State('embed-store', 'data'))
-def update_scenario_plot_rts(day, asset_type, asset_id, search, embed):
-    fig = build_timeseries('rts', day, asset_type, asset_id)
+    State('embed-store', 'data'),
+    State('rts_scenario_plot_notuning-table-summary', 'n_clicks'))
+@coalesce
+def update_scenario_plot_rts(day, asset_type, asset_id, search, embed, table_clicks=None):
+    with stage('figure'):
+        fig = build_timeseries('rts', day, asset_type, asset_id)
     try:
         if embed:
             fig.update_layout(margin=dict(l=10, r=10, t=30, b=10), width=None, height=None)
@@ -605,7 +724,7 @@ def update_scenario_plot_rts(day, asset_type, asset_id, search, embed):
                 caption += " " + "; ".join(stats_parts)
     except Exception:
         pass
-    return fig, caption
+    return fig, caption, _table_if_open(table_clicks, 'rts', day, asset_type, asset_id, fig=fig)
 
 
 @dash.callback(
@@ -636,24 +755,26 @@ def _scenarios_toggle_embed(search):
     return style_hide, title_style, row_style
 
 
-# Data table population callbacks (reuse central accessibility helper)
+# Data tables are built only when their <details> is opened
 @dash.callback(
-    Output('rts_scenario_plot_notuning-table', 'children'),
-    Input('rts_scenario_plot_notuning', 'figure')
+    Output('rts_scenario_plot_notuning-table', 'children', allow_duplicate=True),
+    Input('rts_scenario_plot_notuning-table-summary', 'n_clicks'),
+    State('date_values_rts', 'value'),
+    State('energy_types_rts', 'value'),
+    State('asset_ids_rts', 'value'),
+    prevent_initial_call=True
 )
-def _update_rts_scen_table(fig_json):  # noqa: D401
-    try:
-        return figure_to_table_html(fig_json)
-    except Exception:
-        return html.Em('Unavailable')
+def _update_rts_scen_table(n_clicks, day, asset_type, asset_id):  # noqa: D401
+    return _table_if_open(n_clicks, 'rts', day, asset_type, asset_id, first_open=True)
 
 
 @dash.callback(
-    Output('t7k_scenario_plot_notuning-table', 'children'),
-    Input('t7k_scenario_plot_notuning', 'figure')
+    Output('t7k_scenario_plot_notuning-table', 'children', allow_duplicate=True),
+    Input('t7k_scenario_plot_notuning-table-summary', 'n_clicks'),
+    State('date_values_t7k', 'value'),
+    State('energy_types_t7k', 'value'),
+    State('asset_ids_t7k', 'value'),
+    prevent_initial_call=True
 )
-def _update_t7k_scen_table(fig_json):  # noqa: D401
-    try:
-        return figure_to_table_html(fig_json)
-    except Exception:
-        return html.Em('Unavailable')
\ No newline at end of file
+def _update_t7k_scen_table(n_clicks, day, asset_type, asset_id):  # noqa: D401
+    return _table_if_open(n_clicks, 't7k', day, asset_type, asset_id, first_open=True)
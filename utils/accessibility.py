@@ -5,15 +5,104 @@ screen-reader and keyboard users an alternative, sortable baseline structure.
 """
 from __future__ import annotations
 
+import base64
 from typing import Any, Sequence
 
-try:
-    import plotly.graph_objects as go  # type: ignore
-except Exception:  # pragma: no cover - plotly optional at import time
-    go = None  # type: ignore
-
 from dash import html  # dash.html components
 
+XY_HEADERS = ['Trace', 'Index', 'X', 'Y']
+LATLON_HEADERS = ['Trace', 'Index', 'Lat', 'Lon', 'Value']
+
+
+def _field(tr: Any, name: str) -> Any:
+    """Read a trace attribute from either a raw dict or a graph_objects trace."""
+    if isinstance(tr, dict):
+        return tr.get(name)
+    return getattr(tr, name, None)
+
+
+def _length(seq: Any) -> int:
+    try:
+        return len(seq) if seq is not None and not isinstance(seq, (str, dict)) else 0
+    except TypeError:
+        return 0
+
+
+def _head(seq: Any, n: int) -> list:
+    """First ``n`` items of a sequence without touching the rest.
+
+    Handles lists/tuples/arrays and plotly typed-array dicts (``bdata``/``dtype``).
+    """
+    if seq is None or isinstance(seq, str):
+        return []
+    if isinstance(seq, dict):
+        if 'bdata' not in seq or 'dtype' not in seq:
+            return []
+        try:
+            import numpy as np
+            dtype = np.dtype(seq['dtype'])
+            raw = base64.b64decode(seq['bdata'])
+            return np.frombuffer(raw[:n * dtype.itemsize], dtype=dtype).tolist()
+        except Exception:
+            return []
+    try:
+        return list(seq[:n])
+    except TypeError:
+        return []
+
+
+def figure_to_table_records(fig: Any, max_rows: int = 50) -> list[tuple[list[str], list[list[Any]]]]:
+    """Return ``[(headers, rows), ...]`` sections for the first ``max_rows`` points per trace.
+
+    Works directly on the figure dict Dash supplies (or a go.Figure) without
+    re-validating it, so the cost is O(max_rows x traces) regardless of how
+    many points the figure holds. Cartesian (x/y) rows come first, then
+    mapbox/geo (lat/lon) rows with a derived 'Value' column.
+    """
+    if fig is None:
+        return []
+    data_seq: Sequence = fig.get('data', []) if isinstance(fig, dict) else getattr(fig, 'data', [])
+    rows_xy: list[list[Any]] = []  # [Trace, Index, X, Y]
+    rows_latlon: list[list[Any]] = []  # [Trace, Index, Lat, Lon, Value]
+    for ti, tr in enumerate(data_seq or []):
+        name = _field(tr, 'name') or f'Trace {ti+1}'
+        xs = _head(_field(tr, 'x'), max_rows)
+        ys = _head(_field(tr, 'y'), max_rows)
+        # Prefer cartesian if both provided.
+        if xs and ys:
+            for i, (x, y) in enumerate(zip(xs, ys)):
+                rows_xy.append([name, i, x, y])
+            continue
+        lat_full = _field(tr, 'lat')
+        lats = _head(lat_full, max_rows)
+        lons = _head(_field(tr, 'lon'), max_rows)
+        if not (lats and lons):
+            continue
+        n_points = _length(lat_full) or len(lats)
+        # Derive value column: marker.color sequence, z, or customdata first column
+        values: list[Any] = []
+        try:
+            marker = _field(tr, 'marker')
+            colors = _field(marker, 'color') if marker is not None else None
+            zvals = _field(tr, 'z')
+            customdata = _field(tr, 'customdata')
+            if _length(colors) == n_points or (isinstance(colors, dict) and 'bdata' in colors):
+                values = _head(colors, max_rows)
+            elif _length(zvals) == n_points:
+                values = _head(zvals, max_rows)
+            elif _length(customdata):
+                values = [cd[0] if _length(cd) else '' for cd in _head(customdata, max_rows)]
+        except Exception:
+            values = []
+        for i, (lat, lon) in enumerate(zip(lats, lons)):
+            rows_latlon.append([name, i, lat, lon, values[i] if i < len(values) else ''])
+    sections = []
+    if rows_xy:
+        sections.append((XY_HEADERS, rows_xy))
+    if rows_latlon:
+        sections.append((LATLON_HEADERS, rows_latlon))
+    return sections
+
 
 def figure_to_table_html(fig: Any, max_rows: int = 50):
     """Return an HTML table (first ``max_rows`` rows per trace) for a Plotly figure.
@@ -26,108 +115,67 @@ def figure_to_table_html(fig: Any, max_rows: int = 50):
     (marker.color sequence, z, or customdata first column) as 'Value'. Headers
     are adapted automatically depending on whether (x,y) or (lat,lon) data are
     encountered. Mixed figures (both cartesian and geo) will union the headers.
+    Rows come from ``figure_to_table_records``, so dict figures are never
+    rebuilt as go.Figure.
     """
     try:
-        if fig is None:
-            return html.Em('No data')
-        # Dash supplies dict; reconstruct Figure when plotly is available.
-        if isinstance(fig, dict) and go is not None:
-            try:
-                fig = go.Figure(fig)  # type: ignore
-            except Exception:
-                # Fall back to raw dict processing later
-                pass
-
-        data_seq: Sequence = getattr(fig, 'data', []) if not isinstance(fig, dict) else fig.get('data', [])  # type: ignore
-        if not data_seq:
-            return html.Em('No data')
-
-        saw_xy = False
-        saw_latlon = False
-        rows_xy: list[list[Any]] = []  # [Trace, Index, X, Y]
-        rows_latlon: list[list[Any]] = []  # [Trace, Index, Lat, Lon, Value]
-
-        for ti, tr in enumerate(data_seq):
-            if isinstance(tr, dict):
-                xs = tr.get('x') or []
-                ys = tr.get('y') or []
-                lats = tr.get('lat') or []
-                lons = tr.get('lon') or []
-                marker = tr.get('marker') or {}
-                name = tr.get('name') or f'Trace {ti+1}'
-                customdata = tr.get('customdata') or []
-                zvals = tr.get('z') or []
-            else:  # graph objects trace
-                xs = getattr(tr, 'x', []) or []
-                ys = getattr(tr, 'y', []) or []
-                lats = getattr(tr, 'lat', []) or []
-                lons = getattr(tr, 'lon', []) or []
-                marker = getattr(tr, 'marker', None)
-                name = getattr(tr, 'name', None) or f'Trace {ti+1}'
-                customdata = getattr(tr, 'customdata', []) or []
-                zvals = getattr(tr, 'z', []) or []
-            # Prefer cartesian if both provided.
-            if xs and ys:
-                saw_xy = True
-                limit = min(len(xs), len(ys), max_rows)
-                for i in range(limit):
-                    rows_xy.append([name, i, xs[i], ys[i]])
-            elif lats and lons:
-                saw_latlon = True
-                limit = min(len(lats), len(lons), max_rows)
-                # Derive value column
-                values = []
-                try:
-                    # marker.color may be scalar or sequence
-                    colors = marker.get('color') if isinstance(marker, dict) else getattr(marker, 'color', None)
-                    if isinstance(colors, (list, tuple)) and len(colors) == len(lats):
-                        values = list(colors)
-                    elif isinstance(zvals, (list, tuple)) and len(zvals) == len(lats):
-                        values = list(zvals)
-                    elif isinstance(customdata, (list, tuple)) and customdata and isinstance(customdata[0], (list, tuple)):
-                        # Take first column
-                        values = [cd[0] if cd else '' for cd in customdata[:len(lats)]]
-                except Exception:
-                    values = []
-                for i in range(limit):
-                    val = values[i] if i < len(values) else ''
-                    rows_latlon.append([name, i, lats[i], lons[i], val])
-
-        if not rows_xy and not rows_latlon:
+        sections = figure_to_table_records(fig, max_rows=max_rows)
+        if not sections:
             return html.Em('No data')
 
-        # Compose headers / rows based on what we saw.
-        # If both families present, we'll output XY rows then LAT/LON rows with a blank separator row.
-        table_sections = []
-        total_rows = 0
-        if rows_xy:
-            table_sections.append([
-                html.Thead(html.Tr([html.Th(h) for h in ['Trace', 'Index', 'X', 'Y']])),
-                html.Tbody([html.Tr([html.Td(c) for c in r]) for r in rows_xy])
-            ])
-            total_rows += len(rows_xy)
-        if rows_latlon:
-            # Add a separator row if both present for clarity (visually minimal, assistive tech will just see another row).
-            if rows_xy:
-                sep = html.Tbody([html.Tr([html.Td(html.Em('—')) for _ in range(5)])])
-            else:
-                sep = None
-            section = [
-                html.Thead(html.Tr([html.Th(h) for h in ['Trace', 'Index', 'Lat', 'Lon', 'Value']])),
-                html.Tbody([html.Tr([html.Td(c) for c in r]) for r in rows_latlon])
-            ]
-            if sep:
-                table_sections.append([sep])
-            table_sections.append(section)
-            total_rows += len(rows_latlon)
-
-        # Flatten sections
+        # If both families present, we output XY rows then LAT/LON rows with a blank separator row.
         children = []
-        for sec in table_sections:
-            children.extend(sec)
-
+        for si, (headers, rows) in enumerate(sections):
+            if si > 0:
+                # Separator row (visually minimal, assistive tech will just see another row).
+                children.append(html.Tbody([html.Tr([html.Td(html.Em('—')) for _ in range(len(headers))])]))
+            children.append(html.Thead(html.Tr([html.Th(h) for h in headers])))
+            children.append(html.Tbody([html.Tr([html.Td(c) for c in r]) for r in rows]))
+        total_rows = sum(len(rows) for _, rows in sections)
         return html.Table(children, className='vis-table', **{"aria-rowcount": total_rows})
     except Exception:
         return html.Em('Table error')
 
-__all__ = ["figure_to_table_html"]
+
+def records_to_table_html(headers: Sequence[str], rows: Sequence[Sequence[Any]]):
+    """Return an HTML table for pre-selected rows (e.g. sliced from a cached DataFrame)."""
+    if not rows:
+        return html.Em('No data')
+    return html.Table([
+        html.Thead(html.Tr([html.Th(h) for h in headers])),
+        html.Tbody([html.Tr([html.Td(c) for c in r]) for r in rows])
+    ], className='vis-table', **{"aria-rowcount": len(rows)})
+
+
+def lazy_table_details(table_id: str, summary: str = 'Data table'):
+    """Return a closed ``<details>`` whose table is only filled once it is opened.
+
+    The summary's ``n_clicks`` is the trigger: Dash does not sync the ``open``
+    attribute back, and counting toggles drifts (a click can land while a
+    callback is in flight), so after the first click the table is kept
+    filled whether the element is open or closed.
+    """
+    return html.Details([
+        html.Summary(summary, id=f"{table_id}-summary", n_clicks=0, **{"aria-controls": table_id}),
+        html.Div(id=table_id, className='vis-table-wrapper')
+    ], open=False)
+
+
+def details_requested(n_clicks: int | None) -> bool:
+    """True once a ``lazy_table_details`` element has been opened; its table then stays in step."""
+    return bool(n_clicks)
+
+
+def details_first_opened(n_clicks: int | None) -> bool:
+    """True on the click that first opens a ``lazy_table_details`` element (later toggles reuse its table)."""
+    return n_clicks == 1
+
+
+__all__ = [
+    "figure_to_table_html",
+    "figure_to_table_records",
+    "records_to_table_html",
+    "lazy_table_details",
+    "details_requested",
+    "details_first_opened",
+]
@@ -0,0 +1,685 @@
+"""Caches shared by the page modules.
+
+``LRUCache`` is a per-process mapping of live objects. ``SharedCache`` puts
+one in front of a byte-level backend that other gunicorn workers can read, so
+one worker's expensive load (an LMP day, a scenario CSV, an allocation column)
+serves all of them. Backends are namespaced and evict least-recently-used
+entries per namespace within that namespace's byte budget:
+
+* ``MemoryBackend``: this process only (tests, single-worker runs).
+* ``SQLiteBackend``: one file shared by every worker on the host.
+* ``RemoteBackend``: any client with ``get``/``set``/``delete`` over bytes
+  (memcached, redis); ``DictClient`` is an in-process stand-in.
+
+``ORFEUS_CACHE_BACKEND`` (``none``, ``memory``, ``sqlite`` or ``remote``)
+selects the backend; see ``get_backend``. Callbacks run on gunicorn threads,
+so everything here is guarded by a lock.
+
+Shared values are written with ``dumps_value``: an ``.npz`` archive of plain
+arrays plus a JSON description of the frames, dicts and lists around them.
+Reading one back never unpickles, so a tampered cache file cannot run code.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import io
+import json
+import os
+import sqlite3
+import stat
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import record_cache
+from utils.singleflight import SingleFlight
+
+# Private to the app's user (mode 0700), unlike a shared temp directory
+CACHE_DIR = os.path.join(os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'orfeus')
+
+try:
+    CACHE_BACKEND = os.getenv('ORFEUS_CACHE_BACKEND', 'none').strip().lower()
+    CACHE_DB = os.getenv('ORFEUS_CACHE_DB') or os.path.join(CACHE_DIR, 'cache.sqlite')
+    CACHE_REMOTE = os.getenv('ORFEUS_CACHE_REMOTE') or None
+    # Default shared budget per namespace
+    CACHE_MB = float(os.getenv('ORFEUS_CACHE_MB', '256'))
+    # Bump to orphan shared entries written by an older deployment or dataset
+    CACHE_VERSION = os.getenv('ORFEUS_CACHE_VERSION', '1')
+except Exception:
+    CACHE_BACKEND, CACHE_DB, CACHE_REMOTE, CACHE_MB, CACHE_VERSION = 'none', None, None, 256.0, '1'
+
+
+def sizeof(value: Any) -> int:
+    """Approximate in-memory size of a cached value in bytes."""
+    try:
+        if hasattr(value, 'memory_usage') and hasattr(value, 'index'):
+            usage = value.memory_usage(deep=True)
+            return int(usage.sum() if hasattr(usage, 'sum') else usage)
+        if hasattr(value, 'nbytes'):
+            return int(value.nbytes)
+        if isinstance(value, (bytes, bytearray, memoryview, str)):
+            return len(value)
+        if isinstance(value, (tuple, list)):
+            return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(sizeof(v) for v in value.values())
+        return sys.getsizeof(value)
+    except Exception:
+        return 0
+
+
+# ---------- Pickle-free value encoding ----------
+
+_CODEC_MAGIC = 'orfeus-cache/1'
+# Array kinds np.load reads without allow_pickle: bool, ints, floats, complex, datetimes, str
+_PLAIN_KINDS = 'biufcmMU'
+
+
+def _is_json_scalar(value) -> bool:
+    return value is None or type(value) in (bool, int, float, str)
+
+
+class _Encoder:
+    def __init__(self):
+        self.arrays: dict[str, np.ndarray] = {}
+
+    def array(self, values) -> str:
+        arr = np.asarray(values)
+        if arr.dtype.kind == 'O':
+            # Object columns are only stored when they hold strings (and missing values)
+            items = arr.ravel().tolist()
+            missing = [v is None or (isinstance(v, float) and v != v) for v in items]
+            if not all(m or isinstance(v, str) for v, m in zip(items, missing)):
+                raise TypeError('object array with non-string values')
+            arr = np.array(['' if m else v for v, m in zip(items, missing)], dtype=str).reshape(arr.shape)
+            name = self.array(arr)
+            self.arrays[f'{name}_na'] = np.array(missing, dtype=bool)
+            return name
+        if arr.dtype.kind not in _PLAIN_KINDS:
+            raise TypeError(f'unsupported dtype {arr.dtype}')
+        name = f'a{len(self.arrays)}'
+        self.arrays[name] = arr
+        return name
+
+    def node(self, value) -> Any:
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return {'t': 'json', 'v': value}
+        if isinstance(value, (np.bool_, np.integer, np.floating)):
+            return {'t': 'json', 'v': value.item()}
+        if isinstance(value, list) and all(_is_json_scalar(v) for v in value):
+            return {'t': 'json', 'v': value}
+        if isinstance(value, (list, tuple)):
+            return {'t': type(value).__name__, 'items': [self.node(v) for v in value]}
+        if isinstance(value, dict):
+            if not all(isinstance(k, (str, int)) and not isinstance(k, bool) for k in value):
+                raise TypeError('dict keys must be str or int')
+            return {'t': 'dict', 'keys': list(value), 'items': [self.node(v) for v in value.values()]}
+        if isinstance(value, np.ndarray):
+            return {'t': 'ndarray', 'a': self.array(value)}
+        if isinstance(value, pd.DataFrame):
+            return {'t': 'frame', 'columns': self.node(list(value.columns)),
+                    'data': [self.column(value.iloc[:, i]) for i in range(value.shape[1])],
+                    'index': self.index(value.index), 'attrs': self.node(dict(value.attrs))}
+        raise TypeError(f'cannot encode {type(value).__name__}')
+
+    def column(self, s: pd.Series) -> Any:
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            return {'t': 'categorical', 'codes': self.array(s.cat.codes.to_numpy()),
+                    'categories': self.index(s.cat.categories), 'ordered': bool(s.cat.ordered)}
+        if isinstance(s.dtype, np.dtype):
+            return {'t': 'ndarray', 'a': self.array(s.to_numpy())}
+        raise TypeError(f'unsupported column dtype {s.dtype}')
+
+    def index(self, index: pd.Index) -> Any:
+        if isinstance(index, pd.RangeIndex):
+            return {'t': 'range', 'v': [index.start, index.stop, index.step], 'name': self.node(index.name)}
+        if isinstance(index, pd.MultiIndex) or not isinstance(index.dtype, np.dtype):
+            raise TypeError(f'unsupported index {type(index).__name__}')
+        return {'t': 'index', 'a': self.array(index.to_numpy()), 'name': self.node(index.name)}
+
+
+def _decode(node, arrays) -> Any:
+    t = node['t']
+    if t == 'json':
+        return node['v']
+    if t in ('list', 'tuple'):
+        items = [_decode(n, arrays) for n in node['items']]
+        return items if t == 'list' else tuple(items)
+    if t == 'dict':
+        return dict(zip(node['keys'], (_decode(n, arrays) for n in node['items'])))
+    if t == 'ndarray':
+        arr = arrays[node['a']]
+        na = f"{node['a']}_na"
+        if na in arrays.files:
+            arr = arr.astype(object)
+            arr[arrays[na]] = None
+        return arr
+    if t == 'categorical':
+        return pd.Categorical.from_codes(arrays[node['codes']], _decode(node['categories'], arrays),
+                                         ordered=node['ordered'])
+    if t == 'range':
+        return pd.RangeIndex(*node['v'], name=_decode(node['name'], arrays))
+    if t == 'index':
+        return pd.Index(_decode({'t': 'ndarray', 'a': node['a']}, arrays), name=_decode(node['name'], arrays))
+    if t == 'frame':
+        columns = _decode(node['columns'], arrays)
+        index = _decode(node['index'], arrays)
+        df = pd.DataFrame({i: _decode(n, arrays) for i, n in enumerate(node['data'])}, index=index)
+        df.columns = pd.Index(columns) if columns else pd.RangeIndex(0)
+        df.attrs.update(_decode(node['attrs'], arrays))
+        return df
+    raise ValueError(f'unknown node type {t!r}')
+
+
+def dumps_value(value: Any) -> bytes:
+    """Encode frames, arrays and JSON-like containers of them as ``.npz`` bytes.
+
+    Raises ``TypeError`` for anything else (including object columns holding
+    non-strings); such values simply stay out of the shared tier.
+    """
+    enc = _Encoder()
+    meta = json.dumps({'magic': _CODEC_MAGIC, 'root': enc.node(value)})
+    buf = io.BytesIO()
+    np.savez(buf, __meta__=np.frombuffer(meta.encode('utf-8'), dtype=np.uint8), **enc.arrays)
+    return buf.getvalue()
+
+
+def loads_value(blob: bytes) -> Any:
+    """Decode ``dumps_value`` bytes; never unpickles (``ValueError`` on foreign data)."""
+    with np.load(io.BytesIO(blob), allow_pickle=False) as arrays:
+        meta = json.loads(arrays['__meta__'].tobytes().decode('utf-8'))
+        if meta.get('magic') != _CODEC_MAGIC:
+            raise ValueError('not an orfeus cache entry')
+        return _decode(meta['root'], arrays)
+
+
+class LRUCache:
+    """Thread-safe least-recently-used mapping with an entry budget and an optional byte budget.
+
+    A ``name`` reports ``get_or_set`` hits and misses to ``utils.metrics``.
+    With ``max_bytes``, each value's ``sizeof`` is tracked in ``nbytes``.
+    Concurrent ``get_or_set`` misses for one key run its factory once.
+    """
+
+    def __init__(self, maxsize: int = 8, name: str | None = None, max_bytes: int | None = None):
+        self.maxsize = max(1, int(maxsize))
+        self.name = name
+        self.max_bytes = int(max_bytes) if max_bytes else None
+        self.nbytes = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._sizes: dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        size = sizeof(value) if self.max_bytes else 0
+        with self._lock:
+            self._pop(key)
+            self._data[key] = value
+            self._sizes[key] = size
+            self.nbytes += size
+            # Keep at least the newest entry even if it alone is over budget
+            while len(self._data) > self.maxsize or (
+                    self.max_bytes and self.nbytes > self.max_bytes and len(self._data) > 1):
+                self._pop(next(iter(self._data)))
+
+    def _pop(self, key: Hashable) -> None:
+        if key in self._data:
+            del self._data[key]
+            self.nbytes -= self._sizes.pop(key, 0)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any],
+                   should_cache: Callable[[Any], bool] | None = None) -> Any:
+        """Return the cached value for key, computing it with factory on a miss.
+
+        ``should_cache`` can veto storing a computed value (e.g. stub fallbacks).
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if self.name:
+            record_cache(self.name, value is not sentinel)
+        if value is not sentinel:
+            return value
+        return self._flight.do(key, lambda: self._fill(key, factory, should_cache))
+
+    def _fill(self, key: Hashable, factory: Callable[[], Any],
+              should_cache: Callable[[Any], bool] | None) -> Any:
+        # A call for this key may have finished between the miss and taking the flight
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+        value = factory()
+        if should_cache is None or should_cache(value):
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+# ---------- Byte-level backends ----------
+
+class MemoryBackend:
+    """Namespaced LRU of bytes in this process, evicted per namespace by byte budget."""
+
+    def __init__(self, default_budget: int = 256 << 20):
+        self.default_budget = int(default_budget)
+        self._budgets: dict[str, int] = {}
+        self._spaces: dict[str, OrderedDict[str, bytes]] = {}
+        self._bytes: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def set_budget(self, namespace: str, max_bytes: int) -> None:
+        with self._lock:
+            self._budgets[namespace] = int(max_bytes)
+
+    def get(self, namespace: str, key: str) -> bytes | None:
+        with self._lock:
+            space = self._spaces.get(namespace)
+            if space is None or key not in space:
+                return None
+            space.move_to_end(key)
+            return space[key]
+
+    def set(self, namespace: str, key: str, value: bytes) -> None:
+        budget = self._budgets.get(namespace, self.default_budget)
+        if len(value) > budget:
+            return
+        with self._lock:
+            space = self._spaces.setdefault(namespace, OrderedDict())
+            old = space.pop(key, None)
+            used = self._bytes.get(namespace, 0) - (len(old) if old is not None else 0)
+            space[key] = value
+            used += len(value)
+            while used > budget:
+                _, evicted = space.popitem(last=False)
+                used -= len(evicted)
+            self._bytes[namespace] = used
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            old = self._spaces.get(namespace, {}).pop(key, None)
+            if old is not None:
+                self._bytes[namespace] -= len(old)
+
+    def clear(self, namespace: str | None = None) -> None:
+        with self._lock:
+            for ns in ([namespace] if namespace else list(self._spaces)):
+                self._spaces.pop(ns, None)
+                self._bytes.pop(ns, None)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {ns: {'entries': len(space), 'bytes': self._bytes.get(ns, 0)}
+                    for ns, space in self._spaces.items()}
+
+
+def _check_private(path: str, kind: str) -> None:
+    """Refuse ``path`` unless this process owns it and no one else can write to it."""
+    st = os.lstat(path)
+    if stat.S_ISLNK(st.st_mode):
+        raise PermissionError(f'cache {kind} {path} is a symlink')
+    if hasattr(os, 'geteuid') and st.st_uid != os.geteuid():
+        raise PermissionError(f'cache {kind} {path} is owned by another user')
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f'cache {kind} {path} is writable by other users')
+
+
+def open_private_db(path: str) -> str:
+    """Create (mode 0600) or vet the SQLite file at ``path``; its directory is created 0700.
+
+    Raises ``PermissionError`` for a file (or its ``-wal``/``-shm`` companions)
+    that another user owns or can write.
+    """
+    path = os.path.abspath(path)
+    parent = os.path.dirname(path)
+    if not os.path.isdir(parent):
+        os.makedirs(parent, mode=0o700, exist_ok=True)
+        os.chmod(parent, 0o700)
+    if os.path.normpath(parent) == os.path.normpath(CACHE_DIR):
+        _check_private(parent, 'directory')
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+    except FileExistsError:
+        pass
+    for name in (path, f'{path}-wal', f'{path}-shm'):
+        if os.path.lexists(name):
+            _check_private(name, 'file')
+    return path
+
+
+class SQLiteBackend:
+    """Namespaced bytes in one SQLite file (WAL) shared by every worker on the host.
+
+    Each write evicts the namespace's least recently read rows beyond its byte
+    budget. A locked or unwritable database behaves as a miss. The file must
+    belong to this process's user and be writable by no one else (see
+    ``open_private_db``).
+    """
+
+    def __init__(self, path: str, default_budget: int = 256 << 20):
+        self.path = open_private_db(str(path))
+        self.default_budget = int(default_budget)
+        self._budgets: dict[str, int] = {}
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, '
+            'nbytes INTEGER NOT NULL, accessed REAL NOT NULL, PRIMARY KEY (namespace, key))'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS cache_lru ON cache (namespace, accessed)')
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=2.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def set_budget(self, namespace: str, max_bytes: int) -> None:
+        self._budgets[namespace] = int(max_bytes)
+
+    def get(self, namespace: str, key: str) -> bytes | None:
+        try:
+            conn = self._conn()
+            row = conn.execute('SELECT value FROM cache WHERE namespace = ? AND key = ?',
+                               (namespace, key)).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE cache SET accessed = ? WHERE namespace = ? AND key = ?',
+                         (time.time(), namespace, key))
+            return bytes(row[0])
+        except sqlite3.Error:
+            return None
+
+    def set(self, namespace: str, key: str, value: bytes) -> None:
+        budget = self._budgets.get(namespace, self.default_budget)
+        if len(value) > budget:
+            return
+        try:
+            conn = self._conn()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute('INSERT OR REPLACE INTO cache (namespace, key, value, nbytes, accessed) '
+                             'VALUES (?, ?, ?, ?, ?)', (namespace, key, sqlite3.Binary(value), len(value), time.time()))
+                used = conn.execute('SELECT COALESCE(SUM(nbytes), 0) FROM cache WHERE namespace = ?',
+                                    (namespace,)).fetchone()[0]
+                if used > budget:
+                    doomed, freed = [], 0
+                    for old_key, nbytes in conn.execute(
+                            'SELECT key, nbytes FROM cache WHERE namespace = ? AND key != ? ORDER BY accessed',
+                            (namespace, key)):
+                        if used - freed <= budget:
+                            break
+                        doomed.append((namespace, old_key))
+                        freed += nbytes
+                    conn.executemany('DELETE FROM cache WHERE namespace = ? AND key = ?', doomed)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error:
+            pass
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            self._conn().execute('DELETE FROM cache WHERE namespace = ? AND key = ?', (namespace, key))
+        except sqlite3.Error:
+            pass
+
+    def clear(self, namespace: str | None = None) -> None:
+        try:
+            if namespace:
+                self._conn().execute('DELETE FROM cache WHERE namespace = ?', (namespace,))
+            else:
+                self._conn().execute('DELETE FROM cache')
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        try:
+            rows = self._conn().execute('SELECT namespace, COUNT(*), SUM(nbytes) FROM cache GROUP BY namespace')
+            return {ns: {'entries': n, 'bytes': int(b or 0)} for ns, n, b in rows}
+        except sqlite3.Error:
+            return {}
+
+
+class DictClient:
+    """In-process stand-in for a network cache client (``get``/``set``/``delete`` over bytes)."""
+
+    def __init__(self):
+        self._data: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._data[key] = value
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RemoteBackend:
+    """Namespaces over a network cache client such as pymemcache or redis.
+
+    The service evicts by its own memory policy; budgets only bound what is
+    written, and byte counts are tracked per namespace for ``stats``.
+    ``clear(namespace)`` bumps a generation stored in the service, which
+    orphans the namespace's keys for every worker at once.
+    """
+
+    def __init__(self, client, prefix: str = 'orfeus', default_budget: int = 256 << 20):
+        self.client = client
+        self.prefix = prefix
+        self.default_budget = int(default_budget)
+        self._budgets: dict[str, int] = {}
+        self._written: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def set_budget(self, namespace: str, max_bytes: int) -> None:
+        self._budgets[namespace] = int(max_bytes)
+
+    def _generation(self, namespace: str) -> str:
+        try:
+            gen = self.client.get(f'{self.prefix}:{namespace}:gen')
+            return gen.decode() if isinstance(gen, bytes) else str(gen or 0)
+        except Exception:
+            return '0'
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f'{self.prefix}:{namespace}:{self._generation(namespace)}:{key}'
+
+    def get(self, namespace: str, key: str) -> bytes | None:
+        try:
+            return self.client.get(self._key(namespace, key))
+        except Exception:
+            return None
+
+    def set(self, namespace: str, key: str, value: bytes) -> None:
+        if len(value) > self._budgets.get(namespace, self.default_budget):
+            return
+        try:
+            self.client.set(self._key(namespace, key), value)
+            with self._lock:
+                self._written[namespace] = self._written.get(namespace, 0) + len(value)
+        except Exception:
+            pass
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            self.client.delete(self._key(namespace, key))
+        except Exception:
+            pass
+
+    def clear(self, namespace: str | None = None) -> None:
+        for ns in ([namespace] if namespace else list(self._budgets)):
+            try:
+                gen = int(self._generation(ns)) + 1
+                self.client.set(f'{self.prefix}:{ns}:gen', str(gen).encode())
+            except Exception:
+                pass
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {ns: {'bytes_written': n} for ns, n in self._written.items()}
+
+
+_backend_lock = threading.Lock()
+_BACKEND: Any = False  # False: not resolved yet; None: no shared tier
+
+
+def _remote_client():
+    """Client from ``ORFEUS_CACHE_REMOTE`` ('package.module:factory'), or the in-process stand-in."""
+    if not CACHE_REMOTE:
+        return DictClient()
+    module, _, attr = CACHE_REMOTE.partition(':')
+    return getattr(importlib.import_module(module), attr or 'client')()
+
+
+def get_backend():
+    """The process-wide shared backend chosen by ``ORFEUS_CACHE_BACKEND`` (None for ``none``).
+
+    A backend that cannot be opened (e.g. an unwritable ``ORFEUS_CACHE_DB``, or
+    one another user owns or can write) falls back to no shared tier.
+    """
+    global _BACKEND
+    with _backend_lock:
+        if _BACKEND is False:
+            budget = int(CACHE_MB * (1 << 20))
+            try:
+                if CACHE_BACKEND == 'memory':
+                    _BACKEND = MemoryBackend(budget)
+                elif CACHE_BACKEND == 'sqlite':
+                    _BACKEND = SQLiteBackend(CACHE_DB, budget)
+                elif CACHE_BACKEND == 'remote':
+                    _BACKEND = RemoteBackend(_remote_client(), default_budget=budget)
+                else:
+                    _BACKEND = None
+            except Exception:
+                _BACKEND = None
+        return _BACKEND
+
+
+class SharedCache(LRUCache):
+    """``LRUCache`` of live objects backed by a shared tier in ``namespace`` (see ``dumps_value``).
+
+    A local miss is looked up in the backend before calling the factory, and
+    computed values are written to both, so any worker's load serves the others.
+    ``max_bytes`` bounds the local tier; ``shared_bytes`` is the namespace's
+    budget in the backend (default ``ORFEUS_CACHE_MB``).
+    """
+
+    def __init__(self, namespace: str, maxsize: int = 8, max_bytes: int | None = None,
+                 shared_bytes: int | None = None, backend: Any = False):
+        super().__init__(maxsize, name=namespace, max_bytes=max_bytes)
+        self.namespace = namespace
+        self._backend = backend
+        self._shared_bytes = shared_bytes
+
+    @property
+    def backend(self):
+        if self._backend is False:
+            self._backend = get_backend()
+            if self._backend is not None and self._shared_bytes:
+                self._backend.set_budget(self.namespace, self._shared_bytes)
+        return self._backend
+
+    def _shared_key(self, key: Hashable) -> str:
+        return hashlib.sha1(f'{CACHE_VERSION}:{key!r}'.encode('utf-8')).hexdigest()
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any],
+                   should_cache: Callable[[Any], bool] | None = None, shared: bool = True) -> Any:
+        """Like ``LRUCache.get_or_set``; ``shared=False`` keeps the value out of the backend."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        record_cache(self.name, value is not sentinel)
+        if value is not sentinel:
+            return value
+        return self._flight.do(key, lambda: self._fill_shared(key, factory, should_cache, shared))
+
+    def _fill_shared(self, key: Hashable, factory: Callable[[], Any],
+                     should_cache: Callable[[Any], bool] | None, shared: bool) -> Any:
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+        backend = self.backend if shared else None
+        skey = self._shared_key(key) if backend is not None else None
+        if backend is not None:
+            blob = backend.get(self.namespace, skey)
+            if blob is not None:
+                try:
+                    value = loads_value(blob)
+                except Exception:
+                    # Written by an older release, or not ours
+                    backend.delete(self.namespace, skey)
+                    value = sentinel
+            record_cache(f'{self.name}_shared', value is not sentinel)
+            if value is not sentinel:
+                self.set(key, value)
+                return value
+        value = factory()
+        if should_cache is None or should_cache(value):
+            self.set(key, value)
+            if backend is not None:
+                try:
+                    backend.set(self.namespace, skey, dumps_value(value))
+                except Exception:
+                    # Not encodable without pickle: kept in this worker only
+                    pass
+        return value
+
+    def clear(self, shared: bool = False) -> None:
+        """Drop the local tier, and the namespace in the backend if ``shared``."""
+        super().clear()
+        if shared and self.backend is not None:
+            self.backend.clear(self.namespace)
+
+
+__all__ = [
+    "CACHE_DIR",
+    "sizeof",
+    "dumps_value",
+    "loads_value",
+    "open_private_db",
+    "LRUCache",
+    "MemoryBackend",
+    "SQLiteBackend",
+    "DictClient",
+    "RemoteBackend",
+    "get_backend",
+    "SharedCache",
+]
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Column-at-a-time access to the wide risk-allocation CSVs.
+
+The asset-allocation files hold one column per asset and one row per hour,
+but the asset plot only ever shows one column. ``LazyColumnFrame`` keeps the
+time axis resident and loads asset columns on demand as float32:
+
+* from a column-addressable binary store when one exists (``values.npy``
+  holds the matrix transposed, so each asset is one contiguous memory-mapped
+  row shared through the page cache by every worker), or
+* by a chunked ``usecols`` read of the CSV otherwise.
+
+Stores live under ``ORFEUS_COLUMN_STORE_DIR`` (default ``data/column_store``);
+they are built on first use when that directory is writable and rebuilt when
+the CSV's size or mtime changes. Pre-build them on a read-only data share with:
+
+    python utils/column_store.py data/reliability_cost_index_data/t7k/daily_type-allocs_t7k_asset_allocs.csv
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Allow running as a script (python utils/column_store.py) as well as a module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.cache import SharedCache  # noqa: E402
+from utils.config import SETTINGS  # noqa: E402
+from utils.metrics import stage  # noqa: E402
+from utils.schema import widen_float32  # noqa: E402
+
+TIME_COLUMN_NAMES = ('time', 'Time', 'timestamp', 'Timestamp', 'date', 'Date', 'Datetime', 'datetime',
+                     'Unnamed: 0', 'index')
+CHUNK_ROWS = 4096
+STORE_FORMAT = 1
+
+try:
+    COLUMN_CACHE_SIZE = int(os.getenv('ALLOC_COLUMN_CACHE_SIZE', '32'))
+except Exception:
+    COLUMN_CACHE_SIZE = 32
+
+_COLUMN_CACHE = SharedCache('alloc_column', maxsize=COLUMN_CACHE_SIZE)
+
+
+def read_header(path) -> list[str]:
+    """Column names of a CSV without reading any rows."""
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def find_time_column(columns: Iterable[str]) -> str | None:
+    cols = list(columns)
+    for name in TIME_COLUMN_NAMES:
+        if name in cols:
+            return name
+    return None
+
+
+def _to_naive(values) -> np.ndarray:
+    s = pd.to_datetime(pd.Series(values), errors='coerce', utc=True)
+    return s.dt.tz_convert(None).to_numpy(dtype='datetime64[ns]')
+
+
+def iter_chunks(path, usecols: Sequence[str], time_col: str, chunksize: int = CHUNK_ROWS):
+    """Yield (times, float32 matrix) per chunk for ``usecols`` (time column excluded)."""
+    value_cols = [c for c in usecols if c != time_col]
+    reader = pd.read_csv(path, usecols=[time_col, *value_cols],
+                         dtype={c: 'float32' for c in value_cols}, chunksize=chunksize)
+    for chunk in reader:
+        yield _to_naive(chunk[time_col]), chunk[value_cols].to_numpy(dtype=np.float32)
+
+
+def read_columns(path, usecols: Sequence[str], time_col: str, start=None, end=None,
+                 chunksize: int = CHUNK_ROWS) -> pd.DataFrame:
+    """Read 'time' plus ``usecols`` as float32 in chunks, keeping only rows in [start, end]."""
+    start = np.datetime64(pd.Timestamp(start)) if start is not None else None
+    end = np.datetime64(pd.Timestamp(end)) if end is not None else None
+    value_cols = [c for c in usecols if c != time_col]
+    times, blocks = [], []
+    for t, values in iter_chunks(path, value_cols, time_col, chunksize):
+        keep = ~np.isnat(t)
+        if start is not None:
+            keep &= t >= start
+        if end is not None:
+            keep &= t <= end
+        times.append(t[keep])
+        blocks.append(values[keep])
+    t = np.concatenate(times) if times else np.array([], dtype='datetime64[ns]')
+    values = np.concatenate(blocks) if blocks else np.empty((0, len(value_cols)), dtype=np.float32)
+    df = pd.DataFrame(values, columns=value_cols)
+    df.insert(0, 'time', t)
+    return df
+
+
+def store_path_for(csv_path, store_dir=None) -> Path:
+    """Store directory for a CSV: its path under the data dir, flattened."""
+    csv_path = Path(csv_path).resolve()
+    store_dir = Path(store_dir or SETTINGS.column_store_dir)
+    try:
+        rel = csv_path.relative_to(Path(SETTINGS.data_dir).resolve())
+        key = '__'.join(rel.with_suffix('').parts)
+    except ValueError:
+        key = csv_path.stem
+    return store_dir / key
+
+
+def _source_stamp(csv_path: Path) -> dict:
+    st = csv_path.stat()
+    return {'source_size': st.st_size, 'source_mtime_ns': st.st_mtime_ns}
+
+
+def _read_meta(store: Path) -> dict | None:
+    try:
+        with open(store / 'meta.json', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def store_is_fresh(csv_path, store: Path) -> bool:
+    meta = _read_meta(store)
+    if not meta or meta.get('format') != STORE_FORMAT:
+        return False
+    try:
+        stamp = _source_stamp(Path(csv_path))
+    except OSError:
+        return False
+    return all(meta.get(k) == v for k, v in stamp.items())
+
+
+def build_store(csv_path, store: Path, chunksize: int = CHUNK_ROWS) -> dict:
+    """Transpose a wide CSV into ``store`` (time.npy, values.npy, meta.json).
+
+    Streams in two passes (time column, then float32 chunks) so the CSV never
+    has to be resident as float64. The store is written to a temp dir and
+    swapped in with a rename, so concurrent workers never see a partial one.
+    """
+    csv_path = Path(csv_path)
+    columns = read_header(csv_path)
+    time_col = find_time_column(columns)
+    if time_col is None:
+        raise ValueError(f'no time column in {csv_path}')
+    value_cols = [c for c in columns if c != time_col]
+    stamp = _source_stamp(csv_path)
+
+    times = np.concatenate([_to_naive(c[time_col]) for c in
+                            pd.read_csv(csv_path, usecols=[time_col], chunksize=chunksize * 8)] or
+                           [np.array([], dtype='datetime64[ns]')])
+    store.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=store.name + '.', suffix='.tmp', dir=str(store.parent)))
+    os.chmod(tmp, 0o755)  # mkdtemp is owner-only; workers may run as another user
+    try:
+        np.save(tmp / 'time.npy', times)
+        values = np.lib.format.open_memmap(tmp / 'values.npy', mode='w+', dtype=np.float32,
+                                           shape=(len(value_cols), len(times)))
+        row = 0
+        for _, block in iter_chunks(csv_path, value_cols, time_col, chunksize):
+            values[:, row:row + len(block)] = block.T
+            row += len(block)
+        values.flush()
+        del values
+        meta = {'format': STORE_FORMAT, 'time_col': time_col, 'columns': value_cols,
+                'rows': int(len(times)), **stamp}
+        with open(tmp / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        if store.exists():
+            shutil.rmtree(store, ignore_errors=True)
+        try:
+            os.replace(tmp, store)
+        except OSError:
+            # Another worker swapped its copy in first
+            if not store_is_fresh(csv_path, store):
+                raise
+            shutil.rmtree(tmp, ignore_errors=True)
+        return meta
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+class LazyColumnFrame:
+    """Read-only view of a wide time x asset CSV that loads columns on demand.
+
+    ``columns`` is ``['time', *assets]`` like the DataFrame it replaces;
+    ``frame(cols)`` returns a real DataFrame with just those columns (float32)
+    for the configured time window.
+    """
+
+    def __init__(self, csv_path, start=None, end=None, store_dir=None, build: bool = True):
+        self.path = Path(csv_path)
+        self.start = pd.Timestamp(start) if start is not None else None
+        self.end = pd.Timestamp(end) if end is not None else None
+        self._values = None
+        store = store_path_for(self.path, store_dir)
+        if not store_is_fresh(self.path, store) and build:
+            try:
+                build_store(self.path, store)
+            except OSError:
+                pass  # read-only data dir: fall back to chunked CSV reads
+        if store_is_fresh(self.path, store):
+            meta = _read_meta(store)
+            self._time_col = meta['time_col']
+            self._assets = list(meta['columns'])
+            all_times = np.load(store / 'time.npy')
+            self._values = np.load(store / 'values.npy', mmap_mode='r')
+            self.store = store
+        else:
+            columns = read_header(self.path)
+            self._time_col = find_time_column(columns)
+            if self._time_col is None:
+                raise ValueError(f'no time column in {self.path}')
+            self._assets = [c for c in columns if c != self._time_col]
+            all_times = np.concatenate([_to_naive(c[self._time_col]) for c in
+                                        pd.read_csv(self.path, usecols=[self._time_col],
+                                                    chunksize=CHUNK_ROWS * 8)])
+            self.store = None
+        keep = ~np.isnat(all_times)
+        if self.start is not None:
+            keep &= all_times >= np.datetime64(self.start)
+        if self.end is not None:
+            keep &= all_times <= np.datetime64(self.end)
+        self._rows = np.flatnonzero(keep)
+        self._time = all_times[self._rows]
+        self._positions = {c: i for i, c in enumerate(self._assets)}
+        self.columns = pd.Index(['time', *self._assets])
+
+    @property
+    def empty(self) -> bool:
+        return len(self._rows) == 0 or not self._assets
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def time(self) -> pd.Series:
+        return pd.Series(self._time, name='time')
+
+    def column(self, name: str) -> np.ndarray:
+        """float32 values of one asset for the time window (cached per process).
+
+        Columns read from the CSV are also shared with the other workers; the
+        memory-mapped store already is, through the page cache.
+        """
+        key = (str(self.path), name, self.start, self.end)
+        return _COLUMN_CACHE.get_or_set(key, lambda: self._load_column(name), shared=self._values is None)
+
+    def _load_column(self, name: str) -> np.ndarray:
+        with stage('load'):
+            if self._values is not None:
+                return np.asarray(self._values[self._positions[name]])[self._rows]
+            df = read_columns(self.path, [name], self._time_col, self.start, self.end)
+            return df[name].to_numpy(dtype=np.float32)
+
+    def frame(self, cols: Sequence[str]) -> pd.DataFrame:
+        """DataFrame with 'time' plus the known columns among ``cols``.
+
+        Values are widened back to float64 here (one column is small) so the
+        figures and captions see the same number types as before.
+        """
+        df = pd.DataFrame({'time': self._time})
+        for c in cols:
+            if c in self._positions:
+                df[c] = widen_float32(self.column(c))
+        return df
+
+    def take_rows(self, mask) -> pd.DataFrame:
+        """Every asset column, but only the rows where ``mask`` (aligned with ``time``) is true."""
+        mask = np.asarray(mask, dtype=bool)
+        wanted = self._time[mask]
+        if self._values is not None:
+            df = pd.DataFrame(np.asarray(self._values[:, self._rows[mask]]).T, columns=self._assets)
+            df.insert(0, 'time', wanted)
+            return df
+        if not len(wanted):
+            return pd.DataFrame(columns=['time', *self._assets])
+        df = read_columns(self.path, self._assets, self._time_col, wanted.min(), wanted.max())
+        return df[df['time'].isin(wanted)].reset_index(drop=True)
+
+
+__all__ = [
+    'TIME_COLUMN_NAMES',
+    'read_header',
+    'find_time_column',
+    'iter_chunks',
+    'read_columns',
+    'store_path_for',
+    'store_is_fresh',
+    'build_store',
+    'LazyColumnFrame',
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build column-addressable stores for wide allocation CSVs.')
+    parser.add_argument('paths', nargs='+', help='Wide CSV files (time column + one column per asset)')
+    parser.add_argument('--store-dir', default=None, help='Where stores go (default: ORFEUS_COLUMN_STORE_DIR)')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if the store is up to date')
+    args = parser.parse_args(argv)
+
+    counts = {}
+    for p in args.paths:
+        t0 = time.perf_counter()
+        record = {'path': p}
+        try:
+            store = store_path_for(p, args.store_dir)
+            record['store'] = str(store)
+            if not args.force and store_is_fresh(p, store):
+                record['action'] = 'fresh'
+            else:
+                meta = build_store(p, store)
+                record.update(action='built', rows=meta['rows'], columns=len(meta['columns']))
+        except Exception as e:
+            record.update(action='failed', error=f'{type(e).__name__}: {e}')
+        record['seconds'] = round(time.perf_counter() - t0, 3)
+        counts[record['action']] = counts.get(record['action'], 0) + 1
+        print(json.dumps(record), flush=True)
+    print(json.dumps({'summary': counts}), file=sys.stderr)
+    return 1 if counts.get('failed') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
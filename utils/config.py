@@ -4,6 +4,8 @@ import os
 from dataclasses import dataclass
 from pathlib import Path
 
+from utils.paths import resolve_case_insensitive
+
 
 @dataclass(frozen=True)
 class Settings:
@@ -19,7 +21,11 @@ class Settings:
     stub_mode: bool
     # Paths
     root_dir: Path
+    data_dir: Path
     pgscen_dir: Path
+    column_store_dir: Path
+    lmp_stats_path: Path
+    congestion_index_path: Path
 
 
 def _env_int(name: str, default: int) -> int:
@@ -43,27 +49,23 @@ def load_settings() -> Settings:
     port = _env_int("PORT", 8055)
     stub_mode = os.getenv("STUB_MODE", "0").strip() in ("1", "true", "True", "yes", "on")
 
-    pgscen_dir = Path(os.getenv("ORFEUS_PGSCEN_DIR", str(root_dir / "data" / "PGscen_Scenarios")))
+    # All local datasets live under data_dir; override to point at another copy (e.g. benchmark data)
+    data_dir = Path(os.getenv("ORFEUS_DATA_DIR", str(root_dir / "data")))
+    pgscen_dir = Path(os.getenv("ORFEUS_PGSCEN_DIR", str(data_dir / "PGscen_Scenarios")))
+    # Column-addressable copies of the wide allocation CSVs (see utils/column_store.py)
+    column_store_dir = Path(os.getenv("ORFEUS_COLUMN_STORE_DIR", str(data_dir / "column_store")))
+    # Multi-day LMP aggregates written by utils/lmp_stats.py
+    lmp_stats_path = Path(os.getenv("ORFEUS_LMP_STATS",
+                                    str(data_dir / "lmp_stats" / "t7k_v0.4.0-a2_rsvf-20.npz")))
+    # Congested line / extreme price hours, written by utils/congestion_index.py
+    congestion_index_path = Path(os.getenv("ORFEUS_CONGESTION_INDEX",
+                                           str(data_dir / "lmp_stats" / "t7k_v0.4.0-a2_rsvf-20_events.npz")))
 
     # Auto-enable stub mode if critical data is missing in the mounted /app/data directory
-    def _resolve_case_insensitive(p: Path) -> bool:
-        if p.exists():
-            return True
-        parent = p.parent
-        try:
-            target = p.name.lower()
-            for name in os.listdir(parent):
-                if name.lower() == target:
-                    return True
-        except Exception:
-            pass
-        return False
-
     if not stub_mode:
-        data_dir = root_dir / "data"
         critical = data_dir / "Vatic_Grids" / "Texas-7k" / "TX_Data" / "SourceData" / "bus.csv"
         try:
-            if not _resolve_case_insensitive(critical):
+            if resolve_case_insensitive(critical) is None:
                 stub_mode = True
         except Exception:
             # If any error occurs checking files, stay in non-stub unless explicitly set
@@ -78,7 +80,11 @@ def load_settings() -> Settings:
         port=port,
     stub_mode=stub_mode,
         root_dir=root_dir,
+        data_dir=data_dir,
         pgscen_dir=pgscen_dir,
+        column_store_dir=column_store_dir,
+        lmp_stats_path=lmp_stats_path,
+        congestion_index_path=congestion_index_path,
     )
 
 
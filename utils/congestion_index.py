@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""Inverted index of congested line hours and extreme bus prices.
+
+Answering "when was line X congested?" from the daily pickles means opening
+every day. This index keeps, for each line UID, the (date, hour, loading)
+of every hour at or above ``RATIO_THRESHOLD`` of its continuous rating, and
+for each bus ID the (date, hour, LMP) of every hour priced at or above
+``LMP_ABOVE`` or below ``LMP_BELOW``.
+
+Events are stored CSR-style: they are sorted by (element, day, hour), and an
+``offsets`` array per element type delimits each element's run. A lookup is
+a dict probe plus an array slice, and a date prefix (``'2018-03'``) narrows
+it with two bisects. The index is one compressed ``.npz`` at
+``ORFEUS_CONGESTION_INDEX`` (default
+``data/lmp_stats/t7k_v0.4.0-a2_rsvf-20_events.npz``). Re-running the build
+only reads days that are new or whose file changed; a day whose pickle was
+deleted is dropped:
+
+    python utils/congestion_index.py data/lmps_data_visualization/t7k_v0.4.0-a2_rsvf-20 --jobs 8
+    python utils/congestion_index.py --line 5701_1898_0 --prefix 2018-07
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Allow running as a script (python utils/congestion_index.py) as well as a module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.config import SETTINGS  # noqa: E402
+from utils.lmp_stats import (CONGESTION_THRESHOLD, date_of, load_grid, map_days, read_day,  # noqa: E402
+                             select_files)
+
+INDEX_FORMAT = 1
+RATIO_THRESHOLD = CONGESTION_THRESHOLD
+# $/MWh; bus hours priced at or above LMP_ABOVE or below LMP_BELOW are indexed
+LMP_ABOVE = 100.0
+LMP_BELOW = 0.0
+
+
+def day_events(path: Path, grid: dict, ratio_threshold: float = RATIO_THRESHOLD,
+               lmp_above: float = LMP_ABOVE, lmp_below: float = LMP_BELOW) -> dict:
+    """One day's congested line-hours and extreme bus-hours against ``grid``."""
+    day = read_day(path, grid)
+    hot = day['ratio'] >= ratio_threshold
+    lmp = day['lmp']
+    with np.errstate(invalid='ignore'):
+        bus_hour, bus = np.nonzero((lmp >= lmp_above) | (lmp < lmp_below))
+    return {
+        'line': day['line'][hot].astype(np.int32),
+        'line_hour': day['hour'][hot].astype(np.int8),
+        'line_value': day['ratio'][hot].astype(np.float32),
+        'bus': bus.astype(np.int32),
+        'bus_hour': bus_hour.astype(np.int8),
+        'bus_value': lmp[bus_hour, bus],
+        'record': {'line_events': int(hot.sum()), 'bus_events': int(len(bus))},
+    }
+
+
+def _csr(keys: np.ndarray, days: np.ndarray, hours: np.ndarray, values: np.ndarray, n_keys: int) -> dict:
+    """Events sorted by (key, day, hour) plus per-key offsets into them."""
+    order = np.lexsort((hours, days, keys))
+    offsets = np.zeros(n_keys + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n_keys), out=offsets[1:])
+    return {'offsets': offsets, 'day': days[order].astype(np.int32), 'hour': hours[order].astype(np.int8),
+            'value': values[order].astype(np.float32)}
+
+
+def _stamp(path: Path) -> list:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _read(path: Path) -> dict | None:
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            arrays = {k: npz[k] for k in npz.files}
+        arrays['meta'] = json.loads(str(arrays['meta']))
+        return arrays if arrays['meta'].get('format') == INDEX_FORMAT else None
+    except Exception:
+        return None
+
+
+def build_index(directory: Path, output: Path | None = None, bus_csv: Path | None = None,
+                branch_csv: Path | None = None, jobs: int | None = None, pattern: str = '*.p.gz',
+                start: str | None = None, end: str | None = None, ratio_threshold: float = RATIO_THRESHOLD,
+                lmp_above: float = LMP_ABOVE, lmp_below: float = LMP_BELOW, rebuild: bool = False,
+                out=sys.stdout) -> dict:
+    """Add the matching days of ``directory`` to the index at ``output`` (rebuilt if settings changed).
+
+    Only days that are new or whose file changed since the last build are
+    read; one JSON line per day read is written to ``out``, then a
+    ``{"summary": ...}`` line. Days that fail keep their previous events.
+    """
+    t0 = time.perf_counter()
+    directory = Path(directory)
+    grid_dir = Path(SETTINGS.data_dir) / 'Vatic_Grids' / 'Texas-7k' / 'TX_Data' / 'SourceData'
+    grid = load_grid(Path(bus_csv or grid_dir / 'bus.csv'), Path(branch_csv or grid_dir / 'branch.csv'))
+    output = Path(output or SETTINGS.congestion_index_path)
+    n_bus, n_line = len(grid['bus_name']), len(grid['line_uid'])
+    settings = {'ratio_threshold': ratio_threshold, 'lmp_above': lmp_above, 'lmp_below': lmp_below}
+
+    old = None if rebuild else _read(output)
+    if old is not None and (any(old['meta'].get(k) != v for k, v in settings.items())
+                            or not np.array_equal(old['line_uid'], grid['line_uid'])
+                            or not np.array_equal(old['bus_id'], grid['bus_id'])):
+        old = None
+    stamps = dict(old['meta']['stamps']) if old is not None else {}
+    old_days = old['days'] if old is not None else np.array([], dtype=str)
+
+    files = select_files(directory, pattern, start, end)
+    todo = [f for f in files if stamps.get(date_of(f)) != _stamp(f)]
+    on_disk = {date_of(f) for f in directory.glob(pattern)}
+    removed = [d for d in old_days.tolist() if d not in on_disk]
+
+    parts, failed = {}, []
+    for _, rec, part in map_days(todo, grid, max(1, jobs or os.cpu_count() or 1), day_events,
+                                 ratio_threshold, lmp_above, lmp_below):
+        out.write(json.dumps(rec) + '\n')
+        out.flush()
+        if part is None:
+            failed.append(rec['date'])
+        else:
+            parts[rec['date']] = part
+    for f in todo:
+        if date_of(f) in parts:
+            stamps[date_of(f)] = _stamp(f)
+    for d in removed:
+        stamps.pop(d, None)
+
+    summary = {'days_read': len(todo), 'failed': sorted(failed), 'removed': removed}
+    if parts or removed or old is None:
+        keep_old = np.array([d not in parts and d not in removed for d in old_days.tolist()], dtype=bool)
+        days = np.array(sorted(set(old_days[keep_old].tolist()) | set(parts)), dtype=str)
+        remap = np.searchsorted(days, old_days) if len(old_days) else np.array([], dtype=np.int64)
+        arrays = {'days': days, 'line_uid': grid['line_uid'], 'bus_id': grid['bus_id'], 'bus_name': grid['bus_name']}
+        for kind, n_keys in (('line', n_line), ('bus', n_bus)):
+            keys, day, hour, value = [], [], [], []
+            if old is not None:
+                mask = keep_old[old[f'{kind}_day']]
+                keys.append(np.repeat(np.arange(n_keys, dtype=np.int32), np.diff(old[f'{kind}_offsets']))[mask])
+                day.append(remap[old[f'{kind}_day'][mask]])
+                hour.append(old[f'{kind}_hour'][mask])
+                value.append(old[f'{kind}_value'][mask])
+            for date, part in parts.items():
+                keys.append(part[kind])
+                day.append(np.full(len(part[kind]), np.searchsorted(days, date), dtype=np.int64))
+                hour.append(part[f'{kind}_hour'])
+                value.append(part[f'{kind}_value'])
+            csr = _csr(np.concatenate(keys or [np.array([], np.int32)]).astype(np.intp),
+                       np.concatenate(day or [np.array([], np.int64)]),
+                       np.concatenate(hour or [np.array([], np.int8)]),
+                       np.concatenate(value or [np.array([], np.float32)]), n_keys)
+            arrays.update({f'{kind}_{k}': v for k, v in csr.items()})
+        meta = {'format': INDEX_FORMAT, **settings, 'stamps': stamps,
+                'start': str(days[0]) if len(days) else None, 'end': str(days[-1]) if len(days) else None}
+        arrays['meta'] = np.array(json.dumps(meta))
+        output.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix='.' + output.stem + '.', suffix='.tmp', dir=str(output.parent))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            os.chmod(tmp, 0o644)  # mkstemp is owner-only; workers may run as another user
+            os.replace(tmp, output)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        summary.update(written=True, days=len(days), line_events=int(len(arrays['line_day'])),
+                       bus_events=int(len(arrays['bus_day'])), bytes=output.stat().st_size)
+    else:
+        summary.update(written=False, days=len(old_days))
+    summary.update(output=str(output), elapsed_s=round(time.perf_counter() - t0, 3))
+    out.write(json.dumps({'summary': summary}) + '\n')
+    out.flush()
+    return summary
+
+
+class CongestionIndex:
+    """Read-only view of an index file: line UID / bus ID -> (date, hour, value) events."""
+
+    def __init__(self, arrays: dict):
+        self.meta = arrays['meta']
+        self.days = arrays['days']
+        self.line_uid = arrays['line_uid']
+        self.bus_id = arrays['bus_id']
+        self.bus_name = arrays['bus_name']
+        self._events = {kind: tuple(arrays[f'{kind}_{k}'] for k in ('offsets', 'day', 'hour', 'value'))
+                        for kind in ('line', 'bus')}
+        self._pos = {'line': {uid: i for i, uid in enumerate(self.line_uid.tolist())},
+                     'bus': {bus_id: i for i, bus_id in enumerate(self.bus_id.tolist())}}
+
+    def _key(self, kind: str, key):
+        return int(key) if kind == 'bus' else str(key)
+
+    def count(self, kind: str, key) -> int:
+        """Number of indexed hours of a line (``kind='line'``, UID) or bus (``'bus'``, Bus ID)."""
+        pos = self._pos[kind].get(self._key(kind, key))
+        if pos is None:
+            return 0
+        offsets = self._events[kind][0]
+        return int(offsets[pos + 1] - offsets[pos])
+
+    def events(self, kind: str, key, prefix: str | None = None, limit: int | None = None) -> list[tuple]:
+        """``(date, hour, value)`` in time order; ``prefix`` keeps dates starting with it.
+
+        ``value`` is the loading (|flow| / rating) for lines and the LMP for buses.
+        """
+        pos = self._pos[kind].get(self._key(kind, key))
+        if pos is None:
+            return []
+        offsets, day, hour, value = self._events[kind]
+        lo, hi = int(offsets[pos]), int(offsets[pos + 1])
+        if prefix:
+            first, last = np.searchsorted(self.days, [prefix, prefix + '\uffff'])
+            run = day[lo:hi]
+            lo, hi = lo + int(np.searchsorted(run, first)), lo + int(np.searchsorted(run, last))
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return list(zip(self.days[day[lo:hi]].tolist(), hour[lo:hi].tolist(), value[lo:hi].tolist()))
+
+    def busiest(self, kind: str, n: int | None = None) -> list[tuple]:
+        """``(key, count)`` of the elements with events, most events first."""
+        counts = np.diff(self._events[kind][0])
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0][:n]
+        keys = self.line_uid if kind == 'line' else self.bus_id
+        return list(zip(keys[order].tolist(), counts[order].tolist()))
+
+
+@functools.lru_cache(maxsize=2)
+def _load(path: str, mtime_ns: int, size: int) -> CongestionIndex | None:
+    arrays = _read(Path(path))
+    return CongestionIndex(arrays) if arrays is not None else None
+
+
+def load_index(path=None) -> CongestionIndex | None:
+    """The index at ``path`` (default ``ORFEUS_CONGESTION_INDEX``), read once per version of the file."""
+    path = Path(path or SETTINGS.congestion_index_path)
+    try:
+        st = path.stat()
+        return _load(str(path), st.st_mtime_ns, st.st_size)
+    except Exception:
+        return None
+
+
+__all__ = [
+    'RATIO_THRESHOLD',
+    'LMP_ABOVE',
+    'LMP_BELOW',
+    'day_events',
+    'build_index',
+    'CongestionIndex',
+    'load_index',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the index of congested line and extreme LMP hours.')
+    parser.add_argument('directory', nargs='?', help='Directory of daily .p.gz pickles to index')
+    parser.add_argument('--output', default=None, help='Index file (default: ORFEUS_CONGESTION_INDEX)')
+    parser.add_argument('--bus-csv', default=None, help='Path to bus.csv (default: grid in the data dir)')
+    parser.add_argument('--branch-csv', default=None, help='Path to branch.csv (default: grid in the data dir)')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--pattern', default='*.p.gz', help='File glob')
+    parser.add_argument('--start', default=None, help='First day to index (YYYY-MM-DD)')
+    parser.add_argument('--end', default=None, help='Last day to index (YYYY-MM-DD)')
+    parser.add_argument('--ratio-threshold', type=float, default=RATIO_THRESHOLD,
+                        help='Loading (|flow| / rating) indexed as congested')
+    parser.add_argument('--lmp-above', type=float, default=LMP_ABOVE, help='Index bus hours priced at or above this')
+    parser.add_argument('--lmp-below', type=float, default=LMP_BELOW, help='Index bus hours priced below this')
+    parser.add_argument('--rebuild', action='store_true', help='Re-read every day instead of only new ones')
+    parser.add_argument('--line', default=None, help='Query: print the events of this line UID')
+    parser.add_argument('--bus', type=int, default=None, help='Query: print the events of this Bus ID')
+    parser.add_argument('--prefix', default=None, help='Query: only dates starting with this (e.g. 2018-07)')
+    args = parser.parse_args()
+
+    if args.line is not None or args.bus is not None:
+        index = load_index(args.output)
+        if index is None:
+            print('ERROR: No index; build one first', file=sys.stderr)
+            return 2
+        kind, key = ('line', args.line) if args.line is not None else ('bus', args.bus)
+        for date, hour, value in index.events(kind, key, prefix=args.prefix):
+            print(json.dumps({'date': date, 'hour': hour, 'ratio' if kind == 'line' else 'lmp': round(value, 4)}))
+        return 0
+    if not args.directory or not Path(args.directory).is_dir():
+        print(f'ERROR: Not a directory: {args.directory}', file=sys.stderr)
+        return 2
+    try:
+        summary = build_index(Path(args.directory), output=args.output, bus_csv=args.bus_csv,
+                              branch_csv=args.branch_csv, jobs=args.jobs, pattern=args.pattern,
+                              start=args.start, end=args.end, ratio_threshold=args.ratio_threshold,
+                              lmp_above=args.lmp_above, lmp_below=args.lmp_below, rebuild=args.rebuild)
+    except (OSError, ValueError) as e:
+        print(f'ERROR: {e}', file=sys.stderr)
+        return 2
+    return 0 if not summary['failed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Bounded, de-duplicated background I/O for data loads.
+
+Dropbox downloads and large file reads run on a small dedicated thread pool
+instead of on the gunicorn request threads, at most ``FETCH_CONCURRENCY`` at
+a time. Requests for a key that is already being fetched join the in-flight
+future (single-flight), so ten users opening the same new day cause one
+download and one parse; the result is shared and must be treated as read-only.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable
+
+from utils.metrics import record_cache
+
+try:
+    FETCH_CONCURRENCY = int(os.getenv('FETCH_CONCURRENCY', '4'))
+except Exception:
+    FETCH_CONCURRENCY = 4
+try:
+    # Seconds a request thread waits for a fetch before giving up on it
+    FETCH_TIMEOUT = float(os.getenv('FETCH_TIMEOUT', '120'))
+except Exception:
+    FETCH_TIMEOUT = 120.0
+
+
+class FetchService:
+    """Thread pool with one in-flight future per key."""
+
+    def __init__(self, concurrency: int = FETCH_CONCURRENCY, name: str = 'fetch'):
+        self.concurrency = max(1, int(concurrency))
+        self.name = name
+        self._pool: ThreadPoolExecutor | None = None
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        # Created on first use so forked gunicorn workers each start their own threads
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.concurrency, thread_name_prefix=f'orfeus-{self.name}')
+        return self._pool
+
+    def submit(self, key: Hashable, loader: Callable[[], Any]) -> Future:
+        """Future for ``loader()``, shared with any caller already fetching ``key``."""
+        with self._lock:
+            future = self._inflight.get(key)
+            record_cache(f'{self.name}_inflight', future is not None)
+            if future is not None:
+                return future
+            future = self._executor().submit(loader)
+            self._inflight[key] = future
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return future
+
+    def _forget(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def fetch(self, key: Hashable, loader: Callable[[], Any], timeout: float | None = FETCH_TIMEOUT) -> Any:
+        """Run ``loader`` on the pool (once per in-flight ``key``) and wait for its result.
+
+        Exceptions raised by ``loader`` are re-raised in every waiting caller;
+        ``concurrent.futures.TimeoutError`` is raised after ``timeout`` seconds.
+        """
+        return self.submit(key, loader).result(timeout)
+
+    def inflight(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+
+FETCHER = FetchService()
+
+
+def fetch(key: Hashable, loader: Callable[[], Any], timeout: float | None = FETCH_TIMEOUT) -> Any:
+    """``FETCHER.fetch``: the shared service used by the page loaders."""
+    return FETCHER.fetch(key, loader, timeout)
+
+
+__all__ = [
+    'FETCH_CONCURRENCY',
+    'FETCH_TIMEOUT',
+    'FetchService',
+    'FETCHER',
+    'fetch',
+]
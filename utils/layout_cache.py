@@ -0,0 +1,173 @@
+"""Per-process caches for serialized page layouts and large dropdown option lists.
+
+Dash re-serializes a page's whole layout tree every time the router callback
+renders it, and ``/_dash-layout``/``/_dash-dependencies`` on every visit. The
+page layouts here are static, so each serialized response is captured once,
+keyed by page path and the embed flags, and replayed with an ETag. The GET
+endpoints also answer ``If-None-Match`` with 304.
+
+Long option lists (every date, every asset) are not embedded in the layout:
+``lazy_dropdown`` ships only the selected value and the browser fetches the
+full list from ``/_orfeus/options/<component id>`` (HTTP-cacheable) once the
+dropdown mounts (see assets/lazy-options.js).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Sequence
+from urllib.parse import parse_qs
+
+from utils.cache import LRUCache
+from utils.metrics import record_cache
+from utils.ui import dash, dcc, Input, Output
+
+OPTIONS_URL = '/_orfeus/options/'
+OPTIONS_MAX_AGE = 300
+_TRUTHY = ('1', 'true', 'yes', 'on')
+_STATIC_GETS = ('_dash-layout', '_dash-dependencies')
+
+_PAGE_CACHE = LRUCache(maxsize=64, name='page_layout')
+_STATIC_CACHE = LRUCache(maxsize=len(_STATIC_GETS))
+_OPTIONS: dict[str, tuple[bytes, str]] = {}
+_LAZY_IDS: set[str] = set()
+
+
+def _etag(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()[:20]
+
+
+def embed_flags(search: str | None) -> tuple[bool, bool]:
+    """(embed, showtitle) from a URL query string, as the page callbacks read them."""
+    try:
+        q = parse_qs((search or '').lstrip('?'))
+        embed = (q.get('embed', [''])[0] or '').strip().lower() in _TRUTHY
+        showtitle = (q.get('showtitle', ['true'])[0] or '').strip().lower() in _TRUTHY
+        return embed, showtitle
+    except Exception:
+        return False, True
+
+
+def register_options(component_id: str, options: Sequence[Any]) -> None:
+    """Serve ``options`` for ``component_id`` from ``/_orfeus/options/<component_id>``."""
+    body = json.dumps(list(options), separators=(',', ':')).encode('utf-8')
+    _OPTIONS[component_id] = (body, _etag(body))
+
+
+def lazy_dropdown(options: Sequence[Any], id: str, value: Any = None, **kwargs) -> dcc.Dropdown:
+    """A ``dcc.Dropdown`` whose full option list is fetched by the browser after it mounts.
+
+    The layout only carries the selected value, so the page JSON stays small;
+    the list itself is served (and browser-cached) by ``init_app``'s endpoint.
+    """
+    options = list(options)
+    register_options(id, options)
+    if id not in _LAZY_IDS:
+        _LAZY_IDS.add(id)
+        dash.clientside_callback(
+            dash.ClientsideFunction(namespace='orfeus', function_name='fetchOptions'),
+            Output(id, 'options'),
+            Input(id, 'id'),
+        )
+    return dcc.Dropdown([value] if value is not None else [], id=id, value=value, **kwargs)
+
+
+def init_app(app) -> None:
+    """Serve cached page layouts, ETagged Dash GET endpoints and lazy dropdown options."""
+    from flask import g, request
+
+    server = app.server
+    prefix = app.config.routes_pathname_prefix or '/'
+
+    def _page_paths() -> set:
+        return {p.get('path') for p in dash.page_registry.values()}
+
+    def _route_key():
+        """Cache key for a router-callback request, or None for anything else."""
+        if request.method != 'POST' or not request.path.endswith('/_dash-update-component'):
+            return None
+        body = request.get_json(silent=True) or {}
+        if '_pages_content.children' not in str(body.get('output', '')):
+            return None
+        props = {f"{i.get('id')}.{i.get('property')}": i.get('value') for i in body.get('inputs', [])}
+        path = '/' + (app.strip_relative_path(props.get('_pages_location.pathname') or '/') or '')
+        if path not in _page_paths():
+            return None
+        return (path, *embed_flags(props.get('_pages_location.search')))
+
+    def _static_key():
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        name = request.path[len(prefix):] if request.path.startswith(prefix) else None
+        if name not in _STATIC_GETS or (name == '_dash-layout' and callable(app.layout)):
+            return None
+        return name
+
+    def _not_modified(etag: str) -> bool:
+        # Compression rewrites ETags to "<etag>:<encoding>" (see utils.response_cache)
+        tags = request.if_none_match.as_set(include_weak=True)
+        return request.method in ('GET', 'HEAD') and any(t.split(':', 1)[0] == etag for t in tags)
+
+    def _cached_response(body: bytes, etag: str, cache_control: str):
+        if _not_modified(etag):
+            resp = server.response_class(status=304)
+        else:
+            resp = server.response_class(body, mimetype='application/json')
+        resp.set_etag(etag)
+        resp.headers['Cache-Control'] = cache_control
+        return resp
+
+    @server.before_request
+    def _layout_cache_lookup():
+        try:
+            key = _route_key()
+            if key is not None:
+                g.orfeus_layout_key = key
+                hit = _PAGE_CACHE.get(key)
+                record_cache('page_layout', hit is not None)
+                if hit is not None:
+                    return _cached_response(*hit, 'no-cache')
+                return None
+            key = _static_key()
+            if key is not None:
+                g.orfeus_static_key = key
+                hit = _STATIC_CACHE.get(key)
+                if hit is not None:
+                    return _cached_response(*hit, 'no-cache')
+        except Exception:
+            pass
+        return None
+
+    @server.after_request
+    def _layout_cache_store(response):
+        try:
+            for attr, cache in (('orfeus_layout_key', _PAGE_CACHE), ('orfeus_static_key', _STATIC_CACHE)):
+                key = g.pop(attr, None)
+                if key is None or key in cache:
+                    continue
+                if response.status_code != 200 or response.direct_passthrough:
+                    continue
+                body = response.get_data()
+                etag = _etag(body)
+                cache.set(key, (body, etag))
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'no-cache'
+        except Exception:
+            pass
+        return response
+
+    @server.get(prefix.rstrip('/') + OPTIONS_URL + '<path:component_id>')
+    def _dropdown_options(component_id):
+        entry = _OPTIONS.get(component_id)
+        if entry is None:
+            return server.response_class('[]', status=404, mimetype='application/json')
+        return _cached_response(*entry, f'public, max-age={OPTIONS_MAX_AGE}')
+
+
+__all__ = [
+    'OPTIONS_URL',
+    'embed_flags',
+    'register_options',
+    'lazy_dropdown',
+    'init_app',
+]
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""Export LMP playback over a date range: one hourly map per frame.
+
+Frames are the LMP page's own hourly maps (``plot_particular_hour``), drawn
+in a process pool. Work is split by day, and a day is only cut into hour
+chunks when there are fewer days than workers. Each worker loads and
+grid-joins a day once through the page's day cache and then draws all of that
+day's requested hours from it. Results come back in date/hour order and are
+streamed to the output as they arrive:
+
+* ``--format html`` writes one self-contained page. Each frame is appended as
+  its own ``<script>`` as it is drawn, then a Plotly animation with a slider
+  and play/pause buttons is built over the frames.
+* ``--format json`` writes one complete figure JSON per frame into a
+  directory, named ``lmp_<date>_h<hour>.json``. Each file is ready for
+  ``plotly.io.read_json(path).write_image(...)``.
+
+One JSON line is printed per day (or hour chunk), followed by a
+``{"summary": ...}`` line. Full-detail frames carry every bus (about 570 KB
+each on Texas-7k). For long ranges, thin the hours (``--hours 0-23:3``) or
+pass the page's default view (``--view 31,-99.9,4.5``). Below
+``LMP_CLUSTER_ZOOM`` that view groups ordinary buses into hexagons.
+
+Usage:
+    python utils/lmp_animation.py --start 2018-07-01 --end 2018-07-07 --hours 0-23:3 --output week.html
+    python utils/lmp_animation.py --start 2018-07-01 --end 2018-07-01 --format json --output frames/ --jobs 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+# Allow running as a script (python utils/lmp_animation.py) as well as a module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils import spatial  # noqa: E402
+
+HOURS = 24
+FORMATS = ('html', 'json')
+# Results waiting to be written, per worker; bounds memory on long ranges
+QUEUE_PER_WORKER = 2
+_EMPTY_TRACE = {'type': 'scattermapbox', 'lat': [], 'lon': [], 'showlegend': False, 'hoverinfo': 'skip'}
+
+_LMPS = None
+
+
+def parse_hours(spec: str) -> list[int]:
+    """Hours from ``'0-23'``, ``'0,6,12,18'`` or ``'0-23:3'`` (range with a step)."""
+    hours: list[int] = []
+    for part in str(spec).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        rng, _, step = part.partition(':')
+        lo, _, hi = rng.partition('-')
+        lo_i = int(lo)
+        hi_i = int(hi) if hi else lo_i
+        for h in range(lo_i, hi_i + 1, int(step) if step else 1):
+            if not 0 <= h < HOURS:
+                raise ValueError(f'Hour out of range: {h}')
+            if h not in hours:
+                hours.append(h)
+    if not hours:
+        raise ValueError(f'No hours in {spec!r}')
+    return sorted(hours)
+
+
+def parse_view(spec: str | None) -> dict | None:
+    """``'LAT,LON,ZOOM'`` as a ``utils.spatial.viewport``; None draws every bus."""
+    if not spec:
+        return None
+    lat, lon, zoom = (float(v) for v in spec.split(','))
+    return spatial.viewport({'mapbox.center': {'lat': lat, 'lon': lon}, 'mapbox.zoom': zoom})
+
+
+def plan_tasks(dates: list[str], hours: list[int], jobs: int) -> list[tuple[str, tuple[int, ...]]]:
+    """``(date, hours)`` work items in output order; days are split only to keep every worker busy."""
+    pieces = max(1, min(len(hours), math.ceil(jobs / max(1, len(dates)))))
+    size = math.ceil(len(hours) / pieces)
+    return [(d, tuple(hours[i:i + size])) for d in dates for i in range(0, len(hours), size)]
+
+
+def frame_name(date: str, hr: int) -> str:
+    return f'{date} {hr:02d}:00'
+
+
+def _init_worker() -> None:
+    global _LMPS
+    if _LMPS is not None:
+        return
+    # Pages register against the app; the worker needs them but not the warm-up thread
+    os.environ.setdefault('WARMUP', '0')
+    import app  # noqa: F401
+    from pages.data_visualization import lmps
+    _LMPS = lmps
+
+
+def _to_json(obj) -> str:
+    from plotly.utils import PlotlyJSONEncoder
+    return json.dumps(obj, cls=PlotlyJSONEncoder)
+
+
+def _render_in_worker(date: str, hours: tuple[int, ...], view: dict | None, fmt: str,
+                      out_dir: str | None) -> tuple[dict, list[str]]:
+    """Draw ``hours`` of ``date``; html frames come back as JSON text, json frames go straight to disk."""
+    t0 = time.perf_counter()
+    rec = {'date': date, 'hours': list(hours)}
+    frames: list[str] = []
+    try:
+        bus_detail, line_detail = _LMPS.load_lmp_day(date)
+        rec['load_s'] = round(time.perf_counter() - t0, 3)
+        if bus_detail.attrs.get('lmp_stub', False):
+            raise FileNotFoundError(f'No LMP data for {date}')
+        written = 0
+        for hr in hours:
+            fig, _ = _LMPS.plot_particular_hour(hr, bus_detail, line_detail, view=view)
+            if fmt == 'json':
+                path = Path(out_dir) / f'lmp_{date}_h{hr:02d}.json'
+                tmp = path.with_name('.' + path.name + '.tmp')
+                tmp.write_text(fig.to_json(), encoding='utf-8')
+                os.replace(tmp, path)
+                written += path.stat().st_size
+            else:
+                fig_dict = fig.to_plotly_json()
+                layout = fig_dict.get('layout', {})
+                layout.pop('template', None)
+                frames.append(_to_json({'name': frame_name(date, hr), 'data': fig_dict.get('data', []),
+                                        'layout': layout}))
+                written += len(frames[-1])
+        rec.update(ok=True, frames=len(hours), bytes=written)
+    except Exception as e:
+        frames = []
+        rec.update(ok=False, error=f'{type(e).__name__}: {e}')
+    rec['seconds'] = round(time.perf_counter() - t0, 3)
+    return rec, frames
+
+
+def map_tasks(tasks: list[tuple[str, tuple[int, ...]]], jobs: int, view: dict | None, fmt: str,
+              out_dir: str | None):
+    """Yield ``(record, frames)`` per task, in task order, from at most ``jobs`` worker processes."""
+    if jobs == 1 or len(tasks) <= 1:
+        _init_worker()
+        for date, hours in tasks:
+            yield _render_in_worker(date, hours, view, fmt, out_dir)
+        return
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks)), initializer=_init_worker) as pool:
+        todo = iter(tasks)
+        pending = deque(pool.submit(_render_in_worker, d, h, view, fmt, out_dir)
+                        for d, h in (next(todo) for _ in range(min(len(tasks), jobs * QUEUE_PER_WORKER))))
+        while pending:
+            result = pending.popleft().result()
+            nxt = next(todo, None)
+            if nxt is not None:
+                pending.append(pool.submit(_render_in_worker, nxt[0], nxt[1], view, fmt, out_dir))
+            yield result
+
+
+def _plotlyjs_tag(mode: str) -> str:
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+    if mode == 'inline':
+        return '<script type="text/javascript">' + get_plotlyjs() + '</script>'
+    return f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js" charset="utf-8"></script>'
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{plotlyjs}
+</head>
+<body>
+<div id="lmp-animation" style="width:100%;height:92vh" role="img" aria-label="{title}"></div>
+<script>var frames = [];</script>
+"""
+
+# Frames differ in their traces: bus groups come and go with the hour and every
+# congested line is its own trace. Give each bus group a fixed slot (by name),
+# then the line slots, and pad with empty traces so an animation step always
+# updates like with like.
+_HTML_PLAYER = """<script>
+(function(){
+  var template = %s;
+  var el = document.getElementById('lmp-animation');
+  if(!frames.length){ el.textContent = 'No frames were rendered.'; return; }
+  function empty(){ return %s; }
+  var names = [], nLines = 0;
+  frames.forEach(function(f){
+    var k = 0;
+    f.data.forEach(function(t){
+      if(t.mode === 'lines'){ k++; } else if(names.indexOf(t.name) < 0){ names.push(t.name); }
+    });
+    nLines = Math.max(nLines, k);
+  });
+  frames.forEach(function(f){
+    var byName = {}, lines = [];
+    f.data.forEach(function(t){ if(t.mode === 'lines'){ lines.push(t); } else { byName[t.name] = t; } });
+    var data = names.map(function(n){ return byName[n] || empty(); });
+    for(var i = 0; i < nLines; i++){ data.push(lines[i] || empty()); }
+    f.data = data;
+  });
+  var layout = JSON.parse(JSON.stringify(frames[0].layout));
+  var first = JSON.parse(JSON.stringify(frames[0].data));
+  // Frames keep the user's pan and zoom
+  frames.forEach(function(f){ delete f.layout.mapbox; });
+  var step = {mode: 'immediate', frame: {duration: 0, redraw: true}, transition: {duration: 0}};
+  layout.template = template;
+  layout.sliders = [{active: 0, currentvalue: {prefix: 'Hour: '}, pad: {t: 30},
+    steps: frames.map(function(f){ return {label: f.name, method: 'animate', args: [[f.name], step]}; })}];
+  layout.updatemenus = [{type: 'buttons', showactive: false, x: 0, y: 0, xanchor: 'right', yanchor: 'top',
+    pad: {t: 30, r: 10}, buttons: [
+      {label: 'Play', method: 'animate',
+       args: [null, {mode: 'immediate', fromcurrent: true, frame: {duration: %d, redraw: true}, transition: {duration: 0}}]},
+      {label: 'Pause', method: 'animate', args: [[null], step]}]}];
+  Plotly.newPlot(el, first, layout, {responsive: true}).then(function(){ return Plotly.addFrames(el, frames); });
+})();
+</script>
+</body>
+</html>
+"""
+
+
+def _script_safe(text: str) -> str:
+    """JSON text that cannot close the surrounding ``<script>`` element."""
+    return text.replace('</', '<\\/')
+
+
+def export(start: str, end: str, hours: list[int], output: Path, fmt: str = 'html', jobs: int | None = None,
+           view: dict | None = None, plotlyjs: str = 'cdn', frame_ms: int = 500, out=sys.stdout) -> dict:
+    """Render every requested hour from ``start`` to ``end`` and write them to ``output``.
+
+    ``output`` is an HTML file (``fmt='html'``) or a directory (``fmt='json'``).
+    Days that fail to load are reported and skipped. The HTML file is written
+    to a temporary name and renamed when complete.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown format: {fmt}')
+    t0 = time.perf_counter()
+    dates = [str(d)[:10] for d in pd.date_range(start=start, end=end)]
+    if not dates:
+        raise ValueError(f'Empty date range: {start} to {end}')
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    tasks = plan_tasks(dates, hours, jobs)
+    output = Path(output)
+    failed: list[str] = []
+    n_frames = 0
+
+    if fmt == 'json':
+        output.mkdir(parents=True, exist_ok=True)
+        for rec, _ in map_tasks(tasks, jobs, view, fmt, str(output)):
+            out.write(json.dumps(rec) + '\n')
+            out.flush()
+            if rec['ok']:
+                n_frames += rec['frames']
+            elif rec['date'] not in failed:
+                failed.append(rec['date'])
+        size = sum(p.stat().st_size for p in output.glob('lmp_*_h*.json'))
+    else:
+        import plotly.io as pio
+        output.parent.mkdir(parents=True, exist_ok=True)
+        title = f'LMPs {dates[0]} to {dates[-1]} under Texas 7k Grid'
+        template = pio.templates[pio.templates.default].to_plotly_json() if pio.templates.default else {}
+        tmp = output.with_name('.' + output.name + '.tmp')
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(_HTML_HEAD.format(title=title, plotlyjs=_plotlyjs_tag(plotlyjs)))
+                for rec, frames in map_tasks(tasks, jobs, view, fmt, None):
+                    out.write(json.dumps(rec) + '\n')
+                    out.flush()
+                    if not rec['ok']:
+                        if rec['date'] not in failed:
+                            failed.append(rec['date'])
+                        continue
+                    for frame in frames:
+                        f.write('<script>frames.push(' + _script_safe(frame) + ');</script>\n')
+                    n_frames += len(frames)
+                f.write(_HTML_PLAYER % (_script_safe(_to_json(template)), json.dumps(_EMPTY_TRACE), frame_ms))
+            os.replace(tmp, output)
+        finally:
+            tmp.unlink(missing_ok=True)
+        size = output.stat().st_size
+
+    summary = {'start': dates[0], 'end': dates[-1], 'days': len(dates) - len(failed), 'failed': failed,
+               'hours': hours, 'frames': n_frames, 'format': fmt, 'jobs': jobs, 'output': str(output),
+               'bytes': size, 'elapsed_s': round(time.perf_counter() - t0, 3)}
+    out.write(json.dumps({'summary': summary}) + '\n')
+    out.flush()
+    return summary
+
+
+__all__ = [
+    'parse_hours',
+    'parse_view',
+    'plan_tasks',
+    'map_tasks',
+    'export',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export hourly LMP maps over a date range as an animation.')
+    parser.add_argument('--start', required=True, help='First day (YYYY-MM-DD)')
+    parser.add_argument('--end', default=None, help='Last day (YYYY-MM-DD; default: --start)')
+    parser.add_argument('--hours', default='0-23', help="Hours per day, e.g. '0-23', '0,12' or '0-23:3'")
+    parser.add_argument('--format', choices=FORMATS, default='html',
+                        help='html: one animated page; json: one figure file per frame')
+    parser.add_argument('--output', required=True, help='HTML file (html) or directory (json)')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--view', default=None,
+                        help="Map view 'LAT,LON,ZOOM': draw only buses in view (hexbins below LMP_CLUSTER_ZOOM)")
+    parser.add_argument('--plotlyjs', choices=('cdn', 'inline'), default='cdn',
+                        help='Load plotly.js from the CDN or embed it (offline viewing)')
+    parser.add_argument('--frame-ms', type=int, default=500, help='Playback delay per frame, in milliseconds')
+    args = parser.parse_args()
+
+    try:
+        hours = parse_hours(args.hours)
+        view = parse_view(args.view)
+        summary = export(args.start, args.end or args.start, hours, Path(args.output), fmt=args.format,
+                         jobs=args.jobs, view=view, plotlyjs=args.plotlyjs, frame_ms=args.frame_ms)
+    except (OSError, ValueError) as e:
+        print(f'ERROR: {e}', file=sys.stderr)
+        return 2
+    return 0 if summary['frames'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""Multi-day LMP statistics: per-bus price duration and per-line congestion.
+
+The LMP page maps one hour of one day. This module streams every daily
+pickle through a process pool and reduces the whole period to one row per
+bus and one row per line:
+
+* buses: hours with a price, mean/min/max LMP, the 5th to 95th percentiles
+  (the price duration curve) and the number of negative-price hours;
+* lines: hours observed, hours at or above ``CONGESTION_THRESHOLD`` of the
+  continuous rating, the peak loading, and the mean/max price spread
+  ``|LMP(from) - LMP(to)|`` across the line.
+
+Workers send each day back as a 24 x bus float32 matrix. The parent writes it
+into a temporary bus-major memory map, so percentiles are exact while only a
+block of buses is resident at a time. The result is a single ``.npz`` of
+float32/int32 columns at ``ORFEUS_LMP_STATS`` (default
+``data/lmp_stats/t7k_v0.4.0-a2_rsvf-20.npz``), which the LMP page reads for
+its multi-day map. Rebuild it after adding days:
+
+    python utils/lmp_stats.py data/lmps_data_visualization/t7k_v0.4.0-a2_rsvf-20 --jobs 8
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Allow running as a script (python utils/lmp_stats.py) as well as a module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.config import SETTINGS  # noqa: E402
+from utils.pickle_io import load_pickle_file  # noqa: E402
+from utils.validate_lmp_pickle import _extract_bus_line  # noqa: E402
+
+STATS_FORMAT = 1
+HOURS = 24
+CONGESTION_THRESHOLD = 0.98
+PERCENTILES = (5, 25, 50, 75, 95)
+# Buses reduced at a time when computing percentiles from the memory map
+BLOCK_BUSES = 512
+
+# Map modes offered by the LMP page: column -> (label, 'bus' | 'line')
+METRICS = {
+    'lmp_mean': ('Mean LMP', 'bus'),
+    'lmp_p50': ('Median LMP', 'bus'),
+    'lmp_p95': ('95th percentile LMP', 'bus'),
+    'lmp_p05': ('5th percentile LMP', 'bus'),
+    'negative_hours': ('Negative-price hours', 'bus'),
+    'congested_hours': ('Hours at >=98% of line rating', 'line'),
+    'spread_mean': ('Mean price spread across line', 'line'),
+    'spread_max': ('Max price spread across line', 'line'),
+}
+
+
+def load_grid(bus_csv: Path, branch_csv: Path) -> dict:
+    """Bus and branch columns the reduction needs, as plain arrays (cheap to ship to workers)."""
+    bus = pd.read_csv(bus_csv, usecols=['Bus ID', 'Bus Name', 'lat', 'lng'])
+    bus = bus.drop_duplicates('Bus Name').drop_duplicates('Bus ID')
+    branch = pd.read_csv(branch_csv, usecols=['UID', 'From Bus', 'To Bus', 'Cont Rating'])
+    branch = branch.drop_duplicates('UID')
+    position = pd.Series(np.arange(len(bus), dtype=np.int32), index=bus['Bus ID'].to_numpy())
+    rating = pd.to_numeric(branch['Cont Rating'], errors='coerce').to_numpy(dtype=np.float64)
+    return {
+        'bus_id': bus['Bus ID'].to_numpy(dtype=np.int64),
+        'bus_name': bus['Bus Name'].astype(str).to_numpy(dtype=str),
+        'lat': pd.to_numeric(bus['lat'], errors='coerce').to_numpy(dtype=np.float32),
+        'lng': pd.to_numeric(bus['lng'], errors='coerce').to_numpy(dtype=np.float32),
+        'line_uid': branch['UID'].astype(str).to_numpy(dtype=str),
+        'line_from': branch['From Bus'].map(position).fillna(-1).to_numpy(dtype=np.int32),
+        'line_to': branch['To Bus'].map(position).fillna(-1).to_numpy(dtype=np.int32),
+        'rating': np.where(rating > 0, rating, np.nan),
+    }
+
+
+def _hours(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """(hour as int, mask of rows with an hour in 0..23)."""
+    h = pd.to_numeric(df['Hour'], errors='coerce').to_numpy(dtype=np.float64)
+    ok = (h >= 0) & (h < HOURS)
+    return np.where(ok, h, 0).astype(np.intp), ok
+
+
+def read_day(path: Path, grid: dict) -> dict:
+    """One day's pickle mapped onto ``grid``.
+
+    ``lmp`` is a 24 x bus float32 matrix (NaN where a bus has no price);
+    ``line``/``hour``/``ratio`` hold one entry per line-hour with a known line,
+    where ``ratio`` is |flow| over the continuous rating.
+    """
+    bus_detail, line_detail = _extract_bus_line(load_pickle_file(path))
+    if not isinstance(bus_detail, pd.DataFrame) or not isinstance(line_detail, pd.DataFrame):
+        raise ValueError('pickle missing bus/line DataFrames')
+    bus_detail = bus_detail.reset_index()
+    line_detail = line_detail.reset_index()
+
+    lmp = np.full((HOURS, len(grid['bus_name'])), np.nan, dtype=np.float32)
+    b = grid['_bus_index'].get_indexer(bus_detail['Bus'].astype(str))
+    h, ok = _hours(bus_detail)
+    ok &= b >= 0
+    lmp[h[ok], b[ok]] = pd.to_numeric(bus_detail['LMP'], errors='coerce').to_numpy(dtype=np.float32)[ok]
+
+    line = grid['_line_index'].get_indexer(line_detail['Line'].astype(str))
+    lh, ok = _hours(line_detail)
+    ok &= line >= 0
+    line, lh = line[ok], lh[ok]
+    flow = np.abs(pd.to_numeric(line_detail['Flow'], errors='coerce').to_numpy(dtype=np.float64)[ok])
+    return {'lmp': lmp, 'line': line, 'hour': lh, 'ratio': flow / grid['rating'][line]}
+
+
+def day_partials(path: Path, grid: dict, threshold: float = CONGESTION_THRESHOLD) -> dict:
+    """One day reduced against ``grid``: its LMP matrix and per-line additive partials."""
+    day = read_day(path, grid)
+    lmp, line, lh, ratio = day['lmp'], day['line'], day['hour'], day['ratio']
+    n_line = len(grid['line_uid'])
+    ratio_max = np.full(n_line, np.nan)
+    np.fmax.at(ratio_max, line, ratio)
+
+    f, t = grid['line_from'][line], grid['line_to'][line]
+    spread = np.full(len(line), np.nan)
+    both = (f >= 0) & (t >= 0)
+    spread[both] = np.abs(lmp[lh[both], f[both]].astype(np.float64) - lmp[lh[both], t[both]])
+    priced = np.isfinite(spread)
+    spread_max = np.full(n_line, np.nan)
+    np.fmax.at(spread_max, line[priced], spread[priced])
+    line_hours = np.bincount(line, minlength=n_line)
+    return {
+        'lmp': lmp,
+        'line_hours': line_hours,
+        'congested_hours': np.bincount(line[ratio >= threshold], minlength=n_line),
+        'ratio_max': ratio_max,
+        'spread_hours': np.bincount(line[priced], minlength=n_line),
+        'spread_sum': np.bincount(line[priced], weights=spread[priced], minlength=n_line),
+        'spread_max': spread_max,
+        'record': {'buses': int(np.isfinite(lmp).any(axis=0).sum()), 'lines': int((line_hours > 0).sum())},
+    }
+
+
+_GRID = None
+
+
+def _init_worker(grid: dict) -> None:
+    global _GRID
+    _GRID = dict(grid, _bus_index=pd.Index(grid['bus_name']), _line_index=pd.Index(grid['line_uid']))
+
+
+def _day_in_worker(index: int, path_str: str, reduce, args: tuple) -> tuple[int, dict, dict | None]:
+    t0 = time.perf_counter()
+    path = Path(path_str)
+    rec = {'file': path.name, 'date': date_of(path)}
+    try:
+        part = reduce(path, _GRID, *args)
+        rec.update(ok=True, **part.pop('record', {}))
+    except Exception as e:
+        part = None
+        rec.update(ok=False, error=f'{type(e).__name__}: {e}')
+    rec['seconds'] = round(time.perf_counter() - t0, 3)
+    return index, rec, part
+
+
+def date_of(path: Path) -> str:
+    """The YYYY-MM-DD day a pickle file holds, from its name."""
+    return Path(path).name.split('.')[0]
+
+
+def select_files(directory: Path, pattern: str = '*.p.gz', start: str | None = None,
+                 end: str | None = None) -> list[Path]:
+    """Day files in ``directory`` whose YYYY-MM-DD name falls within [start, end]."""
+    files = sorted(Path(directory).glob(pattern))
+    return [f for f in files if (not start or date_of(f) >= start) and (not end or date_of(f) <= end)]
+
+
+def map_days(files: list[Path], grid: dict, jobs: int, reduce=day_partials, *args):
+    """Yield ``(index, record, result)`` of ``reduce(path, grid, *args)`` per file, in completion order.
+
+    ``reduce`` must be a module-level function so it can be sent to the worker
+    processes; the grid is sent once per worker. ``result`` is None (and the
+    record says why) for a day that failed.
+    """
+    if jobs == 1 or len(files) <= 1:
+        _init_worker(grid)
+        for i, f in enumerate(files):
+            yield _day_in_worker(i, str(f), reduce, args)
+        return
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files)), initializer=_init_worker,
+                             initargs=(grid,)) as pool:
+        futures = [pool.submit(_day_in_worker, i, str(f), reduce, args) for i, f in enumerate(files)]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+
+def _reduce_buses(hourly: np.ndarray) -> dict:
+    """Per-bus statistics of a (bus, hour) matrix, a block of rows at a time."""
+    n_bus = hourly.shape[0]
+    cols = {k: np.full(n_bus, np.nan, dtype=np.float32) for k in
+            ('lmp_mean', 'lmp_min', 'lmp_max', *(f'lmp_p{p:02d}' for p in PERCENTILES))}
+    hours = np.zeros(n_bus, dtype=np.int32)
+    negative = np.zeros(n_bus, dtype=np.int32)
+    with warnings.catch_warnings():
+        # All-NaN rows (buses never priced) are expected and stay NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for lo in range(0, n_bus, BLOCK_BUSES):
+            block = np.asarray(hourly[lo:lo + BLOCK_BUSES], dtype=np.float64)
+            hi = lo + len(block)
+            hours[lo:hi] = np.isfinite(block).sum(axis=1)
+            negative[lo:hi] = (block < 0).sum(axis=1)
+            cols['lmp_mean'][lo:hi] = np.nanmean(block, axis=1)
+            cols['lmp_min'][lo:hi] = np.nanmin(block, axis=1)
+            cols['lmp_max'][lo:hi] = np.nanmax(block, axis=1)
+            for p, values in zip(PERCENTILES, np.nanpercentile(block, PERCENTILES, axis=1)):
+                cols[f'lmp_p{p:02d}'][lo:hi] = values
+    return {'hours': hours, 'negative_hours': negative, **cols}
+
+
+def build_stats(directory: Path, output: Path | None = None, bus_csv: Path | None = None,
+                branch_csv: Path | None = None, jobs: int | None = None, pattern: str = '*.p.gz',
+                start: str | None = None, end: str | None = None,
+                threshold: float = CONGESTION_THRESHOLD, out=sys.stdout) -> dict:
+    """Reduce every matching day in ``directory`` into the statistics file at ``output``.
+
+    One JSON line per day is written to ``out`` as days complete, followed by
+    a ``{"summary": ...}`` line. Days that fail to load are reported and left
+    out of the statistics. The file is swapped in with a rename, so the app
+    never reads a partial one.
+    """
+    t0 = time.perf_counter()
+    grid_dir = Path(SETTINGS.data_dir) / 'Vatic_Grids' / 'Texas-7k' / 'TX_Data' / 'SourceData'
+    grid = load_grid(Path(bus_csv or grid_dir / 'bus.csv'), Path(branch_csv or grid_dir / 'branch.csv'))
+    files = select_files(Path(directory), pattern, start, end)
+    output = Path(output or SETTINGS.lmp_stats_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    n_bus, n_line = len(grid['bus_name']), len(grid['line_uid'])
+    jobs = max(1, jobs or os.cpu_count() or 1)
+
+    tmp = Path(tempfile.mkdtemp(prefix='.' + output.stem + '.', suffix='.tmp', dir=str(output.parent)))
+    try:
+        hourly = np.lib.format.open_memmap(tmp / 'hourly.npy', mode='w+', dtype=np.float32,
+                                           shape=(n_bus, max(1, len(files)) * HOURS))
+        line_hours = np.zeros(n_line, dtype=np.int64)
+        congested = np.zeros(n_line, dtype=np.int64)
+        spread_hours = np.zeros(n_line, dtype=np.int64)
+        spread_sum = np.zeros(n_line, dtype=np.float64)
+        ratio_max = np.full(n_line, np.nan)
+        spread_max = np.full(n_line, np.nan)
+        days = []
+        failed = []
+        for i, rec, part in map_days(files, grid, jobs, day_partials, threshold):
+            out.write(json.dumps(rec) + '\n')
+            out.flush()
+            cols = slice(i * HOURS, (i + 1) * HOURS)
+            if part is None:
+                hourly[:, cols] = np.nan
+                failed.append(rec['date'])
+                continue
+            hourly[:, cols] = part['lmp'].T
+            days.append(rec['date'])
+            line_hours += part['line_hours']
+            congested += part['congested_hours']
+            spread_hours += part['spread_hours']
+            spread_sum += part['spread_sum']
+            ratio_max = np.fmax(ratio_max, part['ratio_max'])
+            spread_max = np.fmax(spread_max, part['spread_max'])
+        if not files:
+            hourly[:] = np.nan
+        hourly.flush()
+        buses = _reduce_buses(hourly)
+        del hourly
+
+        days.sort()
+        meta = {'format': STATS_FORMAT, 'start': days[0] if days else None, 'end': days[-1] if days else None,
+                'days': len(days), 'failed': sorted(failed), 'threshold': threshold,
+                'percentiles': list(PERCENTILES), 'source': str(directory)}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            spread_mean = (spread_sum / spread_hours).astype(np.float32)
+        columns = {
+            'bus_id': grid['bus_id'], 'bus_name': grid['bus_name'], 'lat': grid['lat'], 'lng': grid['lng'],
+            **buses,
+            'line_uid': grid['line_uid'], 'line_from': grid['line_from'], 'line_to': grid['line_to'],
+            'line_hours': line_hours.astype(np.int32), 'congested_hours': congested.astype(np.int32),
+            'congestion_ratio_max': ratio_max.astype(np.float32),
+            'spread_mean': spread_mean, 'spread_max': spread_max.astype(np.float32),
+            'meta': np.array(json.dumps(meta)),
+        }
+        with open(tmp / 'stats.npz', 'wb') as f:
+            np.savez_compressed(f, **columns)
+        os.replace(tmp / 'stats.npz', output)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    summary = {**meta, 'files': len(files), 'buses': n_bus, 'lines': n_line, 'output': str(output),
+               'bytes': output.stat().st_size, 'elapsed_s': round(time.perf_counter() - t0, 3)}
+    out.write(json.dumps({'summary': summary}) + '\n')
+    out.flush()
+    return summary
+
+
+@functools.lru_cache(maxsize=2)
+def _load(path: str, mtime_ns: int, size: int) -> dict | None:
+    with np.load(path, allow_pickle=False) as npz:
+        stats = {k: npz[k] for k in npz.files}
+    stats['meta'] = json.loads(str(stats['meta']))
+    if stats['meta'].get('format') != STATS_FORMAT:
+        return None
+    return stats
+
+
+def load_stats(path=None) -> dict | None:
+    """Column arrays of the statistics file (read once per version of the file); None if absent."""
+    path = Path(path or SETTINGS.lmp_stats_path)
+    try:
+        st = path.stat()
+        return _load(str(path), st.st_mtime_ns, st.st_size)
+    except Exception:
+        return None
+
+
+def metric_frame(stats: dict, metric: str) -> pd.DataFrame:
+    """``name``/``lat``/``lng``/``value`` rows for one of ``METRICS``, lowest value first.
+
+    Line metrics are placed at the midpoint of the line; rows without a value
+    or coordinates are dropped.
+    """
+    _, kind = METRICS[metric]
+    if kind == 'bus':
+        df = pd.DataFrame({'name': stats['bus_name'], 'lat': stats['lat'], 'lng': stats['lng'],
+                           'value': stats[metric]})
+        df = df[stats['hours'] > 0]
+    else:
+        f, t = stats['line_from'], stats['line_to']
+        placed = (f >= 0) & (t >= 0) & (stats['line_hours'] > 0)
+        f, t = f[placed], t[placed]
+        df = pd.DataFrame({'name': stats['line_uid'][placed],
+                           'lat': (stats['lat'][f] + stats['lat'][t]) / 2,
+                           'lng': (stats['lng'][f] + stats['lng'][t]) / 2,
+                           'value': stats[metric][placed]})
+    df = df.dropna()
+    return df.sort_values('value', kind='stable').reset_index(drop=True)
+
+
+__all__ = [
+    'CONGESTION_THRESHOLD',
+    'PERCENTILES',
+    'METRICS',
+    'load_grid',
+    'read_day',
+    'day_partials',
+    'date_of',
+    'select_files',
+    'map_days',
+    'build_stats',
+    'load_stats',
+    'metric_frame',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reduce daily LMP pickles to per-bus and per-line statistics.')
+    parser.add_argument('directory', help='Directory of daily .p.gz pickles')
+    parser.add_argument('--output', default=None, help='Statistics file (default: ORFEUS_LMP_STATS)')
+    parser.add_argument('--bus-csv', default=None, help='Path to bus.csv (default: grid in the data dir)')
+    parser.add_argument('--branch-csv', default=None, help='Path to branch.csv (default: grid in the data dir)')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--pattern', default='*.p.gz', help='File glob')
+    parser.add_argument('--start', default=None, help='First day to include (YYYY-MM-DD)')
+    parser.add_argument('--end', default=None, help='Last day to include (YYYY-MM-DD)')
+    parser.add_argument('--threshold', type=float, default=CONGESTION_THRESHOLD,
+                        help='Loading (|flow| / rating) counted as congested')
+    args = parser.parse_args()
+
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f'ERROR: Not a directory: {directory}', file=sys.stderr)
+        return 2
+    try:
+        summary = build_stats(directory, output=args.output, bus_csv=args.bus_csv, branch_csv=args.branch_csv,
+                              jobs=args.jobs, pattern=args.pattern, start=args.start, end=args.end,
+                              threshold=args.threshold)
+    except (OSError, ValueError) as e:
+        print(f'ERROR: {e}', file=sys.stderr)
+        return 2
+    return 0 if summary['days'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
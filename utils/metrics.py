@@ -0,0 +1,256 @@
+"""In-process callback metrics with a Prometheus-style text exposition.
+
+Every ``dash.callback`` registered after ``install_dash_callback_hook()`` is
+timed; code inside a callback can attribute time to a stage with
+``with stage('load'):`` (stages: load, transform, figure). ``init_app`` adds
+an ``after_request`` hook that records the response size and the time Dash
+spends serializing after the callback returns. Values live in this process
+only; each gunicorn worker exposes its own ``/metrics``.
+"""
+from __future__ import annotations
+
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7)
+
+_callback_ctx: contextvars.ContextVar[dict | None] = contextvars.ContextVar('orfeus_callback', default=None)
+
+
+def _fmt_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = '') -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _escape(v: str) -> str:
+    return str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Counter:
+    """Monotonic counter keyed by label values."""
+
+    def __init__(self, name: str, doc: str, labels: Iterable[str] = ()):
+        self.name, self.doc, self.labels = name, doc, tuple(labels)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = tuple(str(labels.get(k, '')) for k in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        key = tuple(str(labels.get(k, '')) for k in self.labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.doc}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, val in sorted(self._values.items()):
+                lines.append(f'{self.name}{_fmt_labels(self.labels, key)} {val:g}')
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values."""
+
+    def __init__(self, name: str, doc: str, labels: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name, self.doc, self.labels = name, doc, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = tuple(str(labels.get(k, '')) for k in self.labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[idx] += 1
+            series[-1] += value
+
+    def count(self, **labels: Any) -> int:
+        key = tuple(str(labels.get(k, '')) for k in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            return int(sum(series[:-1])) if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.doc}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0.0
+                for bound, n in zip(self.buckets, series):
+                    cumulative += n
+                    le = 'le="%g"' % bound
+                    lines.append(f'{self.name}_bucket{_fmt_labels(self.labels, key, le)} {cumulative:g}')
+                cumulative += series[len(self.buckets)]
+                inf = 'le="+Inf"'
+                lines.append(f'{self.name}_bucket{_fmt_labels(self.labels, key, inf)} {cumulative:g}')
+                lines.append(f'{self.name}_sum{_fmt_labels(self.labels, key)} {series[-1]:.6f}')
+                lines.append(f'{self.name}_count{_fmt_labels(self.labels, key)} {cumulative:g}')
+        return lines
+
+
+CALLBACK_SECONDS = Histogram('orfeus_callback_seconds', 'Wall time spent inside a Dash callback function.', ('callback',))
+STAGE_SECONDS = Histogram('orfeus_callback_stage_seconds',
+                          'Callback wall time by stage (load, transform, figure, serialize).', ('callback', 'stage'))
+RESPONSE_BYTES = Histogram('orfeus_callback_response_bytes', 'Size of /_dash-update-component response bodies.',
+                           ('callback',), buckets=BYTES_BUCKETS)
+CALLBACK_ERRORS = Counter('orfeus_callback_errors_total', 'Callbacks that raised.', ('callback',))
+CACHE_REQUESTS = Counter('orfeus_cache_requests_total', 'Cache lookups by cache name and result (hit/miss).',
+                         ('cache', 'result'))
+
+REGISTRY: list[Counter | Histogram] = [CALLBACK_SECONDS, STAGE_SECONDS, RESPONSE_BYTES, CALLBACK_ERRORS, CACHE_REQUESTS]
+
+
+def render_prometheus() -> str:
+    """Text exposition format (version 0.0.4) of every registered metric."""
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+@contextmanager
+def stage(name: str):
+    """Attribute the enclosed block's wall time to ``name`` for the running callback.
+
+    Stages may nest; each records only its own time, excluding nested stages.
+    """
+    current = _callback_ctx.get()
+    if current is None:
+        yield
+        return
+    stack = current.setdefault('stack', [])
+    stack.append(0.0)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        nested = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        STAGE_SECONDS.observe(max(0.0, elapsed - nested), callback=current['callback'], stage=name)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def instrument_callback(func: Callable, name: str) -> Callable:
+    """Wrap a callback function so its wall time and failures are recorded under ``name``."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _callback_ctx.set({'callback': name})
+        t0 = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception as exc:
+            # PreventUpdate is control flow, not a failure
+            if type(exc).__name__ != 'PreventUpdate':
+                CALLBACK_ERRORS.inc(callback=name)
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            _callback_ctx.reset(token)
+            CALLBACK_SECONDS.observe(elapsed, callback=name)
+            _stash_request_timing(name, elapsed)
+    return wrapper
+
+
+def _stash_request_timing(name: str, elapsed: float) -> None:
+    try:
+        from flask import g, has_request_context
+        if has_request_context():
+            g.orfeus_callback = (name, elapsed)
+    except Exception:
+        pass
+
+
+def _callback_label(args: tuple, kwargs: dict) -> str:
+    """Label a callback by its first Output ('component.property')."""
+    candidates = list(args) + list(kwargs.get('output', []) if isinstance(kwargs.get('output'), list) else [kwargs.get('output')])
+    for dep in candidates:
+        items = dep if isinstance(dep, (list, tuple)) else [dep]
+        for item in items:
+            cid = getattr(item, 'component_id', None)
+            prop = getattr(item, 'component_property', None)
+            if cid is not None and prop is not None:
+                return f'{cid}.{prop}'
+    return 'unknown'
+
+
+_hook_lock = threading.Lock()
+
+
+def install_dash_callback_hook() -> None:
+    """Make ``dash.callback`` instrument every callback it registers (idempotent)."""
+    import dash
+
+    with _hook_lock:
+        if getattr(dash.callback, '_orfeus_instrumented', False):
+            return
+        original = dash.callback
+
+        @functools.wraps(original)
+        def callback(*args, **kwargs):
+            decorator = original(*args, **kwargs)
+            label = _callback_label(args, kwargs)
+
+            def register(func):
+                return decorator(instrument_callback(func, label))
+            return register
+
+        callback._orfeus_instrumented = True  # type: ignore[attr-defined]
+        dash.callback = callback
+
+
+def init_app(server) -> None:
+    """Record response size and post-callback (serialization) time for Dash updates."""
+    from flask import g, request
+
+    @server.before_request
+    def _metrics_start():
+        if request.path.endswith('/_dash-update-component'):
+            g.orfeus_request_t0 = time.perf_counter()
+
+    @server.after_request
+    def _metrics_finish(response):
+        try:
+            t0 = g.pop('orfeus_request_t0', None)
+            timing = g.pop('orfeus_callback', None)
+            if t0 is not None and timing is not None:
+                name, callback_elapsed = timing
+                total = time.perf_counter() - t0
+                STAGE_SECONDS.observe(max(0.0, total - callback_elapsed), callback=name, stage='serialize')
+                if not response.direct_passthrough:
+                    RESPONSE_BYTES.observe(len(response.get_data()), callback=name)
+        except Exception:
+            pass
+        return response
+
+
+__all__ = [
+    "Counter",
+    "Histogram",
+    "REGISTRY",
+    "render_prometheus",
+    "stage",
+    "record_cache",
+    "instrument_callback",
+    "install_dash_callback_hook",
+    "init_app",
+]
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Rewrite legacy LMP pickles in the current pandas pickle format.
+
+Files that reference removed pandas paths (``pandas.core.indexes.numeric``,
+``Int64Index``...) or that only load with dill are re-pickled with the
+standard pickle module so the app's hot path never needs the compat shim or
+dill fallbacks. Modern files are left untouched unless ``--force`` is given.
+The output keeps the input's compression (by extension, else as sniffed) and
+replaces the original atomically; ``--backup-suffix`` keeps a copy.
+
+Usage:
+    python utils/migrate_lmp_pickles.py data/lmps_data_visualization/t7k_v0.4.0-a2_rsvf-20 --dry-run
+    python utils/migrate_lmp_pickles.py data/lmps_data_visualization/t7k_v0.4.0-a2_rsvf-20 --backup-suffix .orig
+"""
+import argparse
+import bz2
+import gzip
+import json
+import lzma
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Allow running as a script (python utils/migrate_lmp_pickles.py) as well as a module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.pandas_compat import needs_compat  # noqa: E402
+from utils.pickle_io import decompress, sniff_codec, unpickle_payload  # noqa: E402
+
+PICKLE_SUFFIXES = (".p.gz", ".p.bz2", ".pkl.gz", ".pkl.bz2", ".p", ".pkl", ".pickle")
+_COMPRESSORS = {
+    "gzip": lambda b, level: gzip.compress(b, compresslevel=level),
+    "bz2": lambda b, level: bz2.compress(b, compresslevel=level),
+    "xz": lambda b, level: lzma.compress(b),
+    "raw": lambda b, level: b,
+}
+
+
+def _iter_files(paths):
+    for p in paths:
+        p = Path(p)
+        if p.is_dir():
+            for child in sorted(p.iterdir()):
+                if child.is_file() and child.name.endswith(PICKLE_SUFFIXES):
+                    yield child
+        elif p.is_file():
+            yield p
+
+
+def _output_codec(path: Path, sniffed: str) -> str:
+    name = path.name.lower()
+    if name.endswith(".gz"):
+        return "gzip"
+    if name.endswith(".bz2"):
+        return "bz2"
+    if name.endswith(".xz"):
+        return "xz"
+    return sniffed
+
+
+def migrate_file(path: Path, force: bool = False, dry_run: bool = False,
+                 backup_suffix: str | None = None, compresslevel: int = 6) -> dict:
+    """Migrate one file; returns a JSON-serializable record of what happened."""
+    t0 = time.perf_counter()
+    record = {"path": str(path)}
+    try:
+        data = path.read_bytes()
+        codec = sniff_codec(data[:8])
+        payload = decompress(data, codec)
+        legacy = needs_compat(payload)
+        obj, loader = unpickle_payload(payload)
+        record.update(codec=codec, loader=loader, legacy_refs=legacy)
+        # Anything that needed the shim, pandas' compat unpickler or dill gets rewritten
+        if not (force or legacy or loader != "pickle"):
+            record["action"] = "skipped"
+            return record
+        new_payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        if needs_compat(new_payload):
+            raise RuntimeError("re-pickled payload still references legacy pandas paths")
+        out_codec = _output_codec(path, codec)
+        record["out_codec"] = out_codec
+        if dry_run:
+            record["action"] = "would-migrate"
+            return record
+        blob = _COMPRESSORS[out_codec](new_payload, compresslevel)
+        if backup_suffix:
+            shutil.copy2(path, path.with_name(path.name + backup_suffix))
+        fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        record.update(action="migrated", bytes_before=len(data), bytes_after=len(blob))
+        return record
+    except Exception as e:
+        record.update(action="failed", error=f"{type(e).__name__}: {e}")
+        return record
+    finally:
+        record["seconds"] = round(time.perf_counter() - t0, 4)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rewrite legacy LMP pickles in the current pandas format.")
+    parser.add_argument("paths", nargs="+", help="Pickle files and/or directories of pickles")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--force", action="store_true", help="Rewrite every file, even ones already modern")
+    parser.add_argument("--backup-suffix", default=None, help="Keep the original next to the new file (e.g. .orig)")
+    parser.add_argument("--compresslevel", type=int, default=6, help="gzip/bz2 compression level")
+    args = parser.parse_args(argv)
+
+    counts = {}
+    for path in _iter_files(args.paths):
+        rec = migrate_file(path, force=args.force, dry_run=args.dry_run,
+                           backup_suffix=args.backup_suffix, compresslevel=args.compresslevel)
+        counts[rec["action"]] = counts.get(rec["action"], 0) + 1
+        print(json.dumps(rec), flush=True)
+    print(json.dumps({"summary": counts}), file=sys.stderr)
+    return 1 if counts.get("failed") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""One-shot aliases for legacy pandas paths referenced by old pickles.
+
+Historical LMP pickles reference ``pandas.core.indexes.numeric`` and the
+``Int64Index``/``UInt64Index``/``Float64Index`` classes, all removed in pandas
+2.x. ``install_pandas_compat()`` registers aliases for them at most once per
+process; it is shared by the app loaders and the validator. Files rewritten by
+``utils/migrate_lmp_pickles.py`` no longer need it.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import types
+
+LEGACY_MODULE = 'pandas.core.indexes.numeric'
+LEGACY_INDEX_CLASSES = ('Int64Index', 'UInt64Index', 'Float64Index')
+# Byte strings that only appear in pickles written by pandas < 2.0
+LEGACY_MARKERS = (LEGACY_MODULE.encode('ascii'),) + tuple(c.encode('ascii') for c in LEGACY_INDEX_CLASSES)
+
+_lock = threading.Lock()
+_installed = False
+
+
+def install_pandas_compat() -> bool:
+    """Register the legacy aliases once; returns True if they are in place."""
+    global _installed
+    if _installed:
+        return True
+    with _lock:
+        if _installed:
+            return True
+        try:
+            import pandas as pd
+            import pandas.core.indexes.base as base
+
+            m = sys.modules.get(LEGACY_MODULE)
+            if m is None:
+                m = types.ModuleType(LEGACY_MODULE)
+                m.__dict__.update({k: v for k, v in base.__dict__.items() if not k.startswith('__')})
+                sys.modules[LEGACY_MODULE] = m
+            for legacy in LEGACY_INDEX_CLASSES:
+                setattr(base, legacy, pd.Index)
+                setattr(m, legacy, pd.Index)
+            _installed = True
+        except Exception:
+            # Best effort; loading proceeds and may still fail on truly legacy files
+            return False
+    return True
+
+
+def is_installed() -> bool:
+    return _installed
+
+
+def needs_compat(payload: bytes) -> bool:
+    """True if an uncompressed pickle payload references legacy pandas paths."""
+    return any(marker in payload for marker in LEGACY_MARKERS)
+
+
+__all__ = [
+    "LEGACY_MARKERS",
+    "install_pandas_compat",
+    "is_installed",
+    "needs_compat",
+]
@@ -0,0 +1,30 @@
+"""Path helpers shared by the loaders, config and data tools."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+def resolve_case_insensitive(p: str | Path) -> Path | None:
+    """Return an existing path matching p, trying a case-insensitive match in the parent dir if needed.
+
+    Data mounted from Dropbox or Windows shares does not always keep the
+    capitalisation the code expects (e.g. ``Bus.csv`` vs ``bus.csv``).
+    """
+    path = Path(p)
+    if path.exists():
+        return path
+    parent = path.parent
+    try:
+        target = path.name.lower()
+        for name in os.listdir(parent):
+            if name.lower() == target:
+                candidate = parent / name
+                if candidate.exists():
+                    return candidate
+    except Exception:
+        pass
+    return None
+
+
+__all__ = ["resolve_case_insensitive"]
@@ -0,0 +1,161 @@
+"""Load (optionally compressed) pickles with a single decode.
+
+The codec is chosen from the leading magic bytes rather than by trying each
+decompressor in turn. Plain pickle reads straight from a decompressing
+stream, so the full decompressed payload is never held next to the loaded
+frames. Only when that fails is the payload decompressed into memory once,
+because the fallbacks (the legacy pandas aliases, pandas' compat unpickler,
+dill) each need to re-read it. gzip uses python-isal when it is installed.
+"""
+from __future__ import annotations
+
+import bz2
+import io
+import lzma
+import pickle
+import threading
+from pathlib import Path
+from typing import Any
+
+from utils.pandas_compat import install_pandas_compat, is_installed, needs_compat
+
+try:  # optional accelerated gzip (pip install isal)
+    from isal import igzip as _gzip
+    GZIP_BACKEND = 'isal'
+except Exception:
+    import gzip as _gzip
+    GZIP_BACKEND = 'zlib'
+
+_MAGIC = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+)
+
+_codec_lock = threading.Lock()
+_codecs: dict[str, str] = {}
+
+
+def sniff_codec(head: bytes) -> str:
+    """Return 'gzip', 'bz2', 'xz' or 'raw' for the first bytes of a file."""
+    for magic, codec in _MAGIC:
+        if head.startswith(magic):
+            return codec
+    return 'raw'
+
+
+def decompress(data: bytes, codec: str | None = None) -> bytes:
+    """Decompress ``data`` once with the codec given or sniffed from its header."""
+    codec = codec or sniff_codec(data[:8])
+    if codec == 'gzip':
+        return _gzip.decompress(data)
+    if codec == 'bz2':
+        return bz2.decompress(data)
+    if codec == 'xz':
+        return lzma.decompress(data)
+    return data
+
+
+def open_stream(fileobj, codec: str):
+    """Binary file object yielding the decompressed bytes of ``fileobj``."""
+    if codec == 'gzip':
+        return _gzip.open(fileobj, 'rb')
+    if codec == 'bz2':
+        return bz2.open(fileobj, 'rb')
+    if codec == 'xz':
+        return lzma.open(fileobj, 'rb')
+    return fileobj
+
+
+def _stream_unpickle(fileobj, codec: str) -> Any:
+    with open_stream(fileobj, codec) as stream:
+        return pickle.load(stream)
+
+
+def unpickle_payload(payload: bytes) -> tuple[Any, str]:
+    """Unpickle decompressed bytes; returns (object, loader name).
+
+    Order: plain pickle, plain pickle after installing the one-shot legacy
+    pandas aliases, pandas' compat unpickler, then dill.
+    """
+    try:
+        return pickle.loads(payload), 'pickle'
+    except Exception as first_error:
+        if not is_installed() and needs_compat(payload) and install_pandas_compat():
+            try:
+                return pickle.loads(payload), 'pickle+compat'
+            except Exception:
+                pass
+        try:
+            from pandas.compat.pickle_compat import loads as pandas_compat_loads
+            return pandas_compat_loads(payload), 'pandas-compat'
+        except Exception:
+            pass
+        try:
+            import dill  # optional fallback for files written with dill
+            install_pandas_compat()
+            return dill.loads(payload), 'dill'
+        except Exception:
+            raise first_error
+
+
+def _record(source: str | None, codec: str, loader: str) -> None:
+    if source is None:
+        return
+    with _codec_lock:
+        _codecs[str(source)] = f'{codec}+{loader}'
+
+
+def codec_for(source) -> str | None:
+    """Codec and unpickler ('gzip+pickle', 'bz2+dill', ...) that last loaded ``source``."""
+    with _codec_lock:
+        return _codecs.get(str(source))
+
+
+def _load_buffered(data: bytes, codec: str, source: str | None) -> Any:
+    obj, loader = unpickle_payload(decompress(data, codec))
+    _record(source, codec, loader)
+    return obj
+
+
+def load_pickle_bytes(data: bytes, source: str | None = None) -> Any:
+    """Unpickle possibly-compressed bytes; ``source`` labels the codec record.
+
+    Plain pickle streams from the decompressor; only a file that needs the
+    compat or dill unpicklers is decompressed into memory (a second decode).
+    """
+    codec = sniff_codec(data[:8])
+    try:
+        obj = pickle.loads(data) if codec == 'raw' else _stream_unpickle(io.BytesIO(data), codec)
+    except Exception:
+        return _load_buffered(data, codec, source)
+    _record(source, codec, 'pickle')
+    return obj
+
+
+def load_pickle_file(path) -> Any:
+    """Unpickle a possibly-compressed pickle file, streaming it from disk in the common case."""
+    path = Path(path)
+    try:
+        with path.open('rb') as fh:
+            codec = sniff_codec(fh.read(8))
+            fh.seek(0)
+            obj = _stream_unpickle(fh, codec)
+    except Exception:
+        # Legacy pandas or dill pickles: read and decompress once for the fallback unpicklers
+        data = path.read_bytes()
+        return _load_buffered(data, sniff_codec(data[:8]), str(path))
+    _record(str(path), codec, 'pickle')
+    return obj
+
+
+__all__ = [
+    "GZIP_BACKEND",
+    "sniff_codec",
+    "decompress",
+    "open_stream",
+    "unpickle_payload",
+    "codec_for",
+    "load_pickle_bytes",
+    "load_pickle_file",
+]
@@ -0,0 +1,381 @@
+"""Response cache for Dash callback updates, and HTTP compression.
+
+Identical ``/_dash-update-component`` requests (the same LMP day/hour, the
+same scenario asset-day) are answered from a cache keyed by a hash of the
+request body: outputs, inputs, state and the triggering props. Caching is
+opt-in: only callbacks whose outputs were all registered with ``cacheable``
+are stored, and a callback that served a fallback (a stub LMP day, a missing
+scenarios file) calls ``no_store`` so the next request retries. Entries are
+evicted least-recently-used within an entry and byte budget, and expire after
+``RESPONSE_CACHE_TTL`` seconds. Setting ``RESPONSE_CACHE_DB`` to a file path
+adds a SQLite tier that every gunicorn worker on the host reads and fills.
+
+``init_app`` also wires flask-compress (brotli, then gzip) for JSON, HTML, JS
+and CSS responses of at least ``COMPRESS_MIN_SIZE`` bytes. It must run before
+any other ``init_app`` that registers ``after_request`` hooks: Flask runs
+those hooks in reverse order, so compression then happens last and the
+caches here and in ``utils.layout_cache`` store uncompressed bodies.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from utils.metrics import record_cache
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+RESPONSE_CACHE_SIZE = int(_env_number('RESPONSE_CACHE_SIZE', 256))
+RESPONSE_CACHE_MB = _env_number('RESPONSE_CACHE_MB', 64)
+# Seconds; 0 disables the response cache
+RESPONSE_CACHE_TTL = _env_number('RESPONSE_CACHE_TTL', 900)
+RESPONSE_CACHE_DB = os.getenv('RESPONSE_CACHE_DB') or None
+COMPRESS_MIN_SIZE = int(_env_number('COMPRESS_MIN_SIZE', 1024))
+
+# Component ids whose callback responses may be replayed (see cacheable).
+# The page router is not listed: utils.layout_cache caches it per path.
+_CACHEABLE: set[str] = set()
+
+
+def cacheable(*component_ids: str) -> None:
+    """Allow responses of callbacks that write only to ``component_ids`` to be cached.
+
+    Register only outputs that are a pure function of the callback's inputs
+    and state; results that read files refreshed in place (the LMP statistics
+    or congestion index) must stay unregistered.
+    """
+    _CACHEABLE.update(component_ids)
+
+
+def no_store() -> None:
+    """Keep the current callback response out of the cache (no-op outside a request)."""
+    try:
+        from flask import g, has_request_context
+        if has_request_context():
+            g.orfeus_response_no_store = True
+    except Exception:
+        pass
+
+
+def no_store_requested() -> bool:
+    """Whether ``no_store`` was called while handling the current request."""
+    try:
+        from flask import g, has_request_context
+        return has_request_context() and bool(g.get('orfeus_response_no_store'))
+    except Exception:
+        return False
+
+
+
+class TTLStore:
+    """Thread-safe LRU mapping of key -> bytes with an entry budget, a byte budget and a TTL."""
+
+    def __init__(self, maxsize: int = 256, max_bytes: int = 64 << 20, ttl: float = 900):
+        self.maxsize = max(1, int(maxsize))
+        self.max_bytes = max(1, int(max_bytes))
+        self.ttl = float(ttl)
+        self.nbytes = 0
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, body = entry
+            if expires <= time.monotonic():
+                self._pop(key)
+                return None
+            self._data.move_to_end(key)
+            return body
+
+    def set(self, key: str, body: bytes, expires_in: float | None = None) -> None:
+        if len(body) > self.max_bytes:
+            return
+        ttl = self.ttl if expires_in is None else expires_in
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (time.monotonic() + ttl, body)
+            self.nbytes += len(body)
+            while len(self._data) > self.maxsize or self.nbytes > self.max_bytes:
+                self._pop(next(iter(self._data)))
+
+    def _pop(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.nbytes -= len(entry[1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class SQLiteStore:
+    """key -> bytes in a SQLite file shared by the workers on one host.
+
+    Rows carry an absolute expiry and a last-access time; the least recently
+    read rows beyond ``maxsize`` are pruned every ``prune_every`` writes.
+    Every operation is best-effort: a locked or unwritable database is a miss.
+    """
+
+    def __init__(self, path: str, maxsize: int = 1024, ttl: float = 900, prune_every: int = 32):
+        self.path = str(path)
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = float(ttl)
+        self.prune_every = max(1, int(prune_every))
+        self._writes = 0
+        self._local = threading.local()
+        self._conn().execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, body BLOB NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL)'
+        )
+        self._conn().execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            now = time.time()
+            conn = self._conn()
+            row = conn.execute('SELECT body, expires FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                return None
+            conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+            return bytes(row[0])
+        except sqlite3.Error:
+            return None
+
+    def set(self, key: str, body: bytes, expires_in: float | None = None) -> None:
+        ttl = self.ttl if expires_in is None else expires_in
+        try:
+            now = time.time()
+            conn = self._conn()
+            conn.execute('INSERT OR REPLACE INTO responses (key, body, expires, accessed) VALUES (?, ?, ?, ?)',
+                         (key, sqlite3.Binary(body), now + ttl, now))
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                self.prune(now)
+        except sqlite3.Error:
+            pass
+
+    def prune(self, now: float | None = None) -> None:
+        """Drop expired rows, then the least recently read rows beyond ``maxsize``."""
+        conn = self._conn()
+        conn.execute('DELETE FROM responses WHERE expires <= ?', (time.time() if now is None else now,))
+        conn.execute(
+            'DELETE FROM responses WHERE key IN ('
+            'SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+            (self.maxsize,),
+        )
+
+    def clear(self) -> None:
+        try:
+            self._conn().execute('DELETE FROM responses')
+        except sqlite3.Error:
+            pass
+
+
+class ResponseCache:
+    """Memory tier in front of an optional shared SQLite tier."""
+
+    def __init__(self, memory: TTLStore, shared: SQLiteStore | None = None):
+        self.memory = memory
+        self.shared = shared
+
+    def get(self, key: str) -> bytes | None:
+        body = self.memory.get(key)
+        if body is None and self.shared is not None:
+            body = self.shared.get(key)
+            if body is not None:
+                self.memory.set(key, body)
+        return body
+
+    def set(self, key: str, body: bytes) -> None:
+        self.memory.set(key, body)
+        if self.shared is not None:
+            self.shared.set(key, body)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+
+def request_key(payload: dict[str, Any]) -> str | None:
+    """Cache key for a ``/_dash-update-component`` JSON body, or None if it must not be cached."""
+    outputs = payload.get('outputs')
+    if isinstance(outputs, dict):
+        outputs = [outputs]
+    if not outputs or not isinstance(outputs, list):
+        return None
+    for out in outputs:
+        # Pattern-matching ids (dicts) are never registered
+        if not isinstance(out, dict) or not isinstance(out.get('id'), str) or out['id'] not in _CACHEABLE:
+            return None
+    canonical = json.dumps(
+        [payload.get(k) for k in ('output', 'outputs', 'inputs', 'state', 'changedPropIds')],
+        sort_keys=True, separators=(',', ':'), default=str,
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def accepted_encoding(header: str | None, algorithms=('br', 'gzip')) -> str | None:
+    """First of ``algorithms`` the ``Accept-Encoding`` header allows (q > 0), else None."""
+    accepted = set()
+    for part in (header or '').lower().split(','):
+        name, _, params = part.strip().partition(';')
+        q = params.strip()
+        try:
+            if q.startswith('q=') and float(q[2:]) <= 0:
+                continue
+        except ValueError:
+            pass
+        accepted.add(name.strip())
+    for algo in algorithms:
+        if algo in accepted or '*' in accepted:
+            return algo
+    return None
+
+
+def encode(body: bytes, algorithm: str, config) -> bytes:
+    """``body`` compressed as flask-compress would with the app's ``COMPRESS_*`` levels."""
+    if algorithm == 'br':
+        import brotli
+        return brotli.compress(body, quality=config.get('COMPRESS_BR_LEVEL', 4))
+    return gzip.compress(body, compresslevel=config.get('COMPRESS_LEVEL', 6), mtime=0)
+
+
+def build_cache() -> ResponseCache | None:
+    """The cache described by the ``RESPONSE_CACHE_*`` settings (None when disabled)."""
+    if RESPONSE_CACHE_TTL <= 0:
+        return None
+    memory = TTLStore(RESPONSE_CACHE_SIZE, int(RESPONSE_CACHE_MB * (1 << 20)), RESPONSE_CACHE_TTL)
+    shared = None
+    if RESPONSE_CACHE_DB:
+        try:
+            shared = SQLiteStore(RESPONSE_CACHE_DB, maxsize=RESPONSE_CACHE_SIZE * 4, ttl=RESPONSE_CACHE_TTL)
+        except (OSError, sqlite3.Error):
+            shared = None
+    return ResponseCache(memory, shared)
+
+
+def init_compression(server) -> bool:
+    """Brotli/gzip for text responses above ``COMPRESS_MIN_SIZE``; False without flask-compress."""
+    try:
+        from flask_compress import Compress
+    except Exception:
+        return False
+    server.config.setdefault('COMPRESS_ALGORITHM', ['br', 'gzip'])
+    server.config.setdefault('COMPRESS_MIN_SIZE', COMPRESS_MIN_SIZE)
+    Compress(server)
+    return True
+
+
+def init_app(app, cache: ResponseCache | None = None) -> ResponseCache | None:
+    """Compress responses and replay cached Dash callback responses. Call before other ``init_app``s."""
+    from flask import g, request
+
+    server = app.server
+    compressed = init_compression(server)
+    cache = cache if cache is not None else build_cache()
+    if cache is None:
+        return None
+
+    def _replay(key: str, body: bytes):
+        algo = None
+        if compressed and len(body) >= server.config.get('COMPRESS_MIN_SIZE', COMPRESS_MIN_SIZE):
+            algo = accepted_encoding(request.headers.get('Accept-Encoding'), server.config['COMPRESS_ALGORITHM'])
+        if algo is None:
+            return server.response_class(body, mimetype='application/json')
+        # Encoded variants live in the memory tier only, so each is compressed once per worker
+        variant = cache.memory.get(f'{key}:{algo}')
+        if variant is None:
+            variant = encode(body, algo, server.config)
+            cache.memory.set(f'{key}:{algo}', variant)
+        resp = server.response_class(variant, mimetype='application/json')
+        resp.headers['Content-Encoding'] = algo
+        resp.headers['Vary'] = 'Accept-Encoding'
+        return resp
+
+    @server.before_request
+    def _response_cache_lookup():
+        try:
+            if request.method != 'POST' or not request.path.endswith('/_dash-update-component'):
+                return None
+            key = request_key(request.get_json(silent=True) or {})
+            if key is None:
+                return None
+            body = cache.get(key)
+            record_cache('callback_response', body is not None)
+            if body is None:
+                g.orfeus_response_key = key
+                return None
+            return _replay(key, body)
+        except Exception:
+            pass
+        return None
+
+    @server.after_request
+    def _response_cache_store(response):
+        try:
+            key = g.pop('orfeus_response_key', None)
+            if g.pop('orfeus_response_no_store', False):
+                key = None
+            if key is not None and response.status_code == 200 and not response.direct_passthrough \
+                    and response.mimetype == 'application/json' and 'Content-Encoding' not in response.headers:
+                cache.set(key, response.get_data())
+        except Exception:
+            pass
+        return response
+
+    return cache
+
+
+__all__ = [
+    'RESPONSE_CACHE_SIZE',
+    'RESPONSE_CACHE_MB',
+    'RESPONSE_CACHE_TTL',
+    'RESPONSE_CACHE_DB',
+    'COMPRESS_MIN_SIZE',
+    'TTLStore',
+    'SQLiteStore',
+    'ResponseCache',
+    'cacheable',
+    'no_store',
+    'no_store_requested',
+    'request_key',
+    'accepted_encoding',
+    'encode',
+    'build_cache',
+    'init_compression',
+    'init_app',
+]
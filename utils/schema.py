@@ -0,0 +1,142 @@
+"""Compact dtypes for the grid tables and the per-day LMP frames.
+
+Every worker keeps ``bus``/``branch`` resident and caches several LMP days,
+each 24 rows per bus and per line. Repeated names become categoricals, IDs
+int32 and measurements float32. Casts that would lose information (NaN or
+out-of-range IDs, non-numeric text) are skipped so odd inputs keep loading.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+BUS_DTYPES = {
+    'Bus ID': 'int32',
+    'lat': 'float32',
+    'lng': 'float32',
+    'Zone': 'category',
+    'Area': 'category',
+    'Sub Name': 'category',
+    'Bus Name': 'category',
+    'GEN UID': 'category',
+}
+BRANCH_DTYPES = {
+    'UID': 'category',
+    'From Bus': 'int32',
+    'To Bus': 'int32',
+    'From Name': 'category',
+    'To Name': 'category',
+    'Cont Rating': 'float32',
+}
+GEN_DTYPES = {
+    'Bus ID': 'int32',
+    'GEN UID': 'category',
+}
+LMP_BUS_DTYPES = {
+    **BUS_DTYPES,
+    'Bus': 'category',
+    'Hour': 'int8',
+    'Date': 'category',
+    'LMP': 'float32',
+    'Demand': 'float32',
+    'Mismatch': 'float32',
+}
+LMP_LINE_DTYPES = {
+    **BRANCH_DTYPES,
+    'Line': 'category',
+    'Hour': 'int8',
+    'Flow': 'float32',
+    'From Bus Lat': 'float32',
+    'From Bus Lng': 'float32',
+    'To Bus Lat': 'float32',
+    'To Bus Lng': 'float32',
+}
+
+# float32 keeps ~7 significant decimal digits
+FLOAT32_DIGITS = 7
+
+
+def _cast(s: pd.Series, dtype: str) -> pd.Series | None:
+    """``s`` as ``dtype``, or None when the cast would change values."""
+    if dtype == 'category':
+        return s.astype('category')
+    if dtype.startswith('int'):
+        if not (pd.api.types.is_integer_dtype(s) or pd.api.types.is_float_dtype(s)):
+            return None
+        if s.isna().any():
+            return None
+        if len(s):
+            info = np.iinfo(dtype)
+            if s.min() < info.min or s.max() > info.max:
+                return None
+            if pd.api.types.is_float_dtype(s) and not (s % 1 == 0).all():
+                return None
+        return s.astype(dtype)
+    if not pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+        return None
+    return s.astype(dtype)
+
+
+def compact(df: pd.DataFrame, dtypes: dict[str, str]) -> pd.DataFrame:
+    """Return ``df`` with the columns named in ``dtypes`` cast to their compact dtype."""
+    if not isinstance(df, pd.DataFrame):
+        return df
+    cast = {}
+    for col, dtype in dtypes.items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+        try:
+            s = _cast(df[col], dtype)
+        except (TypeError, ValueError):
+            s = None
+        if s is not None:
+            cast[col] = s
+    if not cast:
+        return df
+    out = df.copy(deep=False)
+    for col, s in cast.items():
+        out[col] = s
+    return out
+
+
+def join_gen_uids(gens: pd.DataFrame, sep: str = ', ') -> pd.DataFrame:
+    """One row per 'Bus ID' with its distinct 'GEN UID's joined into one string."""
+    pairs = gens[['Bus ID', 'GEN UID']].dropna().astype({'GEN UID': str}).drop_duplicates()
+    return pairs.groupby('Bus ID', sort=False)['GEN UID'].agg(sep.join).reset_index()
+
+
+def widen_float32(values) -> np.ndarray:
+    """float32 values as float64 rounded to the digits float32 actually holds.
+
+    Plain widening shows 23.45 as 23.450000762939453 in hovers and tables.
+    """
+    a = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(a) & (a != 0)
+    mag = np.zeros_like(a)
+    mag[finite] = np.floor(np.log10(np.abs(a[finite])))
+    scale = 10.0 ** (FLOAT32_DIGITS - 1 - mag)
+    out = a.copy()
+    out[finite] = np.round(a[finite] * scale[finite]) / scale[finite]
+    return out
+
+
+def widen_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of ``df`` with float32 columns widened for display (see ``widen_float32``)."""
+    out = df.copy()
+    cols = [c for c in df.columns if df[c].dtype == np.float32]
+    for c in cols:
+        out[c] = widen_float32(out[c].to_numpy())
+    return out
+
+
+__all__ = [
+    'BUS_DTYPES',
+    'BRANCH_DTYPES',
+    'GEN_DTYPES',
+    'LMP_BUS_DTYPES',
+    'LMP_LINE_DTYPES',
+    'compact',
+    'join_gen_uids',
+    'widen_float32',
+    'widen_frame',
+]
@@ -0,0 +1,77 @@
+"""Prefix search over asset IDs for server-paged dropdowns.
+
+Instead of shipping every asset as a dropdown option, the callbacks answer
+each keystroke (the dropdown's ``search_value``) with the top matches from a
+``PrefixIndex``. The index holds one sorted key per word start of every
+item, so ``'wind'``, ``'asset 12'`` or ``'12'`` find ``'T7K ASSET 12 WIND'``
+with two bisects; matches at the start of the whole ID rank first.
+"""
+from __future__ import annotations
+
+import os
+from bisect import bisect_left
+from typing import Any, Hashable, Iterable
+
+try:
+    SEARCH_LIMIT = int(os.getenv('ASSET_SEARCH_LIMIT', '50'))
+except Exception:
+    SEARCH_LIMIT = 50
+
+
+def _token_starts(text: str) -> list[int]:
+    """Offsets where an alphanumeric run begins (start of text or after a separator)."""
+    return [i for i, ch in enumerate(text) if ch.isalnum() and (i == 0 or not text[i - 1].isalnum())] or [0]
+
+
+class PrefixIndex:
+    """Sorted word-start suffixes of a fixed item list, searched with bisect."""
+
+    def __init__(self, items: Iterable[Hashable]):
+        self.items = list(dict.fromkeys(items))
+        entries = []
+        for rank, item in enumerate(self.items):
+            text = str(item).casefold()
+            for start in _token_starts(text):
+                entries.append((text[start:], start != 0, rank))
+        entries.sort()
+        self._keys = [e[0] for e in entries]
+        self._refs = [(e[1], e[2]) for e in entries]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def search(self, query: str | None, limit: int = SEARCH_LIMIT) -> list:
+        """Items with a word starting with ``query`` (case-insensitive), best first.
+
+        An empty query returns the first ``limit`` items in their original order.
+        """
+        q = (query or '').casefold().strip()
+        if not q:
+            return self.items[:limit]
+        lo = bisect_left(self._keys, q)
+        hi = bisect_left(self._keys, q[:-1] + chr(ord(q[-1]) + 1), lo)
+        out, seen = [], set()
+        # Whole-ID prefix matches (False sorts first), then original order
+        for _, rank in sorted(self._refs[lo:hi]):
+            if rank not in seen:
+                seen.add(rank)
+                out.append(self.items[rank])
+                if len(out) >= limit:
+                    break
+        return out
+
+
+def dropdown_options(index: PrefixIndex, search_value: str | None, value: Any = None,
+                     limit: int = SEARCH_LIMIT) -> list[dict]:
+    """Top ``limit`` matches as dropdown options, always including the selected ``value``.
+
+    React-Select drops the displayed selection if its option disappears, so the
+    current value is kept at the front when it is not among the matches.
+    """
+    matches = index.search(search_value, limit)
+    if value is not None and value not in matches:
+        matches = [value, *matches]
+    return [{'label': str(m), 'value': m} for m in matches]
+
+
+__all__ = ['SEARCH_LIMIT', 'PrefixIndex', 'dropdown_options']
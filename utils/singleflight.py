@@ -0,0 +1,116 @@
+"""Coalesce concurrent identical computations into one.
+
+When many users hit the same default view at once, every request thread would
+otherwise build the same LMP day and the same figure in parallel. With
+``SingleFlight.do(key, fn)`` the first caller for a key runs ``fn``; callers
+that arrive while it runs wait and receive the same result (or exception).
+Nothing is kept afterwards; caching is the job of ``utils.cache``.
+
+``coalesce`` applies this to a Dash callback, keyed by its normalized inputs
+and the props that triggered it. The result object is shared between the
+waiting requests, so coalesced callbacks must not hand out objects that a
+caller mutates afterwards. A ``response_cache.no_store`` raised by the call
+is passed on to every request that shares its result.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import threading
+from typing import Any, Callable, Hashable
+
+from utils.metrics import record_cache
+from utils import response_cache
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """At most one running ``fn`` per key; concurrent callers share its outcome.
+
+    A ``name`` reports callers as ``hit`` (joined a running call) or ``miss``
+    (ran it) to ``utils.metrics``.
+    """
+
+    def __init__(self, name: str | None = None):
+        self.name = name
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if self.name:
+            record_cache(self.name, not leader)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def inflight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+def normalize_key(*parts: Any) -> str:
+    """Canonical JSON of ``parts``: equal for inputs that differ only in dict order."""
+    return json.dumps(parts, sort_keys=True, separators=(',', ':'), default=repr)
+
+
+_CALLBACK_FLIGHTS = SingleFlight(name='callback_singleflight')
+
+
+def _triggered() -> tuple:
+    try:
+        from dash import ctx
+        return tuple(sorted(ctx.triggered_prop_ids))
+    except Exception:
+        return ()
+
+
+def coalesce(func: Callable) -> Callable:
+    """Decorate a callback (below ``@dash.callback``) so identical concurrent calls run once."""
+    name = f'{func.__module__}.{func.__qualname__}'
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            key = normalize_key(name, args, kwargs, _triggered())
+        except Exception:
+            return func(*args, **kwargs)
+
+        def run():
+            return func(*args, **kwargs), response_cache.no_store_requested()
+        value, skip_store = _CALLBACK_FLIGHTS.do(key, run)
+        if skip_store:
+            response_cache.no_store()
+        return value
+    return wrapper
+
+
+__all__ = [
+    'SingleFlight',
+    'normalize_key',
+    'coalesce',
+]
@@ -0,0 +1,173 @@
+"""Spatial helpers for the LMP maps: a grid index, viewports and hexbins.
+
+At the default zoom the hourly LMP map draws every Texas-7k bus on top of
+each other, and when zoomed in most of them are off-screen. ``GridIndex``
+buckets the fixed bus coordinates into lat/lng cells once (sorted by cell,
+with per-cell offsets), so the buses inside a map viewport are found by
+slicing one contiguous run per cell row. ``viewport`` turns a map's
+``relayoutData`` into that box, and ``hexbin`` groups the visible buses
+into hexagons whose size follows the zoom, so low zooms send a few hundred
+aggregates instead of thousands of overlapping markers.
+"""
+from __future__ import annotations
+
+import math
+import os
+from typing import Any, Sequence
+
+import numpy as np
+
+try:
+    # Below this map zoom, bulk buses are drawn as hexbin aggregates
+    CLUSTER_ZOOM = float(os.getenv('LMP_CLUSTER_ZOOM', '6'))
+except Exception:
+    CLUSTER_ZOOM = 6.0
+try:
+    # ... but only when at least this many of them are in view
+    CLUSTER_MIN_POINTS = int(os.getenv('LMP_CLUSTER_MIN_POINTS', '1000'))
+except Exception:
+    CLUSTER_MIN_POINTS = 1000
+try:
+    # Hexagon width on screen, in pixels
+    HEX_PX = float(os.getenv('LMP_HEX_PX', '24'))
+except Exception:
+    HEX_PX = 24.0
+# Fraction of the viewport added on every side, so small pans stay covered
+VIEW_MARGIN = 0.25
+# Assumed map size in pixels when relayoutData carries no corner coordinates
+MAP_PX = (1100, 650)
+
+
+class GridIndex:
+    """Points bucketed into ``cell_deg`` lat/lng cells; box queries only visit overlapping cells."""
+
+    def __init__(self, lat: Sequence[float], lng: Sequence[float], keys: Sequence[Any] | None = None,
+                 cell_deg: float = 0.5):
+        lat = np.asarray(lat, dtype=np.float64)
+        lng = np.asarray(lng, dtype=np.float64)
+        keys = np.arange(len(lat)) if keys is None else np.asarray(keys)
+        ok = np.isfinite(lat) & np.isfinite(lng) & (np.abs(lat) <= 90) & (np.abs(lng) <= 180)
+        lat, lng, keys = lat[ok], lng[ok], keys[ok]
+        self.cell = float(cell_deg)
+        self.lat0 = float(lat.min()) if len(lat) else 0.0
+        self.lng0 = float(lng.min()) if len(lng) else 0.0
+        rows = ((lat - self.lat0) // self.cell).astype(np.int64)
+        cols = ((lng - self.lng0) // self.cell).astype(np.int64)
+        self.n_rows = int(rows.max()) + 1 if len(rows) else 0
+        self.n_cols = int(cols.max()) + 1 if len(cols) else 0
+        cell_id = rows * self.n_cols + cols
+        order = np.argsort(cell_id, kind='stable')
+        self.lat, self.lng, self.keys = lat[order], lng[order], keys[order]
+        self._offsets = np.searchsorted(cell_id[order], np.arange(self.n_rows * self.n_cols + 1))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def query(self, lat_min: float, lat_max: float, lng_min: float, lng_max: float) -> np.ndarray:
+        """Keys of the points inside the box (edges included)."""
+        if not len(self.keys):
+            return self.keys
+        r0 = max(0, int((lat_min - self.lat0) // self.cell))
+        r1 = min(self.n_rows - 1, int((lat_max - self.lat0) // self.cell))
+        c0 = max(0, int((lng_min - self.lng0) // self.cell))
+        c1 = min(self.n_cols - 1, int((lng_max - self.lng0) // self.cell))
+        if r0 > r1 or c0 > c1:
+            return self.keys[:0]
+        # Cells of one row are adjacent in the sort order: one slice per row
+        runs = [np.arange(self._offsets[r * self.n_cols + c0], self._offsets[r * self.n_cols + c1 + 1])
+                for r in range(r0, r1 + 1)]
+        idx = np.concatenate(runs)
+        inside = ((self.lat[idx] >= lat_min) & (self.lat[idx] <= lat_max)
+                  & (self.lng[idx] >= lng_min) & (self.lng[idx] <= lng_max))
+        return self.keys[idx[inside]]
+
+
+def viewport(relayout: dict | None, default_center: tuple[float, float] = (31.0, -99.9018),
+             default_zoom: float = 4.5, margin: float = VIEW_MARGIN) -> dict:
+    """Box, center and zoom of a mapbox view from ``relayoutData`` (the default view if it has none).
+
+    Uses the corner coordinates plotly reports after a pan or zoom; otherwise
+    the box is estimated from center and zoom for a ``MAP_PX`` sized map.
+    ``margin`` pads the box on every side.
+    """
+    relayout = relayout if isinstance(relayout, dict) else {}
+    center = relayout.get('mapbox.center') or {}
+    try:
+        lat_c = float(center.get('lat', default_center[0]))
+        lng_c = float(center.get('lon', default_center[1]))
+        zoom = float(relayout.get('mapbox.zoom', default_zoom))
+    except (TypeError, ValueError):
+        lat_c, lng_c, zoom = default_center[0], default_center[1], default_zoom
+    corners = ((relayout.get('mapbox._derived') or {}).get('coordinates')) or []
+    try:
+        lngs = [float(c[0]) for c in corners]
+        lats = [float(c[1]) for c in corners]
+        box = [min(lats), max(lats), min(lngs), max(lngs)]
+    except (TypeError, ValueError, IndexError):
+        box = None
+    if not box:
+        half_lng = 360.0 * MAP_PX[0] / (256.0 * 2 ** zoom) / 2
+        half_lat = half_lng * MAP_PX[1] / MAP_PX[0] * math.cos(math.radians(lat_c))
+        box = [lat_c - half_lat, lat_c + half_lat, lng_c - half_lng, lng_c + half_lng]
+    pad_lat = (box[1] - box[0]) * margin
+    pad_lng = (box[3] - box[2]) * margin
+    return {
+        'lat_min': max(-90.0, box[0] - pad_lat), 'lat_max': min(90.0, box[1] + pad_lat),
+        'lng_min': max(-180.0, box[2] - pad_lng), 'lng_max': min(180.0, box[3] + pad_lng),
+        'center': {'lat': lat_c, 'lon': lng_c}, 'zoom': zoom,
+    }
+
+
+def in_view(view: dict, lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    """Mask of points inside ``view``."""
+    return ((lat >= view['lat_min']) & (lat <= view['lat_max'])
+            & (lng >= view['lng_min']) & (lng <= view['lng_max']))
+
+
+def segments_in_view(view: dict, lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Mask of segments whose bounding box overlaps ``view``."""
+    lat1, lng1, lat2, lng2 = (np.asarray(a, dtype=np.float64) for a in (lat1, lng1, lat2, lng2))
+    return ((np.maximum(lat1, lat2) >= view['lat_min']) & (np.minimum(lat1, lat2) <= view['lat_max'])
+            & (np.maximum(lng1, lng2) >= view['lng_min']) & (np.minimum(lng1, lng2) <= view['lng_max']))
+
+
+def hex_size_deg(zoom: float, px: float = HEX_PX) -> float:
+    """Degrees of longitude spanned by ``px`` screen pixels at a web-mercator ``zoom``."""
+    return 360.0 * px / (256.0 * 2 ** zoom)
+
+
+def hexbin(lat: np.ndarray, lng: np.ndarray, size_deg: float) -> np.ndarray:
+    """Hexagon id of every point, for pointy-top hexagons ``size_deg`` wide.
+
+    Each point goes to the nearer center of two offset rectangular lattices,
+    as in matplotlib's ``hexbin``. Latitude is scaled by ``cos(lat)`` so the
+    hexagons look regular on the map.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    if not len(lat):
+        return np.zeros(0, dtype=np.int64)
+    x = lng / size_deg
+    y = lat * math.cos(math.radians(float(np.nanmean(lat)))) / (size_deg * math.sqrt(3))
+    ix1, iy1 = np.round(x), np.round(y)
+    ix2, iy2 = np.floor(x) + 0.5, np.floor(y) + 0.5
+    d1 = (x - ix1) ** 2 + 3 * (y - iy1) ** 2
+    d2 = (x - ix2) ** 2 + 3 * (y - iy2) ** 2
+    second = d2 < d1
+    # Lattice 1 centers on integers, lattice 2 on half-integers: double to keep ids integral
+    hx = np.where(second, 2 * ix2, 2 * ix1).astype(np.int64)
+    hy = np.where(second, 2 * iy2, 2 * iy1).astype(np.int64)
+    return hy * (1 << 32) + hx
+
+
+__all__ = [
+    'CLUSTER_ZOOM',
+    'CLUSTER_MIN_POINTS',
+    'HEX_PX',
+    'GridIndex',
+    'viewport',
+    'in_view',
+    'segments_in_view',
+    'hex_size_deg',
+    'hexbin',
+]
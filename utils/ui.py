@@ -8,6 +8,11 @@ import dash
 from dash import dcc, html, Input, Output, State, ctx, page_registry, page_container
 import dash_bootstrap_components as dbc
 
+from utils.metrics import install_dash_callback_hook
+
+# Pages import this module before registering callbacks, so every dash.callback is timed
+install_dash_callback_hook()
+
 __all__ = [
     "dash",
     "dcc",
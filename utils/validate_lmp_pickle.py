@@ -1,66 +1,29 @@
 #!/usr/bin/env python3
 import argparse
+import json
 import os
 import sys
-import bz2
-import gzip
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-import types
 
 import pandas as pd
-import pickle as std_pickle
-import dill as dill_pickle  # fallback if files were pickled with dill
+
+# Allow running as a script (python utils/validate_lmp_pickle.py) as well as a module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.pickle_io import load_pickle_file, codec_for  # noqa: E402
 
 REQUIRED_BUS_COLS = {"Bus", "Hour", "LMP", "Demand", "Date", "Mismatch"}
 REQUIRED_LINE_COLS = {"Line", "Hour", "Flow"}
 
 
-def _prepare_pandas_compat():
-    """Shim legacy pandas module/class paths used in old pickles.
-
-    - pandas.core.indexes.numeric existed in older pandas; now merged into base.
-    - Int64Index/UInt64Index/Float64Index classes were removed; map to pd.Index.
-    """
-    try:
-        import pandas.core.indexes.base as base
-        # Create a synthetic module for pandas.core.indexes.numeric
-        m = types.ModuleType("pandas.core.indexes.numeric")
-        m.__dict__.update(base.__dict__)
-        sys.modules["pandas.core.indexes.numeric"] = m
-        # Map legacy index class names used in pickles
-        for legacy in ("Int64Index", "UInt64Index", "Float64Index"):
-            setattr(base, legacy, pd.Index)
-            setattr(m, legacy, pd.Index)
-    except Exception:
-        # Best-effort shim; if it fails, continue and let load attempt anyway
-        pass
-
-
-def _try_load(fileobj):
-    """Attempt std pickle first, then dill, with compat shim applied."""
-    _prepare_pandas_compat()
-    try:
-        return std_pickle.load(fileobj)
-    except Exception:
-        fileobj.seek(0)
-        _prepare_pandas_compat()
-        return dill_pickle.load(fileobj)
-
-
 def _load_pickle_any(path: Path):
-    # Ensure pandas compat shims are in place prior to unpickling
-    _prepare_pandas_compat()
-    # Try bz2
+    # Legacy pandas aliases are installed on demand (once) by the loader
     try:
-        with bz2.BZ2File(path, "rb") as f:
-            return _try_load(f)
-    except Exception:
-        # Try gzip
-        try:
-            with gzip.open(path, "rb") as f:
-                return _try_load(f)
-        except Exception as e_gz:
-            raise RuntimeError(f"Failed to load {path} via bz2 and gzip") from e_gz
+        return load_pickle_file(path)
+    except Exception as e:
+        raise RuntimeError(f"Failed to load {path}") from e
 
 
 def _extract_bus_line(obj: dict):
@@ -141,6 +104,7 @@ def validate_lmp_pickle(path: Path, bus_csv: Path = None, branch_csv: Path = Non
     except Exception:
         print("Warn: could not parse bus_detail['Date'] to validate against filename")
 
+    print(f"- codec: {codec_for(path)}")
     print(f"- bus_detail shape: {bus_detail.shape}, line_detail shape: {line_detail.shape}")
     print(f"- unique buses: {bus_detail['Bus'].nunique()}, unique lines: {line_detail['Line'].nunique()}")
 
@@ -171,13 +135,198 @@ def validate_lmp_pickle(path: Path, bus_csv: Path = None, branch_csv: Path = Non
     return True
 
 
+# ---------- Directory mode ----------
+
+_GRID_BUS_NAMES = None
+_GRID_BRANCH_UIDS = None
+
+
+def _load_grid(bus_csv: Path = None, branch_csv: Path = None):
+    """Read bus names and branch UIDs once; None for a CSV that is missing or unreadable."""
+    bus_names = branch_uids = None
+    if bus_csv and bus_csv.exists():
+        try:
+            bus_names = frozenset(pd.read_csv(bus_csv, usecols=["Bus Name"])["Bus Name"].astype(str))
+        except Exception as e:
+            print(f"Warn: failed to read bus CSV: {e}", file=sys.stderr)
+    if branch_csv and branch_csv.exists():
+        try:
+            branch_uids = frozenset(pd.read_csv(branch_csv, usecols=["UID"])["UID"].astype(str))
+        except Exception as e:
+            print(f"Warn: failed to read branch CSV: {e}", file=sys.stderr)
+    return bus_names, branch_uids
+
+
+def _schema(df: pd.DataFrame) -> dict:
+    return {str(c): str(t) for c, t in df.dtypes.items()}
+
+
+def inspect_lmp_file(path: Path, bus_names=None, branch_uids=None) -> dict:
+    """Run the single-file checks on one pickle and return a JSON-serializable record."""
+    rec = {"file": path.name, "date": path.name.split(".")[0], "ok": False, "errors": [], "warnings": []}
+    t0 = time.perf_counter()
+    try:
+        obj = _load_pickle_any(path)
+    except Exception as e:
+        rec["errors"].append(f"load failed: {e.__cause__ or e}")
+        rec["load_s"] = round(time.perf_counter() - t0, 4)
+        return rec
+    rec["load_s"] = round(time.perf_counter() - t0, 4)
+    rec["codec"] = codec_for(path)
+
+    if not isinstance(obj, dict):
+        rec["errors"].append("pickle root object is not a dict")
+        return rec
+    bus_detail, line_detail = _extract_bus_line(obj)
+    if not isinstance(bus_detail, pd.DataFrame) or not isinstance(line_detail, pd.DataFrame):
+        rec["errors"].append(f"bus_detail/line_detail DataFrames not found; keys: {sorted(map(str, obj.keys()))}")
+        return rec
+    bus_detail = bus_detail.reset_index()
+    line_detail = line_detail.reset_index()
+    rec["schema"] = {"bus": _schema(bus_detail), "line": _schema(line_detail)}
+    rec["bus_rows"], rec["line_rows"] = int(len(bus_detail)), int(len(line_detail))
+
+    missing_bus = REQUIRED_BUS_COLS - set(bus_detail.columns)
+    missing_line = REQUIRED_LINE_COLS - set(line_detail.columns)
+    if missing_bus:
+        rec["errors"].append(f"bus_detail missing columns: {sorted(missing_bus)}")
+    if missing_line:
+        rec["errors"].append(f"line_detail missing columns: {sorted(missing_line)}")
+    if missing_bus or missing_line:
+        return rec
+
+    hours = set(range(24))
+    if not set(bus_detail["Hour"].unique()).issubset(hours):
+        rec["errors"].append("bus_detail Hour not within 0..23")
+    if not set(line_detail["Hour"].unique()).issubset(hours):
+        rec["errors"].append("line_detail Hour not within 0..23")
+    for col in ("LMP", "Demand"):
+        if not pd.api.types.is_numeric_dtype(bus_detail[col]):
+            rec["errors"].append(f"bus_detail[{col}] not numeric")
+    if not pd.api.types.is_numeric_dtype(line_detail["Flow"]):
+        rec["errors"].append("line_detail[Flow] not numeric")
+
+    try:
+        bd_dates = pd.to_datetime(bus_detail["Date"].drop_duplicates()).dt.strftime("%Y-%m-%d").unique()
+        if rec["date"] not in bd_dates:
+            rec["warnings"].append(f"file date not in bus_detail['Date'] {list(bd_dates)[:3]}")
+    except Exception:
+        rec["warnings"].append("could not parse bus_detail['Date']")
+
+    rec["unique_buses"] = int(bus_detail["Bus"].nunique())
+    rec["unique_lines"] = int(line_detail["Line"].nunique())
+    if bus_names is not None:
+        rec["bus_coverage"] = round(float(bus_detail["Bus"].astype(str).isin(bus_names).mean()), 6)
+        if rec["bus_coverage"] == 0:
+            rec["warnings"].append("no Bus names matched bus.csv")
+    if branch_uids is not None:
+        rec["line_coverage"] = round(float(line_detail["Line"].astype(str).isin(branch_uids).mean()), 6)
+        if rec["line_coverage"] == 0:
+            rec["warnings"].append("no Lines matched branch.csv UID")
+    rec["ok"] = not rec["errors"]
+    return rec
+
+
+def _init_worker(bus_names, branch_uids):
+    global _GRID_BUS_NAMES, _GRID_BRANCH_UIDS
+    _GRID_BUS_NAMES, _GRID_BRANCH_UIDS = bus_names, branch_uids
+
+
+def _inspect_in_worker(path_str: str) -> dict:
+    return inspect_lmp_file(Path(path_str), _GRID_BUS_NAMES, _GRID_BRANCH_UIDS)
+
+
+def _summarize(records: list, start: str = None, end: str = None, elapsed: float = 0.0) -> dict:
+    """Coverage of the date range, schema drift across days and load-time statistics."""
+    dates = sorted(r["date"] for r in records)
+    valid_dates = {r["date"] for r in records if r["ok"]}
+    summary = {"files": len(records), "passed": len(valid_dates), "failed": len(records) - len(valid_dates),
+               "elapsed_s": round(elapsed, 3)}
+    try:
+        rng = pd.date_range(start or dates[0], end or dates[-1], freq="D").strftime("%Y-%m-%d")
+        missing = [d for d in rng if d not in valid_dates]
+        summary["date_range"] = [rng[0], rng[-1]]
+        summary["day_coverage_pct"] = round(100.0 * (len(rng) - len(missing)) / len(rng), 2)
+        summary["missing_or_failed_days"] = missing
+    except Exception:
+        pass
+    for key in ("bus_coverage", "line_coverage"):
+        vals = [r[key] for r in records if key in r]
+        if vals:
+            summary[f"{key}_pct"] = {"mean": round(100.0 * sum(vals) / len(vals), 3),
+                                     "min": round(100.0 * min(vals), 3)}
+    # Schema drift: compare each day's columns/dtypes with the most common schema
+    sigs = {r["date"]: json.dumps(r["schema"], sort_keys=True) for r in records if "schema" in r}
+    if sigs:
+        reference_sig, count = Counter(sigs.values()).most_common(1)[0]
+        reference = json.loads(reference_sig)
+        drift = {}
+        for date, sig in sorted(sigs.items()):
+            if sig == reference_sig:
+                continue
+            schema = json.loads(sig)
+            diff = {}
+            for table in ("bus", "line"):
+                ref_cols, cols = reference[table], schema[table]
+                added = sorted(set(cols) - set(ref_cols))
+                removed = sorted(set(ref_cols) - set(cols))
+                changed = {c: [ref_cols[c], cols[c]] for c in set(cols) & set(ref_cols) if cols[c] != ref_cols[c]}
+                if added or removed or changed:
+                    diff[table] = {"added": added, "removed": removed, "dtype_changed": changed}
+            drift[date] = diff
+        summary["schema"] = {"reference": reference, "files_matching_reference": count, "drift": drift}
+    loads = sorted((r["load_s"], r["file"]) for r in records if "load_s" in r)
+    if loads:
+        times = [t for t, _ in loads]
+        summary["load_s"] = {"total": round(sum(times), 3), "mean": round(sum(times) / len(times), 4),
+                             "p50": times[len(times) // 2], "max": times[-1],
+                             "slowest": [f for _, f in loads[-5:][::-1]]}
+    summary["codecs"] = dict(Counter(r.get("codec") or "unknown" for r in records))
+    return summary
+
+
+def validate_directory(directory: Path, bus_csv: Path = None, branch_csv: Path = None, jobs: int = None,
+                       pattern: str = "*.p.gz", start: str = None, end: str = None, out=sys.stdout) -> dict:
+    """Validate every matching pickle in a directory across a process pool.
+
+    The grid CSVs are read once and shipped to each worker at startup. One JSON
+    line per file is written to ``out`` as results complete, followed by a
+    ``{"summary": ...}`` line.
+    """
+    t0 = time.perf_counter()
+    files = sorted(directory.glob(pattern))
+    bus_names, branch_uids = _load_grid(bus_csv, branch_csv)
+    records = []
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    if jobs == 1 or len(files) <= 1:
+        _init_worker(bus_names, branch_uids)
+        for f in files:
+            rec = _inspect_in_worker(str(f))
+            records.append(rec)
+            out.write(json.dumps(rec) + "\n")
+            out.flush()
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(files)), initializer=_init_worker,
+                                 initargs=(bus_names, branch_uids)) as pool:
+            futures = [pool.submit(_inspect_in_worker, str(f)) for f in files]
+            for fut in as_completed(futures):
+                rec = fut.result()
+                records.append(rec)
+                out.write(json.dumps(rec) + "\n")
+                out.flush()
+    summary = _summarize(records, start=start, end=end, elapsed=time.perf_counter() - t0)
+    out.write(json.dumps({"summary": summary}) + "\n")
+    out.flush()
+    return summary
+
+
 def main():
     parser = argparse.ArgumentParser(
-        description="Validate an LMP .p.gz pickle file for expected shape/content."
+        description="Validate LMP .p.gz pickle files for expected shape/content."
     )
     parser.add_argument(
         "pickle_path",
-        help="Path to the .p.gz file (e.g., data/lmps_data_visualization/.../2018-01-02.p.gz)",
+        help="Path to a .p.gz file, or a directory to validate every day in it (JSON lines output)",
     )
     parser.add_argument(
         "--bus-csv",
@@ -189,9 +338,21 @@ def main():
         default="data/Vatic_Grids/Texas-7k/TX_Data/SourceData/branch.csv",
         help="Path to branch.csv (optional; improves validation)",
     )
+    parser.add_argument("--jobs", type=int, default=None, help="Directory mode: worker processes (default: CPU count)")
+    parser.add_argument("--pattern", default="*.p.gz", help="Directory mode: file glob")
+    parser.add_argument("--start", default=None, help="Directory mode: first expected date (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="Directory mode: last expected date (YYYY-MM-DD)")
     args = parser.parse_args()
 
     pkl = Path(args.pickle_path)
+    if pkl.is_dir():
+        summary = validate_directory(
+            pkl,
+            bus_csv=Path(args.bus_csv) if args.bus_csv else None,
+            branch_csv=Path(args.branch_csv) if args.branch_csv else None,
+            jobs=args.jobs, pattern=args.pattern, start=args.start, end=args.end,
+        )
+        return 0 if summary["files"] and not summary["failed"] else 1
     if not pkl.exists():
         print(f"ERROR: Pickle not found: {pkl}", file=sys.stderr)
         return 2
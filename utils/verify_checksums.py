@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Incrementally verify data files against a ``sha256sum``-format manifest.
+
+Unlike ``sha256sum -c``, files are only re-hashed when their size or mtime
+changed since the last successful hash: a sidecar state file (default
+``<manifest>.state.json``) records (path, size, mtime_ns, sha256). Hashing
+runs on a thread pool with large buffered reads (hashlib releases the GIL).
+``--app-files`` restricts the check to the files the app reads at startup so
+it can gate a container start:
+
+    python utils/verify_checksums.py data-checksums.sha256 --app-files && gunicorn ...
+
+Manifest paths starting with ``data/`` are resolved under ``ORFEUS_DATA_DIR``;
+names that differ only in case are matched as the app does.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Allow running as a script (python utils/verify_checksums.py) as well as a module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.config import SETTINGS  # noqa: E402
+from utils.paths import resolve_case_insensitive  # noqa: E402
+
+READ_SIZE = 8 * 1024 * 1024
+GRID_DIR = Path("Vatic_Grids") / "Texas-7k" / "TX_Data" / "SourceData"
+
+# Files read when inputs/inputs.py is imported, relative to the data directory
+APP_STARTUP_FILES = (
+    GRID_DIR / "bus.csv",
+    GRID_DIR / "branch.csv",
+    GRID_DIR / "gen.csv",
+    *(Path("reliability_cost_index_data") / v / f"daily_type-allocs_{v}_{kind}_allocs.csv"
+      for v in ("rts", "t7k") for kind in ("type", "asset")),
+    *(Path("tuning_final_files") / f"escores_avg_on_tuning_{t}_rhos.csv" for t in ("solar", "load", "wind")),
+    *(Path("tuning_final_files") / "texas7k" / f"escores_avg_on_tuning_{t}_rhos.csv" for t in ("solar", "load", "wind")),
+    Path("tuning_final_files") / "texas7k" / "pca" / "escores_avg_on_tuning_solar_rhos.csv",
+)
+
+
+def parse_manifest(manifest: Path) -> list:
+    """Return [(expected_sha256, relative_path)] from ``sha256sum`` output."""
+    entries = []
+    with open(manifest, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            digest, _, name = line.partition(" ")
+            # "<hash>  path" (text mode) or "<hash> *path" (binary mode)
+            name = name[1:] if name[:1] in (" ", "*") else name
+            entries.append((digest.lower(), name))
+    return entries
+
+
+def _target(name: str, root: Path, data_dir: Path) -> Path:
+    rel = Path(name)
+    if rel.is_absolute():
+        return rel
+    if rel.parts and rel.parts[0] == "data":
+        return data_dir.joinpath(*rel.parts[1:])
+    return root / rel
+
+
+def sha256_file(path: Path, read_size: int = READ_SIZE) -> str:
+    h = hashlib.sha256()
+    buf = bytearray(read_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def _load_state(state_file: Path) -> dict:
+    try:
+        with open(state_file, encoding="utf-8") as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except Exception:
+        return {}
+
+
+def _save_state(state_file: Path, state: dict) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=state_file.name + ".", suffix=".tmp", dir=str(state_file.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=0, sort_keys=True)
+        os.replace(tmp, state_file)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def verify(manifest: Path, state_file: Path = None, root: Path = None, data_dir: Path = None,
+           only: set = None, workers: int = None) -> dict:
+    """Check manifest entries; returns counts plus the failing paths.
+
+    ``only`` is a set of resolved paths to restrict the check to.
+    """
+    t0 = time.perf_counter()
+    root = root or Path.cwd()
+    data_dir = data_dir or SETTINGS.data_dir
+    state_file = state_file or manifest.with_name(manifest.name + ".state.json")
+    state = _load_state(state_file)
+
+    results = {"ok": 0, "cached": 0, "hashed": 0, "missing": [], "mismatch": []}
+    to_hash = []
+    for expected, name in parse_manifest(manifest):
+        target = _target(name, root, data_dir)
+        path = resolve_case_insensitive(target)
+        if only is not None and (path or target).resolve() not in only:
+            continue
+        if path is None:
+            results["missing"].append(name)
+            continue
+        st = path.stat()
+        key = str(path.resolve())
+        known = state.get(key)
+        if known and known.get("size") == st.st_size and known.get("mtime_ns") == st.st_mtime_ns:
+            results["cached"] += 1
+            if known.get("sha256") == expected:
+                results["ok"] += 1
+            else:
+                results["mismatch"].append(name)
+            continue
+        to_hash.append((expected, name, path, key, st))
+
+    def _hash(item):
+        expected, name, path, key, st = item
+        return item, sha256_file(path)
+
+    if to_hash:
+        with ThreadPoolExecutor(max_workers=max(1, workers or min(8, os.cpu_count() or 1))) as pool:
+            for (expected, name, path, key, st), digest in pool.map(_hash, to_hash):
+                results["hashed"] += 1
+                state[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+                if digest == expected:
+                    results["ok"] += 1
+                else:
+                    results["mismatch"].append(name)
+        try:
+            _save_state(state_file, state)
+        except OSError as e:
+            print(f"Warn: could not write state file {state_file}: {e}", file=sys.stderr)
+    results["elapsed_s"] = round(time.perf_counter() - t0, 3)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally verify data files against a sha256sum manifest.")
+    parser.add_argument("manifest", nargs="?", default="data-checksums.sha256", help="sha256sum-format manifest")
+    parser.add_argument("--state", default=None, help="Sidecar state file (default: <manifest>.state.json)")
+    parser.add_argument("--root", default=None, help="Base for relative manifest paths (default: cwd)")
+    parser.add_argument("--data-dir", default=None, help="Where 'data/...' entries live (default: ORFEUS_DATA_DIR)")
+    parser.add_argument("--app-files", action="store_true", help="Only check files the app reads at startup")
+    parser.add_argument("--workers", type=int, default=None, help="Hashing threads")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args(argv)
+
+    manifest = Path(args.manifest)
+    if not manifest.exists():
+        print(f"ERROR: manifest not found: {manifest}", file=sys.stderr)
+        return 2
+    data_dir = Path(args.data_dir) if args.data_dir else SETTINGS.data_dir
+    only = None
+    if args.app_files:
+        only = set()
+        for rel in APP_STARTUP_FILES:
+            resolved = resolve_case_insensitive(data_dir / rel)
+            only.add((resolved or data_dir / rel).resolve())
+    res = verify(manifest, state_file=Path(args.state) if args.state else None,
+                 root=Path(args.root) if args.root else None, data_dir=data_dir, only=only, workers=args.workers)
+    if args.json:
+        print(json.dumps(res))
+    else:
+        for name in res["missing"]:
+            print(f"{name}: FAILED open or read")
+        for name in res["mismatch"]:
+            print(f"{name}: FAILED")
+        if not res["missing"] and not res["mismatch"]:
+            print(f"All Valid ({res['ok']} files, {res['hashed']} hashed, {res['cached']} unchanged, "
+                  f"{res['elapsed_s']}s)")
+    return 0 if not res["missing"] and not res["mismatch"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Warm-up of the default views before a worker reports ready.
+
+Every page opens on a fixed default (the first LMP day at hour 15, the first
+RTS asset, the third T7K asset, the 1-day risk allocation). Page modules
+register a step that loads those datasets and builds their figures, which
+fills the data caches. ``start`` then runs every step in a background thread,
+along with requests that fill ``utils.layout_cache``. ``/readyz`` answers 503
+until the steps are done. Liveness (``/healthz``) does not wait for warm-up.
+
+A failing step is recorded and skipped; the worker still becomes ready, since
+the same data would fail (and fall back) on a user request too.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+import traceback
+from typing import Callable
+
+from utils.ui import dash
+
+try:
+    WARMUP = os.getenv('WARMUP', '1').strip().lower() in ('1', 'true', 'yes', 'on')
+except Exception:
+    WARMUP = True
+
+_STEPS: list[tuple[str, Callable[[], object]]] = []
+_STATE: dict = {'ready': not WARMUP, 'started': None, 'finished': None, 'steps': {}}
+_lock = threading.Lock()
+
+
+def register(name: str, step: Callable[[], object]) -> None:
+    """Run ``step`` during warm-up; ``name`` labels it in ``/readyz``."""
+    _STEPS.append((name, step))
+
+
+def _run_step(name: str, step: Callable[[], object]) -> None:
+    t0 = time.perf_counter()
+    try:
+        step()
+        result = {'ok': True}
+    except Exception as exc:
+        result = {'ok': False, 'error': f'{type(exc).__name__}: {exc}'}
+        if os.getenv('WARMUP_DEBUG'):
+            traceback.print_exc()
+    result['seconds'] = round(time.perf_counter() - t0, 3)
+    with _lock:
+        _STATE['steps'][name] = result
+
+
+def _prime_layouts(app) -> None:
+    """Request the Dash GET endpoints and every page's router output once."""
+    client = app.server.test_client()
+    prefix = app.config.routes_pathname_prefix or '/'
+    for path in ('_dash-layout', '_dash-dependencies'):
+        client.get(prefix + path)
+    body = {
+        'output': '.._pages_content.children..._pages_store.data..',
+        'outputs': [{'id': '_pages_content', 'property': 'children'}, {'id': '_pages_store', 'property': 'data'}],
+        'changedPropIds': ['_pages_location.pathname'],
+        'state': [],
+    }
+    for page in dash.page_registry.values():
+        pathname = page.get('relative_path', page['path'])
+        body['inputs'] = [{'id': '_pages_location', 'property': 'pathname', 'value': pathname},
+                          {'id': '_pages_location', 'property': 'search', 'value': ''}]
+        client.post(prefix + '_dash-update-component', json=body)
+
+
+def run(app=None) -> dict:
+    """Run the warm-up steps now (in this thread) and mark the process ready."""
+    with _lock:
+        _STATE['started'] = time.time()
+    if app is not None:
+        _run_step('layouts', lambda: _prime_layouts(app))
+    for name, step in list(_STEPS):
+        _run_step(name, step)
+    with _lock:
+        _STATE['finished'] = time.time()
+        _STATE['ready'] = True
+    return status()
+
+
+def _setup_server(app) -> None:
+    """Finish Dash's first-request setup (callback registration) on this thread.
+
+    Dash marks the setup done before it copies the page callbacks into the app,
+    so a request racing it sees a partial ``/_dash-dependencies``, which the
+    layout cache would then keep. One GET here settles it before any thread
+    or user request can race it.
+    """
+    app.server.test_client().get((app.config.routes_pathname_prefix or '/') + '_dash-layout')
+
+
+def start(app) -> threading.Thread | None:
+    """Warm up in a daemon thread (no-op when ``WARMUP=0``; the process is then ready at once)."""
+    _setup_server(app)
+    if not WARMUP:
+        return None
+    thread = threading.Thread(target=run, args=(app,), name='orfeus-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def is_ready() -> bool:
+    with _lock:
+        return bool(_STATE['ready'])
+
+
+def status() -> dict:
+    with _lock:
+        out = {'status': 'ready' if _STATE['ready'] else 'warming', 'steps': dict(_STATE['steps'])}
+        if _STATE['started'] and _STATE['finished']:
+            out['seconds'] = round(_STATE['finished'] - _STATE['started'], 3)
+        return out
+
+
+__all__ = [
+    'register',
+    'run',
+    'start',
+    'is_ready',
+    'status',
+]